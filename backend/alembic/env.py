@@ -22,6 +22,9 @@ if config.config_file_name is not None:
 from app.core.database import Base, DATABASE_URL  # noqa: E402
 from app.models.metric import Metric  # noqa: E402
 from app.models.alert import Alert  # noqa: E402
+from app.models.rollup import MetricRollup1m, MetricRollup1h  # noqa: E402
+from app.models.anomaly_state import AnomalyState  # noqa: E402
+from app.models.load_checkpoint import LoadCheckpoint  # noqa: E402
 
 #  Target metadata 
 target_metadata = Base.metadata
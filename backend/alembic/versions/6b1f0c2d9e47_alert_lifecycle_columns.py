@@ -0,0 +1,34 @@
+"""Add alert lifecycle columns (last_seen, resolved_at, breach_count)
+
+Revision ID: 6b1f0c2d9e47
+Revises: 40dc06e7bbac
+Create Date: 2026-10-18 10:12:41.302117
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision: str = "6b1f0c2d9e47"
+down_revision: Union[str, Sequence[str], None] = "40dc06e7bbac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema — alerts become deduplicated incidents with a lifecycle."""
+    op.add_column("alerts", sa.Column("last_seen", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("alerts", sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "alerts",
+        sa.Column("breach_count", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+    op.execute("UPDATE alerts SET last_seen = timestamp WHERE last_seen IS NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema — drop lifecycle columns."""
+    op.drop_column("alerts", "breach_count")
+    op.drop_column("alerts", "resolved_at")
+    op.drop_column("alerts", "last_seen")
@@ -0,0 +1,112 @@
+"""Partition metrics by day on timestamp (PostgreSQL)
+
+Revision ID: a7c3e5f9d2b4
+Revises: f2a6c9d4b8e1
+Create Date: 2026-10-18 16:21:48.905312
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision: str = "a7c3e5f9d2b4"
+down_revision: Union[str, Sequence[str], None] = "f2a6c9d4b8e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_DAYS = 7
+INDEXES = ("ix_metrics_host_timestamp", "ix_metrics_timestamp")
+COLUMNS = "id, host, cpu_usage, memory_usage, latency, timestamp"
+
+
+def _scalar(sql: str, offline_default):
+    # --sql (offline) runs have no connection to ask
+    if op.get_context().as_sql:
+        return offline_default
+    return op.get_bind().scalar(sa.text(sql))
+
+
+def _partition_ddl(day: date) -> str:
+    # same layout as app.services.partitions.partition_ddl
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    end = start + timedelta(days=1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS metrics_p{day:%Y%m%d} PARTITION OF metrics "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def _create_indexes(table: str) -> None:
+    op.execute(f"CREATE INDEX ix_{table}_host_timestamp ON {table} (host, timestamp DESC, id DESC)")
+    op.execute(f"CREATE INDEX ix_{table}_timestamp ON {table} (timestamp DESC, id DESC)")
+
+
+def upgrade() -> None:
+    """Upgrade schema — metrics becomes a RANGE (timestamp) partitioned table, one partition per UTC day.
+
+    Existing rows are copied over once; the id sequence is kept. The primary key
+    becomes (id, timestamp) since a partitioned table's keys must include the
+    partition column. Rows outside every daily partition land in metrics_default.
+    """
+    if op.get_context().dialect.name != "postgresql":
+        return
+    sequence = _scalar("SELECT pg_get_serial_sequence('metrics', 'id')", "public.metrics_id_seq")
+    oldest = _scalar("SELECT min(timestamp) FROM metrics", None)
+
+    op.rename_table("metrics", "metrics_unpartitioned")
+    op.execute("ALTER TABLE metrics_unpartitioned RENAME CONSTRAINT metrics_pkey TO metrics_unpartitioned_pkey")
+    for index in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index.replace('metrics', 'metrics_unpartitioned', 1)}")
+
+    op.execute(f"""
+        CREATE TABLE metrics (
+            id integer NOT NULL DEFAULT nextval('{sequence}'),
+            host varchar(256) NOT NULL,
+            cpu_usage double precision,
+            memory_usage double precision,
+            latency double precision,
+            timestamp timestamptz NOT NULL,
+            CONSTRAINT metrics_pkey PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("CREATE TABLE metrics_default PARTITION OF metrics DEFAULT")
+    today = datetime.now(timezone.utc).date()
+    day = oldest.astimezone(timezone.utc).date() if oldest is not None else today
+    while day <= today + timedelta(days=PREMAKE_DAYS):
+        op.execute(_partition_ddl(day))
+        day += timedelta(days=1)
+
+    op.execute(f"INSERT INTO metrics ({COLUMNS}) SELECT {COLUMNS} FROM metrics_unpartitioned")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY metrics.id")
+    op.drop_table("metrics_unpartitioned")
+    _create_indexes("metrics")
+
+
+def downgrade() -> None:
+    """Downgrade schema — copy back into a plain metrics table."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    sequence = _scalar("SELECT pg_get_serial_sequence('metrics', 'id')", "public.metrics_id_seq")
+
+    op.rename_table("metrics", "metrics_partitioned")
+    op.execute("ALTER TABLE metrics_partitioned RENAME CONSTRAINT metrics_pkey TO metrics_partitioned_pkey")
+    for index in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index.replace('metrics', 'metrics_partitioned', 1)}")
+
+    op.execute(f"""
+        CREATE TABLE metrics (
+            id integer NOT NULL DEFAULT nextval('{sequence}'),
+            host varchar(256) NOT NULL,
+            cpu_usage double precision,
+            memory_usage double precision,
+            latency double precision,
+            timestamp timestamptz NOT NULL,
+            CONSTRAINT metrics_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO metrics ({COLUMNS}) SELECT {COLUMNS} FROM metrics_partitioned")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY metrics.id")
+    op.drop_table("metrics_partitioned")  # drops every partition with it
+    _create_indexes("metrics")
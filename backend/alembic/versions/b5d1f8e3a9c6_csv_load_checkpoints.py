@@ -0,0 +1,32 @@
+"""Add load_checkpoints for resumable CSV loads
+
+Revision ID: b5d1f8e3a9c6
+Revises: a7c3e5f9d2b4
+Create Date: 2026-10-18 18:02:41.503127
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision: str = "b5d1f8e3a9c6"
+down_revision: Union[str, Sequence[str], None] = "a7c3e5f9d2b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema — progress of scripts/load_sample_data.py so interrupted loads resume."""
+    op.create_table(
+        "load_checkpoints",
+        sa.Column("source", sa.String(length=1024), primary_key=True),
+        sa.Column("byte_offset", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("rows_loaded", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema — drop load_checkpoints."""
+    op.drop_table("load_checkpoints")
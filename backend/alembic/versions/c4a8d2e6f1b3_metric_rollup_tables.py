@@ -0,0 +1,50 @@
+"""Add metrics_1m and metrics_1h rollup tables
+
+Revision ID: c4a8d2e6f1b3
+Revises: 6b1f0c2d9e47
+Create Date: 2026-10-18 11:02:17.540981
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision: str = "c4a8d2e6f1b3"
+down_revision: Union[str, Sequence[str], None] = "6b1f0c2d9e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = ("metrics_1m", "metrics_1h")
+FIELDS = ("cpu_usage", "memory_usage", "latency")
+
+
+def _rollup_columns():
+    columns = [
+        sa.Column("host", sa.String(length=255), primary_key=True),
+        sa.Column("bucket", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    ]
+    for field in FIELDS:
+        columns += [
+            sa.Column(f"{field}_sum", sa.Float(), nullable=False, server_default=sa.text("0")),
+            sa.Column(f"{field}_min", sa.Float(), nullable=True),
+            sa.Column(f"{field}_max", sa.Float(), nullable=True),
+            sa.Column(f"{field}_sketch", sa.LargeBinary(), nullable=True),
+        ]
+    return columns
+
+
+def upgrade() -> None:
+    """Upgrade schema — pre-aggregated per host rollups maintained at ingest."""
+    for table in ROLLUP_TABLES:
+        op.create_table(table, *_rollup_columns())
+        # range scans over all hosts (retention, fleet-wide queries)
+        op.create_index(f"ix_{table}_bucket", table, ["bucket"])
+
+
+def downgrade() -> None:
+    """Downgrade schema — drop rollup tables."""
+    for table in reversed(ROLLUP_TABLES):
+        op.drop_index(f"ix_{table}_bucket", table_name=table)
+        op.drop_table(table)
@@ -0,0 +1,41 @@
+"""Add anomaly_state checkpoint table
+
+Revision ID: e9d3b7a1c5f2
+Revises: c4a8d2e6f1b3
+Create Date: 2026-10-18 13:40:05.118734
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision: str = "e9d3b7a1c5f2"
+down_revision: Union[str, Sequence[str], None] = "c4a8d2e6f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FIELDS = ("cpu_usage", "memory_usage", "latency")
+
+
+def upgrade() -> None:
+    """Upgrade schema — persisted EWMA state so restarts keep their baselines."""
+    columns = [
+        sa.Column("host", sa.String(length=255), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    ]
+    for field in FIELDS:
+        columns += [
+            sa.Column(f"{field}_mean", sa.Float(), nullable=False, server_default=sa.text("0")),
+            sa.Column(f"{field}_var", sa.Float(), nullable=False, server_default=sa.text("0")),
+        ]
+    columns += [
+        sa.Column("last_seen", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    ]
+    op.create_table("anomaly_state", *columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema — drop anomaly_state."""
+    op.drop_table("anomaly_state")
@@ -0,0 +1,49 @@
+"""Add (host, timestamp) / (timestamp) metric indexes and (status, timestamp) on alerts
+
+Revision ID: f2a6c9d4b8e1
+Revises: e9d3b7a1c5f2
+Create Date: 2026-10-18 15:02:27.640193
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision: str = "f2a6c9d4b8e1"
+down_revision: Union[str, Sequence[str], None] = "e9d3b7a1c5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema — newest-first / keyset reads become index scans.
+
+    Indexes are built CONCURRENTLY so a large metrics table stays writable.
+    ix_metrics_host is dropped: ix_metrics_host_timestamp starts with host.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_metrics_host_timestamp", "metrics",
+            ["host", sa.text("timestamp DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_metrics_timestamp", "metrics",
+            [sa.text("timestamp DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_alerts_status_timestamp", "alerts", ["status", "timestamp"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index("ix_metrics_host", table_name="metrics", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema — back to the single host index."""
+    with op.get_context().autocommit_block():
+        op.create_index("ix_metrics_host", "metrics", ["host"], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index("ix_alerts_status_timestamp", table_name="alerts", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_metrics_timestamp", table_name="metrics", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_metrics_host_timestamp", table_name="metrics", postgresql_concurrently=True, if_exists=True)
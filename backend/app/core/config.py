@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from pathlib import Path
+from typing import Optional
 
 ROOT_DIR = Path(__file__).resolve().parents[2] 
 
@@ -10,10 +11,89 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DB_ASYNC: bool = False  # serve routes from async def handlers on asyncpg
+
+    # connection pool, per engine and per process: size it so that
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below Postgres max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection before erroring
+    DB_POOL_RECYCLE: int = 1800  # reopen connections older than this (seconds), -1 = never
+    DB_POOL_PRE_PING: bool = True  # SELECT 1 on checkout; off saves a round trip per request
+
+    # ingest
+    METRICS_BATCH_MAX_ITEMS: int = 50_000
+    INGEST_USE_COPY: bool = True  # COPY FROM STDIN for big batches on psycopg2
+    ROLLUPS_ENABLED: bool = True  # maintain metrics_1m/metrics_1h and serve series from them
+    # write-behind: POST /metrics/ and /metrics/batch validate, queue and answer 202;
+    # a background thread commits the queue in batches (rows are lost if the process dies)
+    INGEST_WRITE_BEHIND: bool = False
+    WRITE_BEHIND_MAX_ROWS: int = 100_000  # queued rows before ingest answers 429
+    WRITE_BEHIND_FLUSH_ROWS: int = 5_000  # rows per flush transaction
+    WRITE_BEHIND_FLUSH_MS: float = 200.0  # longest a queued row waits for a flush
+
+    # bulk export/import (/api/metrics/export, /api/metrics/import)
+    EXPORT_CHUNK_ROWS: int = 50_000  # rows fetched, encoded and sent (or ingested and committed) at a time
+    IMPORT_MAX_MB: float = 256.0  # larger import bodies are refused with 413 before they are buffered
+
+    # retention (days, 0 = keep forever); raw metrics are partitioned by day on PostgreSQL
+    RETENTION_RAW_DAYS: int = 0
+    RETENTION_1M_DAYS: int = 0
+    RETENTION_1H_DAYS: int = 0
+    RETENTION_DETACH_ONLY: bool = False  # detach expired partitions (for archiving) instead of dropping
+    PARTITION_PREMAKE_DAYS: int = 7  # future daily partitions kept ready
+    PARTITION_MAINTENANCE_MINUTES: float = 60.0  # in-process maintenance interval, 0 = run it from cron
+
+    # live push (/ws/metrics, /api/stream)
+    LIVE_QUEUE_SIZE: int = 256  # frames buffered per client before it is told to resync
+    LIVE_HEARTBEAT_SECONDS: float = 15.0  # SSE keep-alive comment interval
+
+    # hot window cache: newest rows per host served from memory;
+    # turn it off with several workers that ingest (each window only sees its own worker's writes)
+    HOT_CACHE_ENABLED: bool = True
+    HOT_CACHE_POINTS: int = 1000  # rows kept per host
+    HOT_CACHE_MINUTES: float = 60.0  # rows older than this are not served from memory, 0 = no limit
+    HOT_CACHE_MAX_MB: float = 64.0  # least recently written hosts are dropped above this
+
+    # response cache for /metrics/, /api/metrics and /alerts/active, invalidated on writes
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 4096
+    RESPONSE_CACHE_MAX_MB: float = 32.0
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None  # share entries and invalidations between workers (needs redis)
+
+    # fleet summary (/api/hosts/summary) from the newest row per host, kept in memory by ingest;
+    # turn the index off with several workers that ingest (each only sees its own writes)
+    LATEST_INDEX_ENABLED: bool = True
+    HOST_STALE_SECONDS: float = 120.0  # hosts silent for longer are flagged stale
+
+    # request instrumentation: SQL / validation / JSON time per route (hydra_sql_*, hydra_request_*)
+    REQUEST_TIMING_ENABLED: bool = True
+    SERVER_TIMING_HEADER: bool = False  # add a Server-Timing header (db, validate, serialize, total) to responses
+    SLOW_QUERY_MS: float = 500.0  # log statements slower than this, 0 = off
+
+    # diagnostics (/debug/profile, /debug/heap): off unless a token is set, sent as "Authorization: Bearer <token>"
+    DEBUG_TOKEN: Optional[str] = None
+    PROFILE_MAX_SECONDS: float = 300.0
+    PROFILE_INTERVAL_MS: float = 10.0  # sampling period; ~100 Hz keeps overhead around 1%
+
+    # analytics
+    STATS_WINDOW_MINUTES: int = 60  # widest window /analytics/trends can answer from memory
+    PREDICTION_BUCKET: str = "5m"
+    PREDICTION_LOOKBACK_HOURS: float = 24.0  # history used for the first fit of a host
+
+    # alerting
+    ALERT_RULES_PATH: Optional[str] = None  # JSON rule table, defaults to built-in thresholds
+    ANOMALY_DETECTION_ENABLED: bool = True
+    ANOMALY_Z_THRESHOLD: float = 4.0  # stddevs from the EWMA mean that count as an anomaly
+    ANOMALY_EWMA_ALPHA: float = 0.05
+    ANOMALY_WARMUP_SAMPLES: int = 30  # samples a host needs before it can alert
+    ANOMALY_MAX_HOSTS: int = 20_000  # tracked hosts; least recently seen are evicted
+    ANOMALY_CHECKPOINT_SECONDS: float = 60.0  # how often state is persisted to anomaly_state
 
     model_config = ConfigDict(
         env_file=str(ROOT_DIR / ".env"),
         env_file_encoding="utf-8"
     )
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,198 @@
+# backend/app/core/instrumentation.py
+import hashlib
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+try:
+    from prometheus_client import Histogram
+except ImportError:  # metrics are optional, like the /prometheus mount
+    Histogram = None
+
+logger = logging.getLogger(__name__)
+
+if Histogram is not None:
+    SQL_SECONDS = Histogram(
+        "hydra_sql_seconds", "Statement execution time (cursor execute)", ["route", "statement"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    SQL_ROWS = Histogram(
+        "hydra_sql_rows", "Rows returned or affected per statement, where the driver reports it",
+        ["route", "statement"], buckets=(0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+    )
+    PHASE_SECONDS = Histogram(
+        "hydra_request_phase_seconds", "Time per request spent in SQL, validation and JSON encoding",
+        ["route", "phase"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    QUERIES = Histogram(
+        "hydra_request_queries", "SQL statements per request", ["route"],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+    )
+else:
+    SQL_SECONDS = SQL_ROWS = PHASE_SECONDS = QUERIES = None
+
+BACKGROUND = "background"  # route label for queries outside a request (generator, flusher, ...)
+UNMATCHED = "unmatched"
+
+
+class RequestTiming:
+    """Time one request spent per phase; ``db`` is filled by the engine hooks."""
+
+    __slots__ = ("scope", "phases", "queries", "rows")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.phases: Dict[str, float] = {}
+        self.queries = 0
+        self.rows = 0
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route") if self.scope is not None else None
+        return getattr(route, "path", None) or UNMATCHED
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        parts = []
+        for phase, seconds in self.phases.items():
+            desc = f';desc="queries={self.queries} rows={self.rows}"' if phase == "db" else ""
+            parts.append(f"{phase};dur={seconds * 1000:.1f}{desc}")
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("hydra_request_timing", default=None)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the block's duration to ``phase`` of the current request (no-op outside requests)."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, time.perf_counter() - began)
+
+
+# statement fingerprints: literals and placeholders become ?, expanded lists collapse,
+# so every execution of the same query shape gets the same (bounded) label
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN|TABLE)\s+\"?(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    sql = _STRINGS.sub("?", statement)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _LISTS.sub("(?)", sql)
+    sql = _ROWS.sub("(?)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Short label like ``SELECT metrics 3f9a1c``: verb, first table, hash of the normalized SQL."""
+    normalized = normalize_statement(statement)
+    verb = normalized.split(" ", 1)[0].upper() if normalized else "?"
+    table = _TABLE.search(normalized)
+    digest = hashlib.blake2b(normalized.encode(), digest_size=3).hexdigest()
+    return f"{verb} {table.group(1) if table else '-'} {digest}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("hydra_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["hydra_query_start"].pop()
+    rows = getattr(cursor, "rowcount", -1)
+    timing = _current.get()
+    route = timing.route if timing is not None else BACKGROUND
+    if timing is not None:
+        timing.add("db", elapsed)
+        timing.queries += 1
+        if rows > 0:
+            timing.rows += rows
+    if SQL_SECONDS is not None or settings.SLOW_QUERY_MS:
+        label = fingerprint(statement)
+        if SQL_SECONDS is not None:
+            SQL_SECONDS.labels(route, label).observe(elapsed)
+            if rows >= 0:
+                SQL_ROWS.labels(route, label).observe(rows)
+        if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow query {elapsed * 1000:.0f} ms on {route} [{label}] rows={rows}: {normalize_statement(statement)[:500]}"
+            )
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute: drop its start time
+    conn = exception_context.connection
+    if exception_context.execution_context is not None and conn is not None:
+        starts = conn.info.get("hydra_query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine):
+    """Time every statement on ``engine`` (a sync Engine; pass ``async_engine.sync_engine``)."""
+    if not settings.REQUEST_TIMING_ENABLED or event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class RequestTimingMiddleware:
+    """Pure ASGI middleware: per-request phase histograms and an optional Server-Timing header.
+
+    Sync endpoints and dependencies run in the threadpool with a copy of the
+    context, so they share this request's RequestTiming object.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming(scope)
+        token = _current.set(timing)
+        began = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and settings.SERVER_TIMING_HEADER:
+                header = timing.server_timing(time.perf_counter() - began).encode("latin-1")
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if PHASE_SECONDS is not None:
+                route = timing.route
+                for phase, seconds in timing.phases.items():
+                    PHASE_SECONDS.labels(route, phase).observe(seconds)
+                QUERIES.labels(route).observe(timing.queries)
@@ -0,0 +1,63 @@
+# backend/app/core/pool.py
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+try:
+    from prometheus_client import Gauge, Histogram
+except ImportError:  # metrics are optional, like the /prometheus mount
+    Gauge = Histogram = None
+
+if Histogram is not None:
+    POOL_WAIT = Histogram(
+        "hydra_db_pool_wait_seconds",
+        "Time spent waiting to check a connection out of the pool",
+        ["engine"],
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    )
+    POOL_SIZE = Gauge("hydra_db_pool_size", "Configured pool size", ["engine"])
+    POOL_CHECKED_OUT = Gauge("hydra_db_pool_checked_out", "Connections currently checked out", ["engine"])
+    POOL_OVERFLOW = Gauge("hydra_db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+else:
+    POOL_WAIT = POOL_SIZE = POOL_CHECKED_OUT = POOL_OVERFLOW = None
+
+
+class _TimedGet:
+    """Times ``_do_get`` (checkout incl. waiting for a free slot) per engine label."""
+    label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if POOL_WAIT is not None:
+                POOL_WAIT.labels(self.label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedGet, QueuePool):
+    label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedGet, AsyncAdaptedQueuePool):
+    label = "async"
+
+
+def pool_options(settings) -> dict:
+    """create_engine/create_async_engine keyword arguments from Settings."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def export_pool_stats(engine, label: str):
+    """Expose pool occupancy as gauges; engine.pool is read at scrape time so dispose() is followed."""
+    if Gauge is None:
+        return
+    POOL_SIZE.labels(label).set_function(lambda: engine.pool.size())
+    POOL_CHECKED_OUT.labels(label).set_function(lambda: engine.pool.checkedout())
+    POOL_OVERFLOW.labels(label).set_function(lambda: max(engine.pool.overflow(), 0))
@@ -1,18 +1,25 @@
 import os
 import logging
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
-from app.routes.metric_routes import router as metric_router
-from app.routes.alert_routes import router as alert_router
+from app.core.config import settings
+from app.core.instrumentation import RequestTimingMiddleware
+from app.routes import alert_routes, api_metrics, metric_routes
 from app.routes.analytics_routes import router as analytics_router
+from app.routes.debug_routes import router as debug_router
 from app.routes.prediction_routes import router as prediction_router
-from app.core.database import Base, engine
+from app.routes.stream_routes import router as stream_router
+from app.core.database import Base, SessionLocal, async_engine, engine
 
-from app.routes.api_metrics import router as api_metrics_router
-
-from app.services.metric_generator import start_metric_generator
+from app.services.metric_generator import parse_hosts, start_metric_generator
+from app.services.anomaly_detector import anomaly_detector
+from app.services.partitions import start_partition_maintenance
+from app.services.hot_cache import hot_cache
+from app.services.latest_index import latest_index
+from app.services.write_behind import write_behind
 
 # basic logging
 logging.basicConfig(level=logging.INFO)
@@ -38,21 +45,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# per-route SQL / validation / serialization timing (outermost, so it sees the whole request)
+if settings.REQUEST_TIMING_ENABLED:
+    app.add_middleware(RequestTimingMiddleware)
+
 # init of db (dev only)
 if os.getenv("HYDRA_DEV_MODE", "false").lower() in ("1", "true", "yes"):
     logger.info("Development mode enabled: creating tables...")
     Base.metadata.create_all(bind=engine)
 
-# include app routers
-app.include_router(metric_router)
-app.include_router(alert_router)
+# include app routers; DB_ASYNC swaps in the async def (AsyncSession) variants
+db_routers = "async_router" if settings.DB_ASYNC else "router"
+app.include_router(getattr(metric_routes, db_routers))
+app.include_router(getattr(alert_routes, db_routers))
 app.include_router(analytics_router)
 app.include_router(prediction_router)
+app.include_router(stream_router)
+app.include_router(debug_router)
 
 # include API endpoints (frontend JSON)
-app.include_router(api_metrics_router)
+app.include_router(getattr(api_metrics, db_routers))
 
 
 # endpoints
@@ -74,8 +89,12 @@ def health():
 
 
 # Start metric generator on startup if requested via env
+_metric_generator = None
+
+
 @app.on_event("startup")
-def _maybe_start_metric_generator():
+async def _maybe_start_metric_generator():
+    global _metric_generator
     should_start = (
         os.getenv("HYDRA_GENERATE_METRICS", "false").lower() in ("1", "true", "yes")
         or os.getenv("HYDRA_DEV_MODE", "false").lower() in ("1", "true", "yes")
@@ -84,16 +103,96 @@ def _maybe_start_metric_generator():
         logger.debug("Metric generator not enabled (set HYDRA_GENERATE_METRICS or HYDRA_DEV_MODE to start).")
         return
 
-    # parse optional hosts and interval
-    gen_hosts_env = os.getenv("HYDRA_GEN_HOSTS")
-    hosts = [h.strip() for h in gen_hosts_env.split(",") if h.strip()] if gen_hosts_env else None
+    # optional hosts (names or a count) and interval
+    hosts = parse_hosts(os.getenv("HYDRA_GEN_HOSTS"))
     try:
         interval = float(os.getenv("HYDRA_GEN_INTERVAL", "5"))
     except Exception:
         interval = 5.0
 
-    start_metric_generator(hosts=hosts, interval_seconds=interval)
-    logger.info(f"Metric generator started (hosts={hosts or 'default'}, interval={interval}s)")
+    _metric_generator = start_metric_generator(hosts=hosts, interval_seconds=interval)
+    logger.info(f"Metric generator started ({len(_metric_generator.hosts)} hosts, interval={interval}s)")
+
+
+# stop generating before the write-behind drain and the anomaly checkpoint
+@app.on_event("shutdown")
+async def _stop_metric_generator():
+    global _metric_generator
+    if _metric_generator is not None:
+        await _metric_generator.stop()
+        _metric_generator = None
+
+
+# keep future metric partitions ready and apply retention
+@app.on_event("startup")
+def _maybe_start_partition_maintenance():
+    if settings.PARTITION_MAINTENANCE_MINUTES <= 0:
+        return
+    start_partition_maintenance(settings.PARTITION_MAINTENANCE_MINUTES)
+    logger.info(f"Partition maintenance started (every {settings.PARTITION_MAINTENANCE_MINUTES} min)")
+
+
+# fill the hot window cache and the latest-value index in the background; reads fall back to the DB meanwhile
+def _warm_caches():
+    db = SessionLocal()
+    try:
+        if settings.HOT_CACHE_ENABLED:
+            loaded = hot_cache.warm(db)
+            logger.info(f"Hot window cache warmed ({loaded} rows, {len(hot_cache)} hosts)")
+        if settings.LATEST_INDEX_ENABLED:
+            loaded = latest_index.warm(db)
+            logger.info(f"Latest-value index warmed ({loaded} hosts)")
+    except Exception as e:
+        logger.error(f"Cache warm-up failed: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def _maybe_warm_caches():
+    if (settings.HOT_CACHE_ENABLED or settings.LATEST_INDEX_ENABLED) and \
+            os.getenv("HYDRA_WARM_CACHE", "true").lower() in ("1", "true", "yes"):
+        threading.Thread(target=_warm_caches, daemon=True).start()
+
+
+# write-behind ingest: start the flusher, and on shutdown commit what was acknowledged
+@app.on_event("startup")
+def _maybe_start_write_behind():
+    if settings.INGEST_WRITE_BEHIND:
+        write_behind.start()
+        logger.info(f"Write-behind ingest started (flush every {settings.WRITE_BEHIND_FLUSH_ROWS} rows "
+                    f"or {settings.WRITE_BEHIND_FLUSH_MS:.0f} ms, capacity {settings.WRITE_BEHIND_MAX_ROWS})")
+
+
+@app.on_event("shutdown")
+def _drain_write_behind():
+    # before the anomaly checkpoint, so it includes the drained rows
+    if write_behind.running or len(write_behind):
+        queued = len(write_behind)
+        write_behind.stop()
+        logger.info(f"Write-behind drained ({queued} rows, {write_behind.dropped} dropped)")
+
+
+# persist anomaly baselines so the next start does not re-learn them
+@app.on_event("shutdown")
+def _checkpoint_anomaly_state():
+    if not len(anomaly_detector):
+        return
+    db = SessionLocal()
+    try:
+        written = anomaly_detector.checkpoint(db, force=True)
+        db.commit()
+        logger.info(f"Anomaly state checkpointed ({written} hosts)")
+    except Exception as e:
+        logger.error(f"Anomaly state checkpoint failed: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+async def _dispose_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 # prometheus metrics
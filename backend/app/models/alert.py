@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime
 from app.core.database import Base
 from datetime import datetime
 
@@ -9,5 +9,11 @@ class Alert(Base):
     host = Column(String(255), nullable=False)
     type = Column(String(50), nullable=False)
     value = Column(Float, nullable=False)
-    timestamp = Column(DateTime(timezone=True), nullable=False)
-    status = Column(String(64), nullable=False, default="active")
\ No newline at end of file
+    timestamp = Column(DateTime(timezone=True), nullable=False)  # first breach
+    status = Column(String(64), nullable=False, default="active")
+    last_seen = Column(DateTime(timezone=True), nullable=True)  # latest breach
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
+    breach_count = Column(Integer, nullable=False, default=1)
+
+    # active alert list: status filter, newest first
+    __table_args__ = (Index("ix_alerts_status_timestamp", status, timestamp),)
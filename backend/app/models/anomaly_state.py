@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from app.core.database import Base
+
+
+class AnomalyState(Base):
+    """Checkpoint of the per host EWMA state used by the anomaly detector."""
+    __tablename__ = "anomaly_state"
+
+    host = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    cpu_usage_mean = Column(Float, nullable=False, default=0.0)
+    cpu_usage_var = Column(Float, nullable=False, default=0.0)
+    memory_usage_mean = Column(Float, nullable=False, default=0.0)
+    memory_usage_var = Column(Float, nullable=False, default=0.0)
+    latency_mean = Column(Float, nullable=False, default=0.0)
+    latency_var = Column(Float, nullable=False, default=0.0)
+    last_seen = Column(Float, nullable=False, default=0.0)  # epoch seconds of the last sample
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from app.core.database import Base
+
+
+class LoadCheckpoint(Base):
+    """How far a CSV load got; written in the same transaction as each chunk."""
+    __tablename__ = "load_checkpoints"
+
+    source = Column(String(1024), primary_key=True)  # "<table>:<absolute csv path>"
+    byte_offset = Column(BigInteger, nullable=False, default=0)  # end of the last committed chunk
+    rows_loaded = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
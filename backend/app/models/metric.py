@@ -1,14 +1,22 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime # import necessary SQLAlchemy components
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime # import necessary SQLAlchemy components
 from app.core.database import Base # import Base from database module
 from datetime import datetime # import datetime for timestamp
 
 
 class Metric(Base):
+    # on PostgreSQL this is partitioned by day on timestamp and the DB primary key
+    # is (id, timestamp); ids still come from one sequence, so id alone stays unique
     __tablename__ = "metrics"  # specify the table name
 
     id = Column(Integer, primary_key=True, index=True)  # primary key column
-    host = Column(String, index=True)  # host column
+    host = Column(String)  # host column (leading column of ix_metrics_host_timestamp)
     cpu_usage = Column(Float)  # CPU usage column
     memory_usage = Column(Float)  # Memory usage column
     latency = Column(Float)  # Latency column
-    timestamp = Column(DateTime, default=datetime.utcnow)  # timestamp column with default value
\ No newline at end of file
+    timestamp = Column(DateTime, default=datetime.utcnow)  # timestamp column with default value
+
+    # newest-first reads and (timestamp, id) keyset pages, with and without a host filter
+    __table_args__ = (
+        Index("ix_metrics_host_timestamp", host, timestamp.desc(), id.desc()),
+        Index("ix_metrics_timestamp", timestamp.desc(), id.desc()),
+    )
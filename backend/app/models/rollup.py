@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, LargeBinary
+from app.core.database import Base
+
+
+class MetricRollup(Base):
+    """Per host, per bucket aggregates; one table per bucket width."""
+    __abstract__ = True
+
+    host = Column(String(255), primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True, index=True)  # bucket start (UTC)
+    count = Column(Integer, nullable=False, default=0)
+
+    cpu_usage_sum = Column(Float, nullable=False, default=0.0)
+    cpu_usage_min = Column(Float, nullable=True)
+    cpu_usage_max = Column(Float, nullable=True)
+    cpu_usage_sketch = Column(LargeBinary, nullable=True)
+
+    memory_usage_sum = Column(Float, nullable=False, default=0.0)
+    memory_usage_min = Column(Float, nullable=True)
+    memory_usage_max = Column(Float, nullable=True)
+    memory_usage_sketch = Column(LargeBinary, nullable=True)
+
+    latency_sum = Column(Float, nullable=False, default=0.0)
+    latency_min = Column(Float, nullable=True)
+    latency_max = Column(Float, nullable=True)
+    latency_sketch = Column(LargeBinary, nullable=True)
+
+
+class MetricRollup1m(MetricRollup):
+    __tablename__ = "metrics_1m"
+    bucket_seconds = 60
+
+
+class MetricRollup1h(MetricRollup):
+    __tablename__ = "metrics_1h"
+    bucket_seconds = 3600
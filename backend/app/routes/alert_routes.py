@@ -1,39 +1,67 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
-from app.models.alert import Alert as AlertModel
+from app.core.database import get_async_db, get_db
+from app.core.instrumentation import timed
 from app.schemas.alert import Alert
-from app.services.alert_service import get_active_alerts
+from app.services.alert_service import (
+    create_alert, get_active_alerts, get_active_alerts_async, resolve_alert as resolve_alert_by_id,
+)
+from app.services.response_cache import ALERTS, cached_json, cached_json_async
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
+# same endpoints as async def handlers on AsyncSession (settings.DB_ASYNC)
+async_router = APIRouter(prefix="/alerts", tags=["alerts"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+ALERT_LIST = TypeAdapter(list[Alert])
+
+
+def alerts_json(alerts):
+    with timed("validate"):
+        alerts = ALERT_LIST.validate_python(alerts, from_attributes=True)
+    with timed("serialize"):
+        return ALERT_LIST.dump_json(alerts), {}
 
 
 @router.get("/active", response_model=list[Alert])
-def get_alerts(db: Session = Depends(get_db)):
-    alerts = get_active_alerts(db)
-    if isinstance(alerts, tuple):
-        alerts = alerts[0]
-    if alerts is None:
-        return []
-    return alerts
+def get_alerts(request: Request, db: Session = Depends(get_db)):
+    def build():
+        alerts = get_active_alerts(db)
+        if isinstance(alerts, tuple):
+            alerts = alerts[0]
+        return alerts_json(alerts or [])
+    return cached_json(request, [ALERTS], build)
 
 
 @router.post("/", response_model=Alert)
 def add_alert(alert: Alert, db: Session = Depends(get_db)):
-    new_alert = AlertModel(**alert.model_dump())
-    db.add(new_alert)
-    db.commit()
-    db.refresh(new_alert)
-    return new_alert
-
-@router.post("/{id}/resolve")
-async def resolve_alert(id: int = Path(...)):
-    # TODO: later
-    return {"status": "resolved", "id": id}
\ No newline at end of file
+    return create_alert(db, alert.model_dump())
+
+@router.post("/{id}/resolve", response_model=Alert)
+def resolve_alert(id: int = Path(...), db: Session = Depends(get_db)):
+    alert = resolve_alert_by_id(db, id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail=f"Alert {id} not found")
+    return alert
+
+
+@async_router.get("/active", response_model=list[Alert])
+async def get_alerts_async(request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        return alerts_json(await get_active_alerts_async(db))
+    return await cached_json_async(request, [ALERTS], build)
+
+
+@async_router.post("/", response_model=Alert)
+async def add_alert_async(alert: Alert, db: Session = Depends(get_db)):
+    return await run_in_threadpool(create_alert, db, alert.model_dump())
+
+@async_router.post("/{id}/resolve", response_model=Alert)
+async def resolve_alert_async_route(id: int = Path(...), db: Session = Depends(get_db)):
+    # the lifecycle update runs on the sync session off the event loop
+    alert = await run_in_threadpool(resolve_alert_by_id, db, id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail=f"Alert {id} not found")
+    return alert
@@ -1,13 +1,34 @@
-# this is demo
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.config import settings
+from app.services.stats_engine import stats_engine
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/trends")
-async def get_trends():
-    return {
-        "cpu_avg": 37.2,
-        "memory_avg": 61.5,
-        "latency_avg": 120.0,
-        "trend": "stable",
-    }
\ No newline at end of file
+def get_trends(
+    window: int = Query(15, ge=1, description="Window in minutes"),
+    host: str = Query("", description="Comma separated hosts, empty = all"),
+    include_hosts: bool = Query(True, description="Include the per host breakdown"),
+):
+    """Rolling mean/stddev/min/max/p50/p95/p99 and trend slope, served from memory."""
+    if window > settings.STATS_WINDOW_MINUTES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"window must be <= {settings.STATS_WINDOW_MINUTES} minutes (STATS_WINDOW_MINUTES)",
+        )
+    hosts = [h.strip() for h in host.split(",") if h.strip()] or None
+    result = stats_engine.trends(window, hosts)
+    fleet = result["fleet"]
+    body = {
+        "window_minutes": window,
+        # flat fields kept for existing dashboard consumers
+        "cpu_avg": fleet["cpu_usage"].get("mean"),
+        "memory_avg": fleet["memory_usage"].get("mean"),
+        "latency_avg": fleet["latency"].get("mean"),
+        "trend": fleet["cpu_usage"].get("trend", "stable"),
+        "fleet": fleet,
+    }
+    if include_hosts:
+        body["hosts"] = result["hosts"]
+    return body
@@ -1,21 +1,215 @@
-from fastapi import APIRouter, Depends, Query
-from typing import List
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.models.metric import Metric as MetricModel
-from app.schemas.metric import MetricResponse
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
+from app.core.instrumentation import timed
+from app.routes.metric_routes import keyset_cursor, metrics_json
+from app.schemas.host import FleetSummary
+from app.schemas.metric import MetricBatchResult, MetricResponse
+from app.services.export_service import (
+    FORMATS, available_formats, encode_stream, encode_stream_async, export_statement, format_for_media_type,
+    import_metrics, iter_chunks, iter_chunks_async, negotiate,
+)
+from app.services.latest_index import get_fleet_summary, get_fleet_summary_async
+from app.services.metric_services import Cursor, get_recent_metric_rows, get_recent_metric_rows_async
+from app.services.response_cache import ALERTS, ALL_METRICS, cached_json, cached_json_async, metrics_tag
+from app.services.serialization import dumps
+from app.services.series_service import BUCKETS, get_series, parse_aggs, parse_fields
 
 router = APIRouter(prefix="/api", tags=["api"])
+# same endpoints as async def handlers on AsyncSession (settings.DB_ASYNC)
+async_router = APIRouter(prefix="/api", tags=["api"])
 
 @router.get("/metrics", response_model=List[MetricResponse])
 def api_get_metrics(
+    request: Request,
     db: Session = Depends(get_db),
     host: str = Query("", description="Filter by host, empty = all"),
     limit: int = Query(200, ge=1, le=10000),
+    before: Optional[Cursor] = Depends(keyset_cursor),
+    shape: Literal["rows", "columns"] = Query("rows", description="rows = list of objects, columns = {field: [...]}"),
 ):
-    q = db.query(MetricModel)
-    if host:
-        q = q.filter(MetricModel.host == host)
-    metrics = q.order_by(MetricModel.timestamp.desc()).limit(limit).all()
-    return metrics
\ No newline at end of file
+    return cached_json(request, [metrics_tag(host)], lambda: metrics_json(get_recent_metric_rows(db, limit, host, before), limit, shape))
+
+def summary_json(summary: dict):
+    with timed("serialize"):
+        return dumps(summary), {}
+
+STALE_AFTER = Query(None, gt=0, description="Seconds without data before a host is stale, default HOST_STALE_SECONDS")
+
+@router.get("/hosts/summary", response_model=FleetSummary)
+def api_hosts_summary(request: Request, db: Session = Depends(get_db), stale_after: Optional[float] = STALE_AFTER):
+    """Latest values, last-seen time, open alerts and staleness of every host (no history scan)."""
+    return cached_json(request, [ALL_METRICS, ALERTS], lambda: summary_json(get_fleet_summary(db, stale_after)))
+
+@router.get("/metrics/series")
+def api_get_metric_series(
+    db: Session = Depends(get_db),
+    host: str = Query("", description="Comma separated hosts, empty = all"),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start, default to - 24h"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (exclusive), default now"),
+    bucket: str = Query("5m", description="Bucket width: " + "|".join(BUCKETS)),
+    agg: str = Query("avg", description="Comma separated: avg,min,max,sum,p50,p95,..."),
+    fields: str = Query("cpu_usage,memory_usage,latency", description="Metric columns to aggregate"),
+    source: str = Query("auto", description="auto (rollups when possible) | raw | rollup"),
+):
+    """Server-side downsampled series as column arrays, one entry per host."""
+    args = _series_args(host, start, end, bucket, agg, fields, source)
+    try:
+        return get_series(db, *args)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+@router.get("/metrics/export")
+def api_export_metrics(
+    request: Request,
+    db: Session = Depends(get_db),
+    host: str = Query("", description="Comma separated hosts, empty = all"),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start, default to - 24h"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (exclusive), default now"),
+    format: Optional[str] = Query(None, description="Overrides Accept: arrow|parquet|msgpack|ndjson"),
+):
+    """Stream raw metrics of a range in chunks as Arrow IPC, Parquet, MessagePack or NDJSON."""
+    name, stmt = _export_args(request, host, start, end, format)
+    chunks = iter_chunks(db, stmt, settings.EXPORT_CHUNK_ROWS)
+    return _export_response(encode_stream(chunks, name), name)
+
+@router.post("/metrics/import", response_model=MetricBatchResult)
+async def api_import_metrics(request: Request, db: Session = Depends(get_db)):
+    """Bulk ingest a body in any export format (Content-Type picks it), committed chunk by chunk."""
+    name = _import_format(request)
+    body = await _read_import_body(request)
+    try:
+        inserted = await run_in_threadpool(import_metrics, db, body, name, settings.EXPORT_CHUNK_ROWS)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return MetricBatchResult(inserted=inserted)
+
+def _export_args(request: Request, host, start, end, format):
+    name = format if format is not None else negotiate(request.headers.get("accept", "*/*"))
+    if name not in available_formats():
+        raise HTTPException(status_code=406, detail=f"Export formats available: {available_formats()}")
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(status_code=422, detail="'from' must be before 'to'")
+    hosts = [h.strip() for h in host.split(",") if h.strip()]
+    return name, export_statement(start, end, hosts)
+
+def _export_response(body, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=FORMATS[name][0].media_type,
+        headers={"Content-Disposition": f'attachment; filename="metrics.{name}"'},
+    )
+
+async def _read_import_body(request: Request) -> bytes:
+    limit = int(settings.IMPORT_MAX_MB * 1024 * 1024)
+    too_large = HTTPException(status_code=413, detail=f"Import body larger than {settings.IMPORT_MAX_MB:g} MB")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+    # the header is optional (chunked uploads), so count what actually arrives too
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+def _import_format(request: Request) -> str:
+    name = format_for_media_type(request.headers.get("content-type", ""))
+    if name is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type must be one of {[FORMATS[n][0].media_type for n in available_formats()]}",
+        )
+    return name
+
+def _series_args(host, start, end, bucket, agg, fields, source) -> tuple:
+    # query params -> get_series arguments after db; 422 on anything invalid
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=422, detail=f"bucket must be one of {list(BUCKETS)}")
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(status_code=422, detail="'from' must be before 'to'")
+    hosts = [h.strip() for h in host.split(",") if h.strip()]
+    try:
+        return start, end, bucket, parse_aggs(agg), parse_fields(fields), hosts, source
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@async_router.get("/metrics", response_model=List[MetricResponse])
+async def api_get_metrics_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    host: str = Query("", description="Filter by host, empty = all"),
+    limit: int = Query(200, ge=1, le=10000),
+    before: Optional[Cursor] = Depends(keyset_cursor),
+    shape: Literal["rows", "columns"] = Query("rows", description="rows = list of objects, columns = {field: [...]}"),
+):
+    async def build():
+        return metrics_json(await get_recent_metric_rows_async(db, limit, host, before), limit, shape)
+    return await cached_json_async(request, [metrics_tag(host)], build)
+
+@async_router.get("/hosts/summary", response_model=FleetSummary)
+async def api_hosts_summary_async(
+    request: Request, db: AsyncSession = Depends(get_async_db), stale_after: Optional[float] = STALE_AFTER,
+):
+    """Latest values, last-seen time, open alerts and staleness of every host (no history scan)."""
+    async def build():
+        return summary_json(await get_fleet_summary_async(db, stale_after))
+    return await cached_json_async(request, [ALL_METRICS, ALERTS], build)
+
+@async_router.get("/metrics/series")
+async def api_get_metric_series_async(
+    db: AsyncSession = Depends(get_async_db),
+    host: str = Query("", description="Comma separated hosts, empty = all"),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start, default to - 24h"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (exclusive), default now"),
+    bucket: str = Query("5m", description="Bucket width: " + "|".join(BUCKETS)),
+    agg: str = Query("avg", description="Comma separated: avg,min,max,sum,p50,p95,..."),
+    fields: str = Query("cpu_usage,memory_usage,latency", description="Metric columns to aggregate"),
+    source: str = Query("auto", description="auto (rollups when possible) | raw | rollup"),
+):
+    """Server-side downsampled series as column arrays, one entry per host."""
+    args = _series_args(host, start, end, bucket, agg, fields, source)
+    try:
+        return await db.run_sync(get_series, *args)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@async_router.get("/metrics/export")
+async def api_export_metrics_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    host: str = Query("", description="Comma separated hosts, empty = all"),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start, default to - 24h"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (exclusive), default now"),
+    format: Optional[str] = Query(None, description="Overrides Accept: arrow|parquet|msgpack|ndjson"),
+):
+    """Stream raw metrics of a range in chunks as Arrow IPC, Parquet, MessagePack or NDJSON."""
+    name, stmt = _export_args(request, host, start, end, format)
+    chunks = iter_chunks_async(db, stmt, settings.EXPORT_CHUNK_ROWS)
+    return _export_response(encode_stream_async(chunks, name), name)
+
+@async_router.post("/metrics/import", response_model=MetricBatchResult)
+async def api_import_metrics_async(request: Request, db: Session = Depends(get_db)):
+    """Bulk ingest a body in any export format (Content-Type picks it), committed chunk by chunk."""
+    name = _import_format(request)
+    body = await _read_import_body(request)
+    try:
+        # ingest runs the sync pipeline off the event loop, like the metric write routes
+        inserted = await run_in_threadpool(import_metrics, db, body, name, settings.EXPORT_CHUNK_ROWS)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return MetricBatchResult(inserted=inserted)
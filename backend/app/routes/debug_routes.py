@@ -0,0 +1,80 @@
+import asyncio
+import hmac
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.config import settings
+from app.services.profiler import SamplingProfiler, heap_tracker
+
+
+def require_debug_token(authorization: Optional[str] = Header(None)):
+    """Diagnostics exist only when DEBUG_TOKEN is set, and need ``Authorization: Bearer <token>``."""
+    if not settings.DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.DEBUG_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid debug token", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_debug_token)])
+
+# one profile at a time per worker: concurrent samplers would only measure each other
+_profiling = asyncio.Lock()
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(30.0, gt=0),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    interval_ms: Optional[float] = Query(None, ge=1, le=1000, description="Sampling interval, default PROFILE_INTERVAL_MS"),
+):
+    """Sample every thread of this worker for ``seconds`` and return the stacks.
+
+    ``collapsed`` is the folded text flamegraph.pl and speedscope read;
+    ``speedscope`` is a JSON file for https://www.speedscope.app.
+    """
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=422, detail=f"seconds must be <= {settings.PROFILE_MAX_SECONDS}")
+    if _profiling.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+    async with _profiling:
+        profiler = SamplingProfiler((interval_ms or settings.PROFILE_INTERVAL_MS) / 1000.0)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+    headers = {"X-Profile-Samples": str(profiler.samples), "X-Profile-Overhead": f"{100 * profiler.overhead:.2f}%"}
+    if format == "speedscope":
+        name = f"hydra-{datetime.utcnow():%Y%m%dT%H%M%S}"
+        headers["Content-Disposition"] = f'attachment; filename="{name}.speedscope.json"'
+        return JSONResponse(profiler.speedscope(name), headers=headers)
+    return PlainTextResponse(profiler.collapsed(), headers=headers)
+
+
+@router.post("/heap/start")
+def heap_start(frames: int = Query(1, ge=1, le=64, description="Stack frames kept per allocation")):
+    """Start tracemalloc; allocations are slower and use more memory until /debug/heap/stop."""
+    heap_tracker.start(frames)
+    return {"tracing": True, "frames": frames}
+
+
+@router.post("/heap/stop")
+def heap_stop():
+    heap_tracker.stop()
+    return {"tracing": False}
+
+
+@router.get("/heap")
+async def heap(
+    top: int = Query(25, ge=1, le=500),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    diff: bool = Query(False, description="Growth since the previous /debug/heap call"),
+):
+    """Top live allocation sites (tracemalloc), like a pprof heap profile."""
+    if not heap_tracker.tracing:
+        raise HTTPException(status_code=409, detail="tracemalloc is not running; POST /debug/heap/start first")
+    return await run_in_threadpool(heap_tracker.top, top, group_by, diff)
@@ -1,28 +1,152 @@
-from fastapi import APIRouter, Depends
+import json
+import math
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
-from app.models.metric import Metric
-from app.schemas.metric import MetricCreate, MetricResponse
+from app.core.config import settings
+from app.core.instrumentation import timed
+from app.core.database import get_async_db, get_db
+from app.schemas.metric import MetricBatchError, MetricBatchResult, MetricCreate, MetricQueuedResult, MetricResponse
+from app.services.metric_services import (
+    Cursor, create_metric, create_metrics_batch,
+    get_recent_metric_rows, get_recent_metric_rows_async, next_cursor, parse_cursor,
+)
+from app.services.response_cache import ALL_METRICS, Headers, cached_json, cached_json_async
+from app.services.serialization import metric_columns_json, metric_rows_json
+from app.services.write_behind import write_behind
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
+# same endpoints as async def handlers on AsyncSession (settings.DB_ASYNC)
+async_router = APIRouter(prefix="/metrics", tags=["metrics"])
 
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
 
-def get_db():
-    db = SessionLocal()
+
+def keyset_cursor(
+    before: Optional[str] = Query(None, description="Cursor '<timestamp>,<id>' from X-Next-Cursor; rows older than it"),
+) -> Optional[Cursor]:
+    if not before:
+        return None
     try:
-        yield db
-    finally:
-        db.close()
+        return parse_cursor(before)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid cursor '{before}': {exc}")
+
+def metrics_json(metrics, limit: int, shape: str = "rows") -> Tuple[bytes, Headers]:
+    """Serialized metric list plus the X-Next-Cursor header, ready for the response cache."""
+    with timed("serialize"):
+        body = metric_columns_json(metrics) if shape == "columns" else metric_rows_json(metrics)
+    cursor = next_cursor(metrics, limit)
+    return body, ({"X-Next-Cursor": cursor} if cursor is not None else {})
+
+def parse_metric_batch(body: bytes, content_type: str = "application/json"):
+    """Split a JSON array or NDJSON body into valid items and indexed errors."""
+    with timed("validate"):
+        return _parse_metric_batch(body, content_type)
+
+def _parse_metric_batch(body: bytes, content_type: str):
+    if content_type.split(";")[0].strip().lower() in NDJSON_TYPES:
+        raw_items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw_items.append(json.loads(line))
+            except ValueError as exc:
+                raw_items.append(exc)
+    else:
+        try:
+            raw_items = json.loads(body)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {exc}")
+        if not isinstance(raw_items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of metrics")
+
+    if len(raw_items) > settings.METRICS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(raw_items)} > {settings.METRICS_BATCH_MAX_ITEMS} items)",
+        )
+
+    items, errors = [], []
+    for index, raw in enumerate(raw_items):
+        if isinstance(raw, ValueError):
+            errors.append(MetricBatchError(index=index, errors=[{"type": "json_invalid", "msg": str(raw)}]))
+            continue
+        try:
+            items.append(MetricCreate.model_validate(raw))
+        except ValidationError as exc:
+            errors.append(MetricBatchError(
+                index=index,
+                errors=exc.errors(include_url=False, include_context=False, include_input=False),
+            ))
+    return items, errors
+
+def enqueue_metrics(items: List[MetricCreate], errors: List[MetricBatchError]) -> JSONResponse:
+    """Write-behind ingest: 202 once queued, 429 (nothing queued) when the queue is full."""
+    if not write_behind.offer(items):
+        retry = max(1, math.ceil(write_behind.flush_seconds))
+        raise HTTPException(
+            status_code=429,
+            detail=f"Ingest queue full ({len(write_behind)} of {write_behind.capacity} rows pending)",
+            headers={"Retry-After": str(retry)},
+        )
+    return JSONResponse(status_code=202, content=MetricQueuedResult(queued=len(items), errors=errors).model_dump())
+
+def ingest_batch_body(db: Session, body: bytes, content_type: str):
+    """Parse and write (or queue) a batch body; both run off the event loop."""
+    items, errors = parse_metric_batch(body, content_type)
+    if settings.INGEST_WRITE_BEHIND:
+        return enqueue_metrics(items, errors)
+    ids = create_metrics_batch(db, items)
+    return MetricBatchResult(inserted=len(ids), ids=ids, errors=errors)
 
 @router.get("/", response_model=list[MetricResponse])
-def get_metrics(limit: int = 100, db: Session = Depends(get_db)):
-    metrics = db.query(Metric).order_by(Metric.timestamp.desc()).limit(limit).all()
-    return metrics
+def get_metrics(
+    request: Request,
+    limit: int = 100,
+    before: Optional[Cursor] = Depends(keyset_cursor),
+    db: Session = Depends(get_db),
+):
+    return cached_json(request, [ALL_METRICS], lambda: metrics_json(get_recent_metric_rows(db, limit, before=before), limit))
 
-@router.post("/", response_model=MetricResponse)
+@router.post("/", response_model=MetricResponse, responses={202: {"model": MetricQueuedResult}})
 def add_metric(metric: MetricCreate, db: Session = Depends(get_db)):
-    new_metric = Metric(**metric.model_dump())
-    db.add(new_metric)
-    db.commit()
-    db.refresh(new_metric)
-    return new_metric
\ No newline at end of file
+    if settings.INGEST_WRITE_BEHIND:
+        return enqueue_metrics([metric], [])
+    return create_metric(db, metric)
+
+@router.post("/batch", response_model=MetricBatchResult, responses={202: {"model": MetricQueuedResult}})
+async def add_metrics_batch(request: Request, db: Session = Depends(get_db)):
+    """Ingest a JSON array or NDJSON body of metrics in a single write."""
+    body = await request.body()
+    return await run_in_threadpool(ingest_batch_body, db, body, request.headers.get("content-type", "application/json"))
+
+
+@async_router.get("/", response_model=list[MetricResponse])
+async def get_metrics_async(
+    request: Request,
+    limit: int = 100,
+    before: Optional[Cursor] = Depends(keyset_cursor),
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def build():
+        return metrics_json(await get_recent_metric_rows_async(db, limit, before=before), limit)
+    return await cached_json_async(request, [ALL_METRICS], build)
+
+@async_router.post("/", response_model=MetricResponse, responses={202: {"model": MetricQueuedResult}})
+async def add_metric_async(metric: MetricCreate, db: Session = Depends(get_db)):
+    # writes go through the sync pipeline off the event loop (see metric_services)
+    if settings.INGEST_WRITE_BEHIND:
+        return enqueue_metrics([metric], [])
+    return await run_in_threadpool(create_metric, db, metric)
+
+@async_router.post("/batch", response_model=MetricBatchResult, responses={202: {"model": MetricQueuedResult}})
+async def add_metrics_batch_async(request: Request, db: Session = Depends(get_db)):
+    """Ingest a JSON array or NDJSON body of metrics in a single write."""
+    body = await request.body()
+    return await run_in_threadpool(ingest_batch_body, db, body, request.headers.get("content-type", "application/json"))
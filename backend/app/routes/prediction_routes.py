@@ -1,13 +1,29 @@
-# this is demo
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.services.forecast_service import forecaster
 
 router = APIRouter(prefix="/predictions", tags=["predictions"])
 
 @router.get("")
-async def get_predictions(host: str = Query(...)):
-    return {
-        "host": host,
-        "predicted_cpu": 45.8,
-        "predicted_memory": 63.2,
-        "predicted_latency": 105.0,
-    }
\ No newline at end of file
+def get_predictions(
+    host: str = Query(...),
+    horizon: int = Query(30, ge=1, le=24 * 60, description="Minutes ahead"),
+    db: Session = Depends(get_db),
+):
+    results = forecaster.forecast(db, [host], horizon)
+    if not results:
+        raise HTTPException(status_code=404, detail=f"No recent metrics for host '{host}'")
+    return results[0]
+
+@router.get("/fleet")
+def get_fleet_predictions(
+    horizon: int = Query(30, ge=1, le=24 * 60, description="Minutes ahead"),
+    host: str = Query("", description="Comma separated hosts, empty = every host with data"),
+    db: Session = Depends(get_db),
+):
+    """Forecast many hosts in one call; models are fitted for all of them at once."""
+    hosts = [h.strip() for h in host.split(",") if h.strip()] or None
+    results = forecaster.forecast(db, hosts, horizon)
+    return {"horizon_minutes": horizon, "count": len(results), "hosts": results}
@@ -0,0 +1,70 @@
+import asyncio
+import json
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.services.live_bus import live_bus
+
+router = APIRouter(tags=["stream"])
+
+
+def _hosts(raw: str):
+    hosts = [h.strip() for h in raw.split(",") if h.strip()]
+    return hosts or None
+
+
+@router.websocket("/ws/metrics")
+async def metrics_socket(websocket: WebSocket, hosts: str = ""):
+    """Push committed metrics (and alert change notices) as JSON text frames.
+
+    ``?hosts=a,b`` limits the stream; sending ``{"hosts": [...]}`` (empty = all)
+    changes it on the fly and is acknowledged with a ``subscribed`` frame.
+    """
+    await websocket.accept()
+    sub = live_bus.subscribe(_hosts(hosts))
+    receiver = asyncio.ensure_future(websocket.receive_text())
+    sender = None
+    try:
+        while True:
+            sender = asyncio.ensure_future(sub.get())
+            done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+            if sender in done:
+                await websocket.send_text(sender.result())
+            else:
+                sender.cancel()
+            if receiver in done:
+                try:
+                    wanted = json.loads(receiver.result()).get("hosts")
+                    sub.hosts = set(wanted) if wanted else None
+                    await websocket.send_text(json.dumps({"type": "subscribed", "hosts": sorted(sub.hosts or [])}))
+                except (ValueError, AttributeError):
+                    await websocket.send_text(json.dumps({"type": "error", "detail": "expected {\"hosts\": [...]}"}))
+                receiver = asyncio.ensure_future(websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (receiver, sender):
+            if task is not None:
+                task.cancel()
+        live_bus.unsubscribe(sub)
+
+
+@router.get("/api/stream")
+async def metrics_stream(request: Request, hosts: str = Query("", description="Comma separated hosts, empty = all")):
+    """Server-Sent Events version of /ws/metrics (one ``data:`` line per frame)."""
+    sub = live_bus.subscribe(_hosts(hosts))
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(sub.get(), timeout=settings.LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            live_bus.unsubscribe(sub)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from typing import Optional
 
 class Alert(BaseModel):  # Define the base schema for alerts
     id : int
@@ -8,6 +9,9 @@ class Alert(BaseModel):  # Define the base schema for alerts
     value: float 
     timestamp : datetime
     status: str
+    last_seen: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
+    breach_count: int = 1
 
     model_config = ConfigDict(from_attributes=True)
-    
\ No newline at end of file
+    
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+class HostSummary(BaseModel): # newest values of one host
+    host: str
+    cpu_usage: float
+    memory_usage: float
+    latency: float
+    last_seen: datetime
+    active_alerts: int
+    stale: bool
+
+class FleetSummary(BaseModel): # Schema returned by /api/hosts/summary
+    generated_at: datetime
+    stale_after_seconds: float
+    total_hosts: int
+    stale_hosts: int
+    active_alerts: int
+    hosts: List[HostSummary]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from typing import Any, List
 
 class MetricCreate(BaseModel): # Define the base schema for metrics
     host: str
@@ -11,4 +12,17 @@ class MetricCreate(BaseModel): # Define the base schema for metrics
 class MetricResponse(MetricCreate): # Schema for creating a new metric
     id: int
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class MetricBatchError(BaseModel): # validation errors of one batch item
+    index: int
+    errors: List[Any]
+
+class MetricBatchResult(BaseModel): # Schema returned by batch ingestion
+    inserted: int
+    ids: List[int] = []
+    errors: List[MetricBatchError] = []
+
+class MetricQueuedResult(BaseModel): # Schema returned when ingest is write-behind (202)
+    queued: int
+    errors: List[MetricBatchError] = []
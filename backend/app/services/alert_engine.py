@@ -0,0 +1,214 @@
+# backend/app/services/alert_engine.py
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.metric_batch import METRIC_FIELDS, MetricBatch, to_epoch
+
+_UNDO_KEY = "alert_engine_undo"
+
+OPS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """One row of the rule table.
+
+    A rule with ``host`` set overrides the fleet-wide rule of the same ``type``
+    for that host. ``n``/``m`` turn it into an "n of the last m samples" rule.
+    """
+    metric: str
+    op: str
+    threshold: float
+    type: str
+    host: Optional[str] = None
+    n: int = 1
+    m: int = 1
+
+    def __post_init__(self):
+        if self.metric not in METRIC_FIELDS:
+            raise ValueError(f"Unknown metric '{self.metric}' (expected one of {METRIC_FIELDS})")
+        if self.op not in OPS:
+            raise ValueError(f"Unknown operator '{self.op}' (expected one of {tuple(OPS)})")
+        if not 1 <= self.n <= self.m:
+            raise ValueError(f"Rule '{self.type}' needs 1 <= n <= m (got n={self.n}, m={self.m})")
+
+
+DEFAULT_RULES = [
+    AlertRule(metric="cpu_usage", op=">", threshold=90.0, type="CPU Usage High"),
+    AlertRule(metric="memory_usage", op=">", threshold=85.0, type="Memory Usage High"),
+    AlertRule(metric="latency", op=">", threshold=250.0, type="Latency High"),
+]
+
+
+def load_rules(path: Optional[str] = None) -> List[AlertRule]:
+    """Read the rule table from a JSON list of rule objects, or fall back to the defaults."""
+    if not path:
+        return list(DEFAULT_RULES)
+    with Path(path).open(encoding="utf-8") as f:
+        return [AlertRule(**row) for row in json.load(f)]
+
+
+@dataclass
+class AlertObservation:
+    """What one batch says about one (host, alert type).
+
+    ``value``/``timestamp`` come from the newest breaching sample; ``recovered``
+    is true when the newest sample of the host no longer breaches.
+    """
+    host: str
+    type: str
+    seen_at: datetime
+    breaches: int = 0
+    value: Optional[float] = None
+    timestamp: Optional[datetime] = None
+    recovered: bool = True
+
+
+class AlertEngine:
+    """Evaluates whole metric batches against the rule table with NumPy masks.
+
+    ``detect`` updates the n-of-m windows right away and undoes that if the
+    session's transaction does not commit, so a retried batch is not counted twice.
+    """
+
+    def __init__(self, rules: Sequence[AlertRule]):
+        self.rules = list(rules)
+        # hosts that have their own rule for a given type; fleet rules skip them
+        overrides: Dict[str, set] = {}
+        for rule in self.rules:
+            if rule.host is not None:
+                overrides.setdefault(rule.type, set()).add(rule.host)
+        self._overrides = {t: np.array(sorted(h), dtype=object) for t, h in overrides.items()}
+        # last m-1 outcomes per (rule, host) for windowed rules
+        self._history: Dict[Tuple[int, str], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._history.clear()
+
+    def detect(self, db: Session, batch: MetricBatch) -> List[AlertObservation]:
+        """``evaluate`` inside ``db``'s transaction: window changes are rolled back with it."""
+        changes: List[tuple] = []
+        observations = self._evaluate(batch, changes)
+        if changes:
+            db.info.setdefault(_UNDO_KEY, []).append(changes)
+        return observations
+
+    def evaluate(self, batch: MetricBatch) -> List[AlertObservation]:
+        """Collapse the batch into one observation per (host, alert type) the rules cover."""
+        return self._evaluate(batch, None)
+
+    def _evaluate(self, batch: MetricBatch, changes: Optional[list]) -> List[AlertObservation]:
+        if not len(batch):
+            return []
+        observations: Dict[Tuple[str, str], AlertObservation] = {}
+        with self._lock:
+            for index, rule in enumerate(self.rules):
+                selected = np.flatnonzero(self._applies(rule, batch.hosts))
+                if not selected.size:
+                    continue
+                values = batch.column(rule.metric)
+                fired = OPS[rule.op](values, rule.threshold)
+                order, starts, ends = _group_by_host(batch, selected)
+                if rule.m > 1:
+                    fired = self._windowed(index, rule, batch, fired, order, starts, ends, changes)
+                self._observe(observations, rule, batch, values, fired, order, starts, ends)
+        return list(observations.values())
+
+    def _applies(self, rule: AlertRule, hosts: np.ndarray) -> np.ndarray:
+        if rule.host is not None:
+            return hosts == rule.host
+        overridden = self._overrides.get(rule.type)
+        if overridden is None:
+            return np.ones(len(hosts), dtype=bool)
+        return ~np.isin(hosts, overridden)
+
+    def _windowed(self, index, rule, batch, breached, order, starts, ends, changes) -> np.ndarray:
+        fired = np.zeros(len(batch), dtype=bool)
+        for start, end in zip(starts, ends):
+            rows = order[start:end]
+            key = (index, batch.hosts[rows[0]])
+            saved = self._history.get(key)
+            previous = saved if saved is not None else np.zeros(0, dtype=bool)
+            window = np.concatenate([previous, breached[rows]])
+            counts = np.concatenate([[0], np.cumsum(window, dtype=np.int64)])
+            positions = np.arange(len(previous), len(window)) + 1
+            in_last_m = counts[positions] - counts[np.maximum(positions - rule.m, 0)]
+            fired[rows] = in_last_m >= rule.n
+            self._history[key] = window[-(rule.m - 1):]
+            if changes is not None:
+                changes.append((key, saved, self._history[key]))
+        return fired
+
+    def _undo(self, changes):
+        with self._lock:
+            for key, saved, written in reversed(changes):
+                # a later batch moved the window on: keep its state
+                if self._history.get(key) is not written:
+                    continue
+                if saved is None:
+                    del self._history[key]
+                else:
+                    self._history[key] = saved
+
+    @staticmethod
+    def _observe(observations, rule, batch, values, fired, order, starts, ends):
+        fired_sorted = fired[order]
+        breaches = np.add.reduceat(fired_sorted.astype(np.int64), starts)
+        # position (within order) of the newest breaching sample per host, -1 if none
+        last_hit = np.maximum.reduceat(np.where(fired_sorted, np.arange(len(order)), -1), starts)
+        for group, end in enumerate(ends):
+            latest = order[end - 1]
+            key = (batch.hosts[latest], rule.type)
+            obs = observations.get(key)
+            if obs is None:
+                obs = observations[key] = AlertObservation(
+                    host=key[0], type=rule.type, seen_at=batch.timestamps[latest],
+                )
+            obs.recovered = obs.recovered and not fired[latest]
+            if breaches[group]:
+                hit = order[last_hit[group]]
+                obs.breaches += int(breaches[group])
+                if obs.timestamp is None or batch.ts[hit] >= to_epoch(obs.timestamp):
+                    obs.value = float(values[hit])
+                    obs.timestamp = batch.timestamps[hit]
+
+
+def _group_by_host(batch: MetricBatch, selected: np.ndarray):
+    """Order selected rows by (host, timestamp) and return group start/end offsets."""
+    _, codes = batch.host_index
+    order = selected[np.lexsort((batch.ts[selected], codes[selected]))]
+    group_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, group_codes[1:] != group_codes[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    return order, starts, ends
+
+
+alert_engine = AlertEngine(load_rules(settings.ALERT_RULES_PATH))
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_window_changes(session):
+    session.info.pop(_UNDO_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _revert_window_changes(session, transaction):
+    if transaction.parent is None and _UNDO_KEY in session.info:
+        for changes in reversed(session.info.pop(_UNDO_KEY)):
+            alert_engine._undo(changes)
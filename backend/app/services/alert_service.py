@@ -1,32 +1,56 @@
+from typing import Iterable, Optional, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.alert import Alert
+from app.core.config import settings
 from app.models.metric import Metric
-from datetime import datetime
+from app.services.alert_engine import alert_engine
+from app.services.anomaly_detector import anomaly_detector
+from app.services.live_bus import live_bus
+from app.services.response_cache import ALERTS, response_cache
+from app.services.alert_state import ACTIVE_STATUSES, open_alerts
+from app.services.metric_batch import MetricBatch
+
+# evaluate a whole batch against the rule table (and the anomaly detector) and
+# open/update/resolve the matching alerts with a handful of statements; the
+# caller owns the commit
+def check_for_alerts_batch(db: Session, metrics: Union[MetricBatch, Iterable]) -> int:
+    batch = metrics if isinstance(metrics, MetricBatch) else MetricBatch.from_items(metrics)
+    observations = alert_engine.detect(db, batch)
+    if settings.ANOMALY_DETECTION_ENABLED:
+        observations += anomaly_detector.detect(db, batch)
+    return open_alerts.apply(db, observations)
 
 # check for alerts based on metric thresholds
 def check_for_alerts(db: Session, metric: Metric):
-    alerts_triggered = []
-
-    # define thresholds
-    if metric.cpu_usage > 90.0:
-        alerts_triggered.append(("CPU Usage High", metric.cpu_usage))
-    if metric.memory_usage > 85.0:
-        alerts_triggered.append(("Memory Usage High", metric.memory_usage))
-    if metric.latency > 250.0:
-        alerts_triggered.append(("Latency High", metric.latency))
-
-    # create alert records
-    for alert_type, value in alerts_triggered:
-        alert = Alert(
-            host=metric.host,
-            type=alert_type,
-            value=value,
-            timestamp=datetime.utcnow(),
-            status="active"
-        )
-        db.add(alert)
-    if alerts_triggered:
+    if check_for_alerts_batch(db, [metric]):
         db.commit()
 
 def get_active_alerts(db: Session):
-    return db.query(Alert).filter(Alert.status == "active").order_by(Alert.timestamp.desc()).all()
\ No newline at end of file
+    return db.query(Alert).filter(Alert.status.in_(ACTIVE_STATUSES)).order_by(Alert.timestamp.desc()).all()
+
+# manually create an alert through the lifecycle (at most one open per host and type)
+def create_alert(db: Session, fields: dict) -> Alert:
+    alert = open_alerts.add(db, Alert(**fields))
+    db.commit()
+    response_cache.invalidate([ALERTS])
+    live_bus.publish_alerts([alert.host])
+    db.refresh(alert)
+    return alert
+
+# resolve one alert by id; None when it does not exist
+def resolve_alert(db: Session, alert_id: int) -> Optional[Alert]:
+    alert = db.get(Alert, alert_id)
+    if alert is None:
+        return None
+    open_alerts.resolve(db, alert)
+    db.commit()
+    response_cache.invalidate([ALERTS])
+    live_bus.publish_alerts([alert.host])
+    db.refresh(alert)
+    return alert
+
+async def get_active_alerts_async(db: AsyncSession):
+    stmt = select(Alert).where(Alert.status.in_(ACTIVE_STATUSES)).order_by(Alert.timestamp.desc())
+    return (await db.scalars(stmt)).all()
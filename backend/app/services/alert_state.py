@@ -0,0 +1,210 @@
+# backend/app/services/alert_state.py
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, event, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.alert import Alert
+from app.services.alert_engine import AlertObservation
+
+# lifecycle: OPEN (first breach) -> FIRING (breached again) -> RESOLVED.
+# OPEN keeps the legacy "active" value so existing rows and clients still match.
+OPEN = "active"
+FIRING = "firing"
+RESOLVED = "resolved"
+ACTIVE_STATUSES = (OPEN, FIRING)
+
+_UNDO_KEY = "alert_index_undo"
+_WARM_KEY = "alert_index_warm"
+
+_alerts = Alert.__table__
+_touch_open_alert = (
+    update(_alerts)
+    .where(_alerts.c.id == bindparam("b_id"))
+    .values(
+        value=bindparam("b_value"),
+        last_seen=bindparam("b_last_seen"),
+        breach_count=_alerts.c.breach_count + bindparam("b_breaches"),
+        status=FIRING,
+    )
+)
+
+
+class OpenAlertIndex:
+    """In-memory (host, type) -> id map of alerts that are not resolved yet.
+
+    Changes are applied as soon as they are staged so concurrent batches see
+    them, and rolled back if the owning session's transaction does not commit.
+    """
+
+    def __init__(self):
+        self._open: Dict[Tuple[str, str], int] = {}
+        self._warm = False
+        self._lock = threading.RLock()
+
+    def reset(self):
+        with self._lock:
+            self._open.clear()
+            self._warm = False
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def get(self, host: str, alert_type: str) -> Optional[int]:
+        return self._open.get((host, alert_type))
+
+    def counts_by_host(self) -> Optional[Dict[str, int]]:
+        """Open alerts per host, or None until the index has been loaded from the DB."""
+        if not self._warm:
+            return None
+        with self._lock:
+            return dict(Counter(host for host, _ in self._open))
+
+    def apply(self, db: Session, observations: Iterable[AlertObservation]) -> int:
+        """Open, update or resolve alerts for a batch; returns the number of rows touched."""
+        observations = list(observations)
+        if not observations:
+            return 0
+        now = datetime.utcnow()
+        with self._lock:
+            self._ensure_warm(db, now)
+            new_rows, new_keys, touches, resolved_ids = [], [], [], []
+            for obs in observations:
+                key = (obs.host, obs.type)
+                alert_id = self._open.get(key)
+                if obs.breaches and alert_id is None:
+                    new_rows.append({
+                        "host": obs.host,
+                        "type": obs.type,
+                        "value": obs.value,
+                        "timestamp": obs.timestamp,
+                        "last_seen": obs.timestamp,
+                        "breach_count": obs.breaches,
+                        # breached and recovered inside the same batch
+                        "status": RESOLVED if obs.recovered else OPEN,
+                        "resolved_at": now if obs.recovered else None,
+                    })
+                    new_keys.append(None if obs.recovered else key)
+                elif obs.breaches:
+                    touches.append({
+                        "b_id": alert_id,
+                        "b_value": obs.value,
+                        "b_last_seen": obs.timestamp,
+                        "b_breaches": obs.breaches,
+                    })
+                if obs.recovered and alert_id is not None:
+                    resolved_ids.append(alert_id)
+                    self._stage(db, key, None)
+
+            if touches:
+                db.execute(_touch_open_alert, touches)
+            if resolved_ids:
+                db.execute(
+                    update(_alerts)
+                    .where(_alerts.c.id.in_(resolved_ids))
+                    .values(status=RESOLVED, resolved_at=now)
+                )
+            if new_rows:
+                ids = db.scalars(
+                    insert(Alert).returning(Alert.id, sort_by_parameter_order=True), new_rows
+                ).all()
+                for key, alert_id in zip(new_keys, ids):
+                    if key is not None:
+                        self._stage(db, key, alert_id)
+        return len(new_rows) + len(touches) + len(resolved_ids)
+
+    def add(self, db: Session, alert: Alert) -> Alert:
+        """Manually create an alert; one already open for the host and type is updated instead."""
+        with self._lock:
+            self._ensure_warm(db, datetime.utcnow())
+            key = (alert.host, alert.type)
+            alert_id = self._open.get(key)
+            if alert.status in ACTIVE_STATUSES and alert_id is not None:
+                db.execute(_touch_open_alert, [{
+                    "b_id": alert_id,
+                    "b_value": alert.value,
+                    "b_last_seen": alert.last_seen or alert.timestamp,
+                    "b_breaches": alert.breach_count,
+                }])
+                return db.get(Alert, alert_id)
+            db.add(alert)
+            db.flush()
+            if alert.status in ACTIVE_STATUSES:
+                self._stage(db, key, alert.id)
+        return alert
+
+    def resolve(self, db: Session, alert: Alert) -> Alert:
+        """Manually resolve one alert; resolving twice is a no-op."""
+        if alert.status in ACTIVE_STATUSES:
+            alert.status = RESOLVED
+            alert.resolved_at = datetime.utcnow()
+            with self._lock:
+                key = (alert.host, alert.type)
+                if self._open.get(key) == alert.id:
+                    self._stage(db, key, None)
+        return alert
+
+    def _stage(self, db: Session, key, alert_id: Optional[int]):
+        db.info.setdefault(_UNDO_KEY, []).append((key, self._open.get(key)))
+        if alert_id is None:
+            self._open.pop(key, None)
+        else:
+            self._open[key] = alert_id
+
+    def _ensure_warm(self, db: Session, now: datetime):
+        if self._warm:
+            return
+        rows = (
+            db.query(Alert.id, Alert.host, Alert.type)
+            .filter(Alert.status.in_(ACTIVE_STATUSES))
+            .order_by(Alert.timestamp.desc(), Alert.id.desc())
+            .all()
+        )
+        seen = set()
+        superseded: List[int] = []
+        for alert_id, host, alert_type in rows:
+            key = (host, alert_type)
+            if key in seen:
+                # pre-dedup duplicates: keep the newest open row per key
+                superseded.append(alert_id)
+                continue
+            seen.add(key)
+            if key not in self._open:
+                self._stage(db, key, alert_id)
+        if superseded:
+            db.execute(
+                update(_alerts)
+                .where(_alerts.c.id.in_(superseded))
+                .values(status=RESOLVED, resolved_at=now)
+            )
+        # warm once the duplicates are resolved for good; a rollback loads again
+        db.info[_WARM_KEY] = True
+
+    def _undo(self, entries):
+        with self._lock:
+            for key, previous in reversed(entries):
+                if previous is None:
+                    self._open.pop(key, None)
+                else:
+                    self._open[key] = previous
+
+
+open_alerts = OpenAlertIndex()
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_index_changes(session):
+    session.info.pop(_UNDO_KEY, None)
+    if session.info.pop(_WARM_KEY, False):
+        open_alerts._warm = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _revert_index_changes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_WARM_KEY, None)
+        if _UNDO_KEY in session.info:
+            open_alerts._undo(session.info.pop(_UNDO_KEY))
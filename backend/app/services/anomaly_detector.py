@@ -0,0 +1,325 @@
+# backend/app/services/anomaly_detector.py
+import threading
+import time
+from functools import partial
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.anomaly_state import AnomalyState
+from app.services.alert_engine import AlertObservation
+from app.services.metric_batch import METRIC_FIELDS, MetricBatch
+
+ANOMALY_TYPES = {
+    "cpu_usage": "CPU Usage Anomaly",
+    "memory_usage": "Memory Usage Anomaly",
+    "latency": "Latency Anomaly",
+}
+# stddev floor per field so a perfectly flat host does not alert on noise
+MIN_STD = np.array([1.0, 1.0, 5.0])
+
+_state = AnomalyState.__table__
+
+_UNDO_KEY = "anomaly_undo"
+
+
+class AnomalyDetector:
+    """Per host EWMA mean/variance kept in fixed-size arrays, one slot per host.
+
+    A sample is anomalous when it is more than ``threshold`` standard deviations
+    away from the host's EWMA mean (checked before the sample is folded in).
+    While a host has fewer than ``warmup`` samples the weight is 1/(n+1), i.e.
+    a plain running mean/variance, and nothing is flagged. When every slot is
+    taken the least recently seen host is evicted.
+
+    Like the open-alert index, ``detect`` and ``checkpoint`` change the state
+    right away and undo it if the session's transaction does not commit.
+    """
+
+    def __init__(self, capacity: int, alpha: float, threshold: float, warmup: int, checkpoint_seconds: float):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.checkpoint_seconds = checkpoint_seconds
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._generation = 0
+        self._allocate()
+
+    def _allocate(self):
+        width = len(METRIC_FIELDS)
+        self._mean = np.zeros((self.capacity, width))
+        self._var = np.zeros((self.capacity, width))
+        self._count = np.zeros(self.capacity, dtype=np.int64)
+        self._last_seen = np.zeros(self.capacity)
+        self._dirty = np.zeros(self.capacity, dtype=bool)
+        # bumped by every batch that steps a slot, so an undo never clobbers a later batch
+        self._version = np.zeros(self.capacity, dtype=np.int64)
+        self._names: List[Optional[str]] = [None] * self.capacity
+        self._slots: Dict[str, int] = {}
+        self._size = 0
+        self._loaded = False
+        self._last_checkpoint = time.monotonic()
+        self._generation += 1
+
+    def reset(self):
+        with self._lock:
+            self._allocate()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def state(self, host: str) -> Optional[dict]:
+        slot = self._slots.get(host)
+        if slot is None:
+            return None
+        return {
+            "count": int(self._count[slot]),
+            "mean": dict(zip(METRIC_FIELDS, self._mean[slot].tolist())),
+            "std": dict(zip(METRIC_FIELDS, np.sqrt(self._var[slot]).tolist())),
+        }
+
+    def detect(self, db: Session, batch: MetricBatch) -> List[AlertObservation]:
+        """Evaluate a batch, restoring the checkpointed state on first use."""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load(db)
+        observations, undo = self._evaluate(batch)
+        if undo is not None:
+            db.info.setdefault(_UNDO_KEY, []).append(undo)
+        return observations
+
+    def evaluate(self, batch: MetricBatch) -> List[AlertObservation]:
+        """One observation per (tracked host, anomaly type) in the batch."""
+        return self._evaluate(batch)[0]
+
+    def _evaluate(self, batch: MetricBatch):
+        if not len(batch):
+            return [], None
+        unique_hosts, codes = batch.host_index
+        order = np.lexsort((batch.ts, codes))
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        # k-th sample of every host goes in round k, so each round touches a slot once
+        rank = np.arange(len(order)) - np.repeat(starts, ends - starts)
+        by_round = order[np.argsort(rank, kind="stable")]
+        bounds = np.searchsorted(np.sort(rank), np.arange(int(rank.max()) + 2))
+
+        values = np.column_stack([batch.column(f) for f in METRIC_FIELDS])
+        flagged = np.zeros(values.shape, dtype=bool)
+        with self._lock:
+            latest = np.maximum.reduceat(batch.ts[order], starts)
+            host_slots, saved = self._assign(unique_hosts[sorted_codes[starts]], latest)
+            row_slots = np.full(len(batch), -1, dtype=np.int64)
+            row_slots[order] = np.repeat(host_slots, ends - starts)
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                rows = by_round[lo:hi]
+                rows = rows[row_slots[rows] >= 0]
+                if rows.size:
+                    flagged[rows] = self._step(row_slots[rows], values[rows], batch.ts[rows])
+            self._version[saved[0]] += 1
+            undo = partial(self._restore, self._generation, saved, self._version[saved[0]])
+        return self._observations(batch, order, starts, ends, host_slots, values, flagged), undo
+
+    def _step(self, slots: np.ndarray, x: np.ndarray, ts: np.ndarray) -> np.ndarray:
+        n = self._count[slots]
+        mean, var = self._mean[slots], self._var[slots]
+        diff = x - mean
+        std = np.maximum(np.sqrt(var), MIN_STD)
+        flagged = (n >= self.warmup)[:, None] & (np.abs(diff) > self.threshold * std)
+        weight = np.maximum(self.alpha, 1.0 / (n + 1))[:, None]
+        increment = weight * diff
+        self._mean[slots] = mean + increment
+        self._var[slots] = (1 - weight) * (var + diff * increment)
+        self._count[slots] = n + 1
+        self._last_seen[slots] = np.maximum(self._last_seen[slots], ts)
+        self._dirty[slots] = True
+        return flagged
+
+    def _assign(self, hosts: np.ndarray, latest: np.ndarray):
+        """Slot per host (-1 when untracked) and the saved state of every slot the batch touches."""
+        slots = np.array([self._slots.get(h, -1) for h in hosts], dtype=np.int64)
+        new = np.flatnonzero(slots < 0)
+        known = slots[slots >= 0]
+        free = self._free(new.size, known) if new.size else known[:0]
+        saved = self._save(np.concatenate([known, free]))
+        for slot in free.tolist():
+            evicted = self._names[slot]
+            if evicted is not None:
+                del self._slots[evicted]
+            self._dirty[slot] = False
+        # hosts beyond capacity stay untracked for this batch
+        for i, slot in zip(new.tolist(), free.tolist()):
+            self._slots[hosts[i]] = slot
+            self._names[slot] = hosts[i]
+            self._mean[slot] = self._var[slot] = 0.0
+            self._count[slot] = 0
+            self._last_seen[slot] = latest[i]
+            slots[i] = slot
+        return slots, saved
+
+    def _free(self, k: int, keep: np.ndarray) -> np.ndarray:
+        """Up to ``k`` slots: never used ones first, then the least recently seen (the caller evicts)."""
+        used = self._size
+        fresh = np.arange(used, min(used + k, self.capacity))
+        self._size += fresh.size
+        need = k - fresh.size
+        if not need:
+            return fresh
+        # only slots in use before this call are candidates, never the fresh ones just handed out
+        age = self._last_seen[:used].copy()
+        age[keep] = np.inf
+        need = min(need, int(np.isfinite(age).sum()))
+        if not need:
+            return fresh
+        victims = np.argpartition(age, need - 1)[:need]
+        return np.concatenate([fresh, victims])
+
+    def _save(self, slots: np.ndarray):
+        return (slots, [self._names[s] for s in slots.tolist()], self._mean[slots], self._var[slots],
+                self._count[slots], self._last_seen[slots], self._dirty[slots])
+
+    def _restore(self, generation: int, saved, versions: np.ndarray):
+        """Undo one batch for the slots no later batch has stepped since."""
+        slots, names, mean, var, count, last_seen, dirty = saved
+        with self._lock:
+            if generation != self._generation:
+                return
+            for i in np.flatnonzero(self._version[slots] == versions).tolist():
+                slot, name, current = int(slots[i]), names[i], self._names[int(slots[i])]
+                if current is not None and self._slots.get(current) == slot:
+                    del self._slots[current]
+                if name is not None and self._slots.setdefault(name, slot) != slot:
+                    # the evicted host came back in another slot meanwhile: leave this one empty
+                    self._names[slot] = None
+                    self._count[slot] = 0
+                    self._last_seen[slot] = 0.0
+                    self._dirty[slot] = False
+                    continue
+                self._names[slot] = name
+                self._mean[slot], self._var[slot] = mean[i], var[i]
+                self._count[slot], self._last_seen[slot], self._dirty[slot] = count[i], last_seen[i], dirty[i]
+
+    def _observations(self, batch, order, starts, ends, host_slots, values, flagged) -> List[AlertObservation]:
+        flagged_sorted = flagged[order]
+        hits = np.add.reduceat(flagged_sorted.astype(np.int64), starts)
+        positions = np.arange(len(order))[:, None]
+        last_hit = np.maximum.reduceat(np.where(flagged_sorted, positions, -1), starts)
+        observations = []
+        for group, end in enumerate(ends):
+            if host_slots[group] < 0:
+                continue
+            latest = order[end - 1]
+            for j, field in enumerate(METRIC_FIELDS):
+                obs = AlertObservation(
+                    host=batch.hosts[latest],
+                    type=ANOMALY_TYPES[field],
+                    seen_at=batch.timestamps[latest],
+                    recovered=not flagged[latest, j],
+                )
+                if hits[group, j]:
+                    hit = order[last_hit[group, j]]
+                    obs.breaches = int(hits[group, j])
+                    obs.value = float(values[hit, j])
+                    obs.timestamp = batch.timestamps[hit]
+                observations.append(obs)
+        return observations
+
+    def load(self, db: Session):
+        """Restore the most recently seen hosts from ``anomaly_state`` (replaces the in-memory state)."""
+        stmt = select(_state).order_by(_state.c.last_seen.desc()).limit(self.capacity)
+        rows = db.execute(stmt).mappings().all()
+        with self._lock:
+            self._allocate()
+            for slot, row in enumerate(rows):
+                self._slots[row["host"]] = slot
+                self._names[slot] = row["host"]
+                self._mean[slot] = [row[f"{f}_mean"] for f in METRIC_FIELDS]
+                self._var[slot] = [row[f"{f}_var"] for f in METRIC_FIELDS]
+                self._count[slot] = row["count"]
+                self._last_seen[slot] = row["last_seen"]
+            self._size = len(rows)
+            self._loaded = True
+
+    def checkpoint(self, db: Session, force: bool = False) -> int:
+        """Upsert the state of hosts changed since the last checkpoint (no commit).
+
+        Only runs every ``checkpoint_seconds`` unless forced; returns rows written.
+        """
+        if not force and time.monotonic() - self._last_checkpoint < self.checkpoint_seconds:
+            return 0
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._last_checkpoint = time.monotonic()
+            dirty = np.flatnonzero(self._dirty[:self._size])
+            rows = []
+            for slot in dirty.tolist():
+                row = {"host": self._names[slot], "count": int(self._count[slot]),
+                       "last_seen": float(self._last_seen[slot]), "updated_at": now}
+                for j, field in enumerate(METRIC_FIELDS):
+                    row[f"{field}_mean"] = float(self._mean[slot, j])
+                    row[f"{field}_var"] = float(self._var[slot, j])
+                rows.append(row)
+            self._dirty[dirty] = False
+            if rows:
+                names = [row["host"] for row in rows]
+                db.info.setdefault(_UNDO_KEY, []).append(partial(self._redirty, self._generation, dirty, names))
+        if rows:
+            _upsert_state(db, rows)
+        return len(rows)
+
+    def _redirty(self, generation: int, slots: np.ndarray, names: List[str]):
+        """A checkpoint that did not commit: write those hosts again next time."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            for slot, name in zip(slots.tolist(), names):
+                if self._names[slot] == name:
+                    self._dirty[slot] = True
+
+
+def _upsert_state(db: Session, rows: Sequence[dict]):
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(_state)
+        columns = [c for c in rows[0] if c != "host"]
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[_state.c.host], set_={c: stmt.excluded[c] for c in columns},
+        ), rows)
+    else:
+        db.execute(delete(_state).where(_state.c.host.in_([r["host"] for r in rows])))
+        db.execute(insert(_state), rows)
+
+
+def _undo(entries):
+    for undo in reversed(entries):
+        undo()
+
+
+anomaly_detector = AnomalyDetector(
+    capacity=settings.ANOMALY_MAX_HOSTS,
+    alpha=settings.ANOMALY_EWMA_ALPHA,
+    threshold=settings.ANOMALY_Z_THRESHOLD,
+    warmup=settings.ANOMALY_WARMUP_SAMPLES,
+    checkpoint_seconds=settings.ANOMALY_CHECKPOINT_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_state_changes(session):
+    session.info.pop(_UNDO_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _revert_state_changes(session, transaction):
+    if transaction.parent is None and _UNDO_KEY in session.info:
+        _undo(session.info.pop(_UNDO_KEY))
@@ -0,0 +1,191 @@
+# backend/app/services/csv_loader.py
+import io
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, FrozenSet, Iterator, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.alert import Alert
+from app.models.load_checkpoint import LoadCheckpoint
+from app.models.metric import Metric
+from app.services.metric_services import supports_copy
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    model: type
+    columns: Dict[str, str]  # csv column -> kind (str, float, int, ts); others in the file are ignored
+    required: FrozenSet[str]  # rows with any of these empty/unparseable are skipped
+    naive_utc: bool  # metrics.timestamp is naive UTC, alert timestamps are timezone aware
+
+
+TABLES = {
+    "metrics": TableSpec(
+        Metric,
+        {"host": "str", "cpu_usage": "float", "memory_usage": "float", "latency": "float", "timestamp": "ts"},
+        frozenset({"host", "cpu_usage", "memory_usage", "latency", "timestamp"}),
+        naive_utc=True,
+    ),
+    "alerts": TableSpec(
+        Alert,
+        {"host": "str", "type": "str", "value": "float", "timestamp": "ts", "status": "str",
+         "last_seen": "ts", "resolved_at": "ts", "breach_count": "int"},
+        frozenset({"host", "type", "value", "timestamp", "status"}),
+        naive_utc=False,
+    ),
+}
+
+
+@dataclass
+class LoadReport:
+    table: str
+    rows: int = 0  # written by this run
+    skipped: int = 0
+    chunks: int = 0
+    resumed_rows: int = 0  # already loaded by an earlier, interrupted run
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+Progress = Callable[[LoadReport, int, int], None]  # report, bytes done, file size
+
+
+def iter_csv_chunks(path: str, chunk_rows: int, offset: int = 0) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """Yield (raw string DataFrame, byte offset after it) for ``chunk_rows`` lines at a time.
+
+    Lines are split by hand so each chunk has an exact end offset to resume from;
+    quoted fields must not contain newlines.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        if offset:
+            f.seek(offset)
+        else:
+            offset = f.tell()
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            offset += sum(map(len, lines))
+            frame = pd.read_csv(io.BytesIO(header + b"".join(lines)), dtype=str, keep_default_na=False, na_values=[""])
+            yield frame, offset
+
+
+def column_defaults(spec: TableSpec) -> Dict[str, object]:
+    """Scalar defaults of optional NOT NULL columns; COPY bypasses the ORM, so chunks carry them."""
+    return {
+        c.name: c.default.arg for c in spec.model.__table__.columns
+        if c.name in spec.columns and c.name not in spec.required
+        and not c.nullable and c.default is not None and c.default.is_scalar
+    }
+
+
+def convert_chunk(frame: pd.DataFrame, spec: TableSpec) -> Tuple[pd.DataFrame, int]:
+    """Typed columns (vectorized); returns the clean rows and how many were dropped."""
+    out = pd.DataFrame(index=frame.index)
+    for column, kind in spec.columns.items():
+        if column not in frame.columns:
+            continue
+        values = frame[column]
+        if kind == "float":
+            out[column] = pd.to_numeric(values, errors="coerce")
+        elif kind == "int":
+            out[column] = pd.to_numeric(values, errors="coerce").astype("Int64")
+        elif kind == "ts":
+            ts = pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+            out[column] = ts.dt.tz_localize(None) if spec.naive_utc else ts
+        else:
+            out[column] = values
+    # empty or absent optional cells would be NULL in COPY (e.g. alerts.breach_count)
+    for column, value in column_defaults(spec).items():
+        out[column] = out[column].fillna(value) if column in out else value
+    bad = out[list(spec.required)].isna().any(axis=1)
+    return out[~bad], int(bad.sum())
+
+
+def write_chunk(db: Session, spec: TableSpec, frame: pd.DataFrame):
+    """COPY on psycopg2, executemany INSERT elsewhere (no commit)."""
+    if frame.empty:
+        return
+    if supports_copy(db):
+        buf = io.StringIO()
+        frame.to_csv(buf, header=False, index=False)
+        buf.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {spec.model.__tablename__} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)", buf
+            )
+        finally:
+            cursor.close()
+        return
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    db.execute(insert(spec.model), records)
+
+
+def checkpoint_source(table: str, path: str) -> str:
+    return f"{table}:{os.path.abspath(path)}"
+
+
+def load_csv(
+    db: Session,
+    path: str,
+    table: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    restart: bool = False,
+    progress: Optional[Progress] = None,
+) -> LoadReport:
+    """Stream a CSV into ``table``, committing each chunk together with its checkpoint.
+
+    A second call for the same file continues after the last committed chunk;
+    ``restart`` forgets the checkpoint (rows already written stay).
+    """
+    spec = TABLES[table]
+    with open(path, "rb") as f:
+        header = pd.read_csv(io.BytesIO(f.readline()), dtype=str).columns
+    missing = spec.required - set(header)
+    if missing:
+        raise ValueError(f"{path} is missing columns for {table}: {sorted(missing)}")
+
+    source = checkpoint_source(table, path)
+    checkpoint = db.get(LoadCheckpoint, source)
+    if checkpoint is not None and restart:
+        db.delete(checkpoint)
+        db.commit()
+        checkpoint = None
+    if checkpoint is None:
+        checkpoint = LoadCheckpoint(source=source, byte_offset=0, rows_loaded=0, updated_at=datetime.now(timezone.utc))
+        db.add(checkpoint)
+
+    report = LoadReport(table, resumed_rows=checkpoint.rows_loaded)
+    size = os.path.getsize(path)
+    began = time.perf_counter()
+    for frame, offset in iter_csv_chunks(path, chunk_rows, checkpoint.byte_offset):
+        clean, skipped = convert_chunk(frame, spec)
+        write_chunk(db, spec, clean)
+        checkpoint.byte_offset = offset
+        checkpoint.rows_loaded += len(clean)
+        checkpoint.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        report.rows += len(clean)
+        report.skipped += skipped
+        report.chunks += 1
+        report.seconds = time.perf_counter() - began
+        if progress is not None:
+            progress(report, offset, size)
+    if checkpoint in db.new:
+        # nothing left to load, don't leave a pending checkpoint behind
+        db.expunge(checkpoint)
+    report.seconds = time.perf_counter() - began
+    return report
@@ -0,0 +1,337 @@
+# backend/app/services/export_service.py
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.instrumentation import timed
+from app.models.metric import Metric
+from app.schemas.metric import MetricCreate
+from app.services.metric_services import METRIC_COLUMNS, create_metrics_batch
+from app.services.serialization import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # arrow/parquet are optional wire formats
+    pa = pq = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# column order of every format, same as METRIC_COLUMNS
+FIELDS = ("id", "host", "cpu_usage", "memory_usage", "latency", "timestamp")
+VALUE_FIELDS = ("cpu_usage", "memory_usage", "latency")
+
+Columns = Dict[str, list]
+
+
+def export_statement(start: datetime, end: datetime, hosts: Sequence[str] = ()):
+    """Rows in [start, end), oldest first; ids break timestamp ties so chunks are stable."""
+    stmt = select(*METRIC_COLUMNS).where(Metric.timestamp >= start, Metric.timestamp < end)
+    if hosts:
+        stmt = stmt.where(Metric.host.in_(hosts))
+    return stmt.order_by(Metric.timestamp, Metric.id)
+
+
+def to_columns(rows: Sequence[tuple]) -> Columns:
+    return dict(zip(FIELDS, map(list, zip(*rows)))) if rows else {f: [] for f in FIELDS}
+
+
+def iter_chunks(db: Session, stmt, chunk_rows: int) -> Iterator[Columns]:
+    """Server-side cursor (yield_per implies stream_results): memory stays at one chunk."""
+    result = db.execute(stmt.execution_options(yield_per=chunk_rows))
+    for rows in result.partitions():
+        yield to_columns(rows)
+
+
+async def iter_chunks_async(db: AsyncSession, stmt, chunk_rows: int) -> AsyncIterator[Columns]:
+    result = await db.stream(stmt.execution_options(yield_per=chunk_rows))
+    async for rows in result.partitions():
+        yield to_columns(rows)
+
+
+def _utc(ts: datetime) -> datetime:
+    # metrics.timestamp is naive UTC
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _epoch_micros(timestamps: List[datetime]) -> List[int]:
+    return [int(_utc(ts).timestamp() * 1_000_000) for ts in timestamps]
+
+
+class _Sink:
+    """Write-only file object that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # writers record offsets (parquet footer), so this must not reset on drain
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+class Encoder:
+    """Streams column chunks as bytes: ``chunk`` per chunk, then ``finish`` once."""
+    media_type = "application/octet-stream"
+
+    def chunk(self, columns: Columns) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class NdjsonEncoder(Encoder):
+    media_type = "application/x-ndjson"
+
+    def chunk(self, columns: Columns) -> bytes:
+        return b"".join(dumps(dict(zip(FIELDS, row))) + b"\n" for row in zip(*(columns[f] for f in FIELDS)))
+
+
+class MsgpackEncoder(Encoder):
+    """A sequence of maps ``{field: [...]}``, one per chunk; timestamps are epoch microseconds (UTC)."""
+    media_type = "application/msgpack"
+
+    def chunk(self, columns: Columns) -> bytes:
+        return msgpack.packb({**columns, "timestamp": _epoch_micros(columns["timestamp"])})
+
+
+def arrow_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("host", pa.string()),
+        ("cpu_usage", pa.float64()),
+        ("memory_usage", pa.float64()),
+        ("latency", pa.float64()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def arrow_batch(columns: Columns):
+    ts = pa.array(_epoch_micros(columns["timestamp"]), type=pa.int64()).cast(pa.timestamp("us", tz="UTC"))
+    arrays = [pa.array(columns[f]) if f != "timestamp" else ts for f in FIELDS]
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema())
+
+
+class ArrowEncoder(Encoder):
+    """Arrow IPC stream format, one record batch per chunk."""
+    media_type = "application/vnd.apache.arrow.stream"
+
+    def __init__(self):
+        self.sink = _Sink()
+        self.writer = pa.ipc.new_stream(self.sink, arrow_schema())
+
+    def chunk(self, columns: Columns) -> bytes:
+        self.writer.write_batch(arrow_batch(columns))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+class ParquetEncoder(Encoder):
+    """Parquet, one row group per chunk; the footer goes out last."""
+    media_type = "application/vnd.apache.parquet"
+
+    def __init__(self):
+        self.sink = _Sink()
+        self.writer = pq.ParquetWriter(self.sink, arrow_schema(), compression="zstd")
+
+    def chunk(self, columns: Columns) -> bytes:
+        self.writer.write_batch(arrow_batch(columns))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+# name -> (encoder, extra accepted media types, available); preference order for */*
+FORMATS: Dict[str, Tuple[Callable[[], Encoder], Tuple[str, ...], bool]] = {
+    "arrow": (ArrowEncoder, ("application/x-arrow",), pa is not None),
+    "parquet": (ParquetEncoder, ("application/x-parquet",), pq is not None),
+    "msgpack": (MsgpackEncoder, ("application/x-msgpack",), msgpack is not None),
+    "ndjson": (NdjsonEncoder, ("application/ndjson", "application/jsonl"), True),
+}
+
+
+def available_formats() -> List[str]:
+    return [name for name, (_, _, ok) in FORMATS.items() if ok]
+
+
+def format_for_media_type(media_type: str) -> Optional[str]:
+    media_type = media_type.split(";")[0].strip().lower()
+    for name, (encoder, aliases, ok) in FORMATS.items():
+        if ok and (media_type == encoder.media_type or media_type in aliases):
+            return name
+    return None
+
+
+def negotiate(accept: str) -> Optional[str]:
+    """Best available format for an Accept header (q-values honoured), None if nothing fits."""
+    ranges = []
+    for position, part in enumerate((accept or "*/*").split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            ranges.append((-q, position, media_type.lower()))
+    for _, _, media_type in sorted(ranges):
+        if media_type in ("*/*", "application/*"):
+            return available_formats()[0]
+        name = format_for_media_type(media_type)
+        if name is not None:
+            return name
+    return None
+
+
+def encode_stream(chunks: Iterable[Columns], name: str) -> Iterator[bytes]:
+    encoder = FORMATS[name][0]()
+    for columns in chunks:
+        with timed("serialize"):
+            data = encoder.chunk(columns)
+        if data:
+            yield data
+    tail = encoder.finish()
+    if tail:
+        yield tail
+
+
+async def encode_stream_async(chunks: AsyncIterable[Columns], name: str) -> AsyncIterator[bytes]:
+    encoder = FORMATS[name][0]()
+    async for columns in chunks:
+        with timed("serialize"):
+            data = encoder.chunk(columns)
+        if data:
+            yield data
+    tail = encoder.finish()
+    if tail:
+        yield tail
+
+
+# import: decode a body in one of the formats back into column chunks
+
+def decode_items(body: bytes, name: str, chunk_rows: int) -> Iterator[List[MetricCreate]]:
+    """MetricCreate lists of at most ``chunk_rows`` from a body in one of the FORMATS."""
+    if name == "ndjson":
+        items = []
+        for line in body.splitlines():
+            if line.strip():
+                items.append(MetricCreate.model_validate(json.loads(line)))
+            if len(items) == chunk_rows:
+                yield items
+                items = []
+        if items:
+            yield items
+        return
+    for columns in decode_chunks(body, name, chunk_rows):
+        yield columns_to_items(columns)
+
+
+def decode_chunks(body: bytes, name: str, chunk_rows: int) -> Iterator[Columns]:
+    if name == "arrow":
+        reader = pa.ipc.open_stream(body)
+        for batch in reader:
+            yield from _arrow_chunks(batch, chunk_rows)
+    elif name == "parquet":
+        for batch in pq.ParquetFile(io.BytesIO(body)).iter_batches(batch_size=chunk_rows):
+            yield _arrow_columns(batch)
+    elif name == "msgpack":
+        for columns in msgpack.Unpacker(io.BytesIO(body), raw=False):
+            columns = _msgpack_columns(columns)
+            for offset in range(0, len(columns["host"]), chunk_rows):
+                yield {f: values[offset:offset + chunk_rows] for f, values in columns.items()}
+    else:
+        raise ValueError(f"Unsupported import format '{name}'")
+
+
+def _arrow_chunks(batch, chunk_rows: int) -> Iterator[Columns]:
+    for offset in range(0, batch.num_rows, chunk_rows):
+        yield _arrow_columns(batch.slice(offset, chunk_rows))
+
+
+def _arrow_columns(batch) -> Columns:
+    names = set(batch.schema.names)
+    _require(names)
+    columns = {f: batch.column(f).to_pylist() for f in ("host", *VALUE_FIELDS)}
+    ts = batch.column("timestamp")
+    if pa.types.is_timestamp(ts.type) and ts.type.tz is None:
+        columns["timestamp"] = ts.to_pylist()
+    else:
+        columns["timestamp"] = [t.astimezone(timezone.utc).replace(tzinfo=None) if t is not None else None
+                                for t in ts.to_pylist()]
+    return columns
+
+
+def _msgpack_columns(columns: dict) -> Columns:
+    _require(columns.keys())
+    out = {f: columns[f] for f in ("host", *VALUE_FIELDS)}
+    us = np.asarray(columns["timestamp"], dtype=np.int64)
+    out["timestamp"] = us.astype("datetime64[us]").astype(datetime).tolist()
+    return out
+
+
+def _require(names: Iterable[str]):
+    missing = {"host", "timestamp", *VALUE_FIELDS} - set(names)
+    if missing:
+        raise ValueError(f"Missing columns: {sorted(missing)}")
+
+
+def columns_to_items(columns: Columns) -> List[MetricCreate]:
+    """Typed columns -> MetricCreate; ids in the input are ignored (new rows get new ids)."""
+    items = []
+    for host, cpu, mem, lat, ts in zip(columns["host"], *(columns[f] for f in VALUE_FIELDS), columns["timestamp"]):
+        if host is None or ts is None or cpu is None or mem is None or lat is None:
+            raise ValueError("Null values are not allowed in imported metrics")
+        items.append(MetricCreate.model_construct(
+            host=str(host), cpu_usage=float(cpu), memory_usage=float(mem), latency=float(lat), timestamp=ts,
+        ))
+    return items
+
+
+def import_metrics(db: Session, body: bytes, name: str, chunk_rows: int) -> int:
+    """Ingest a body chunk by chunk through the regular pipeline (alerts, rollups); each chunk commits.
+
+    Raises ValueError on bad input, saying how many rows were already imported.
+    """
+    inserted = 0
+    try:
+        for items in decode_items(body, name, chunk_rows):
+            inserted += len(create_metrics_batch(db, items))
+    except (ValueError, TypeError, KeyError, ValidationError) as exc:
+        raise ValueError(f"{exc} ({inserted} rows imported before the error)") from exc
+    return inserted
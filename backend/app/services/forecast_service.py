@@ -0,0 +1,243 @@
+# backend/app/services/forecast_service.py
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.metric_batch import METRIC_FIELDS
+from app.services.series_service import BUCKETS, get_series
+
+# smoothing grid tried on the first fit of a (host, metric); best SSE wins
+ALPHAS = (0.2, 0.5, 0.8)
+BETAS = (0.05, 0.2, 0.5)
+BOUNDS = {"cpu_usage": (0.0, 100.0), "memory_usage": (0.0, 100.0), "latency": (0.0, None)}
+PREDICTED_KEYS = {"cpu_usage": "predicted_cpu", "memory_usage": "predicted_memory", "latency": "predicted_latency"}
+
+
+@dataclass
+class HoltModel:
+    """Fitted Holt linear-trend state for one (host, metric)."""
+    alpha: float
+    beta: float
+    level: float
+    trend: float  # per bucket
+    last_ts: int  # start of the last bucket folded in (epoch seconds)
+    sse: float
+    n: int
+
+    def predict(self, steps: float) -> float:
+        return self.level + steps * self.trend
+
+
+def holt_run(y: np.ndarray, level: np.ndarray, trend: np.ndarray, alpha, beta):
+    """Run Holt's recursion over ``y`` (rows = series, columns = buckets).
+
+    All arguments broadcast, so one call fits every host (and every grid
+    point) at once. Missing buckets (NaN) advance the level by the trend.
+    Returns (level, trend, sse, n).
+    """
+    shape = np.broadcast(level, trend, alpha, beta, y[..., 0]).shape
+    level = np.broadcast_to(np.asarray(level, dtype=np.float64), shape).copy()
+    trend = np.broadcast_to(np.asarray(trend, dtype=np.float64), shape).copy()
+    sse = np.zeros(shape)
+    n = np.zeros(shape, dtype=np.int64)
+    for j in range(y.shape[-1]):
+        obs = y[..., j]
+        ok = ~np.isnan(obs)
+        pred = level + trend
+        err = np.where(ok, obs - pred, 0.0)
+        sse = sse + err * err
+        n = n + ok
+        new_level = np.where(ok, pred + alpha * err, pred)
+        trend = np.where(ok, beta * (new_level - level) + (1 - beta) * trend, trend)
+        level = new_level
+    return level, trend, sse, n
+
+
+class Forecaster:
+    """Caches Holt models per (host, metric) and folds in only new buckets.
+
+    The DB is read without holding the lock, which only guards the models, so
+    concurrent requests do not queue behind each other's queries. A requested
+    host without data is remembered until the next bucket completes, and a
+    host silent for longer than the lookback loses its models.
+    """
+
+    def __init__(self, bucket: str, lookback_hours: float):
+        self.bucket = bucket
+        self.width = BUCKETS[bucket]
+        self.lookback = int(lookback_hours * 3600)
+        self._models: Dict[Tuple[str, str], HoltModel] = {}
+        self._empty: Dict[str, int] = {}  # host -> bucket end at which it had no data
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._models.clear()
+            self._empty.clear()
+
+    def forecast(self, db: Session, hosts: Optional[Iterable[str]] = None, horizon_minutes: int = 30) -> List[dict]:
+        """Forecasts for the given hosts, or for every host with data when ``hosts`` is None."""
+        hosts = None if hosts is None else list(hosts)
+        # only complete buckets are folded into the models
+        end = int(time.time() // self.width * self.width)
+        self._refresh(db, hosts, end)
+        with self._lock:
+            wanted = set(hosts) if hosts is not None else {h for h, _ in self._models}
+            steps = horizon_minutes * 60 / self.width
+            out = []
+            for host in sorted(wanted):
+                models = {f: self._models.get((host, f)) for f in METRIC_FIELDS}
+                if not any(models.values()):
+                    continue
+                out.append(self._result(host, models, steps, horizon_minutes, end))
+            return out
+
+    def _refresh(self, db, hosts, end):
+        horizon_start = end - self.lookback
+        with self._lock:
+            # a quiet host must not hold back ``since`` for the whole fleet
+            for key in [k for k, m in self._models.items() if m.last_ts < horizon_start]:
+                del self._models[key]
+            cached = [m for (h, _), m in self._models.items() if hosts is None or h in hosts]
+            known = {h for (h, _) in self._models}
+            missing = [h for h in hosts if h not in known and self._empty.get(h) != end] if hosts is not None else []
+        fits = []
+        if cached:
+            since = max(min(m.last_ts for m in cached) + self.width, horizon_start)
+            if since < end:
+                series = self._fetch(db, since, end, hosts)
+                with self._lock:
+                    self._update([s for s in series if s["host"] in known])
+                if hosts is None:
+                    fresh = [s["host"] for s in series if s["host"] not in known]
+                    if fresh:
+                        fits.append(self._fetch(db, horizon_start, end, fresh))
+        if hosts is None and not cached:
+            fits.append(self._fetch(db, horizon_start, end, None))
+        elif missing:
+            fits.append(self._fetch(db, horizon_start, end, missing))
+        if not fits and not missing:
+            return
+        with self._lock:
+            for series in fits:
+                self._fit(series)
+            for host in missing:
+                if not any((host, f) in self._models for f in METRIC_FIELDS):
+                    self._empty[host] = end
+
+    def _fetch(self, db, start: int, end: int, hosts) -> List[dict]:
+        if start >= end:
+            return []
+        result = get_series(
+            db,
+            datetime.fromtimestamp(start, tz=timezone.utc),
+            datetime.fromtimestamp(end, tz=timezone.utc),
+            self.bucket,
+            ["avg"],
+            METRIC_FIELDS,
+            hosts or (),
+        )
+        return result["series"]
+
+    def _matrix(self, series: List[dict], field: str, start: int, columns: int) -> np.ndarray:
+        y = np.full((len(series), columns), np.nan)
+        for i, s in enumerate(series):
+            idx = (np.asarray(s["ts"], dtype=np.int64) - start) // self.width
+            values = np.array(s[f"{field}_avg"], dtype=np.float64)
+            keep = (idx >= 0) & (idx < columns)
+            y[i, idx[keep]] = values[keep]
+        return y
+
+    def _fit(self, series: List[dict]):
+        if not series:
+            return
+        start = min(s["ts"][0] for s in series)
+        last = max(s["ts"][-1] for s in series)
+        columns = (last - start) // self.width + 1
+        grid_a, grid_b = np.meshgrid(ALPHAS, BETAS, indexing="ij")
+        grid_a, grid_b = grid_a.reshape(-1, 1), grid_b.reshape(-1, 1)
+        for field in METRIC_FIELDS:
+            y = self._matrix(series, field, start, columns)
+            has_data = ~np.isnan(y).all(axis=1)
+            first = np.where(has_data, y[np.arange(len(series)), np.argmax(~np.isnan(y), axis=1)], 0.0)
+            # (grid, host) in one pass; first bucket seeds the level so it carries no error
+            level, trend, sse, n = holt_run(y[None, :, :], first[None, :], 0.0, grid_a, grid_b)
+            best = np.argmin(sse, axis=0)
+            for i, s in enumerate(series):
+                current = self._models.get((s["host"], field))
+                # a concurrent request may have fitted or advanced it already
+                if not has_data[i] or (current is not None and current.last_ts >= last):
+                    continue
+                g = best[i]
+                self._models[(s["host"], field)] = HoltModel(
+                    alpha=float(grid_a[g, 0]),
+                    beta=float(grid_b[g, 0]),
+                    level=float(level[g, i]),
+                    trend=float(trend[g, i]),
+                    last_ts=int(last),
+                    sse=float(sse[g, i]),
+                    n=int(n[g, i]),
+                )
+
+    def _update(self, series: List[dict]):
+        if not series:
+            return
+        last = max(s["ts"][-1] for s in series)
+        for field in METRIC_FIELDS:
+            # models a concurrent request already moved past these buckets are left alone
+            rows = [s for s in series
+                    if (s["host"], field) in self._models and self._models[(s["host"], field)].last_ts < last]
+            if not rows:
+                continue
+            models = [self._models[(s["host"], field)] for s in rows]
+            # every model restarts right after its own last bucket
+            offsets = np.array([m.last_ts for m in models], dtype=np.int64) + self.width
+            start = int(offsets.min())
+            y = self._matrix(rows, field, start, (last - start) // self.width + 1)
+            skip = (offsets - start) // self.width
+            # buckets before a model's own offset were already folded in
+            y[np.arange(y.shape[1]) < skip[:, None]] = np.nan
+            level = np.array([m.level for m in models]) - skip * np.array([m.trend for m in models])
+            trend = np.array([m.trend for m in models])
+            alpha = np.array([m.alpha for m in models])
+            beta = np.array([m.beta for m in models])
+            level, trend, sse, n = holt_run(y, level, trend, alpha, beta)
+            for i, m in enumerate(models):
+                m.level, m.trend = float(level[i]), float(trend[i])
+                m.sse += float(sse[i])
+                m.n += int(n[i])
+                m.last_ts = int(last)
+
+    def _result(self, host, models, steps, horizon_minutes, end) -> dict:
+        result = {"host": host, "horizon_minutes": horizon_minutes, "as_of": datetime.fromtimestamp(end, tz=timezone.utc)}
+        details = {}
+        for field, model in models.items():
+            if model is None:
+                result[PREDICTED_KEYS[field]] = None
+                continue
+            # the model sits at its last bucket, which may be behind `end`
+            ahead = steps + (end - model.last_ts) / self.width - 1
+            low, high = BOUNDS[field]
+            value = max(low, model.predict(ahead))
+            if high is not None:
+                value = min(high, value)
+            result[PREDICTED_KEYS[field]] = round(value, 3)
+            details[field] = {
+                "level": round(model.level, 3),
+                "trend_per_min": round(model.trend * 60 / self.width, 4),
+                "alpha": model.alpha,
+                "beta": model.beta,
+                "rmse": round((model.sse / model.n) ** 0.5, 3) if model.n else None,
+                "buckets": model.n,
+            }
+        result["models"] = details
+        return result
+
+
+forecaster = Forecaster(settings.PREDICTION_BUCKET, settings.PREDICTION_LOOKBACK_HOURS)
@@ -0,0 +1,258 @@
+# backend/app/services/hot_cache.py
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.metric import Metric
+from app.services.metric_batch import MetricBatch
+
+ROW = np.dtype([
+    ("id", "<i8"),
+    ("ts", "<i8"),  # epoch microseconds, exact so cursors round-trip with the DB
+    ("cpu_usage", "<f8"),
+    ("memory_usage", "<f8"),
+    ("latency", "<f8"),
+])
+MIN_CAPACITY = 16
+# complete_since of a window that holds every row the DB has for its host
+NO_BOUND = (int(np.iinfo(np.int64).min), 0)
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(ts: datetime) -> int:
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(us: int) -> datetime:
+    # naive UTC like metrics.timestamp
+    return _EPOCH + timedelta(microseconds=us)
+
+
+def _first_at_or_after(rows: np.ndarray, ts: int, metric_id: int) -> int:
+    """Index of the first row with (ts, id) >= the given key in rows sorted by (ts, id)."""
+    lo = np.searchsorted(rows["ts"], ts, side="left")
+    hi = np.searchsorted(rows["ts"], ts, side="right")
+    return int(lo + (rows["id"][lo:hi] < metric_id).sum())
+
+
+@dataclass(frozen=True, slots=True)
+class CachedMetric:
+    """Read-only stand-in for a Metric row (same attributes MetricResponse reads)."""
+    id: int
+    host: str
+    cpu_usage: float
+    memory_usage: float
+    latency: float
+    timestamp: datetime
+
+
+class HostWindow:
+    """Newest rows of one host sorted by (ts, id) in a growable array.
+
+    Rows live in ``data[start:end]``; appends in time order are amortized O(1)
+    (the live slice is moved to the front only when the array end is reached),
+    late rows are merged in. The window keeps at most ``points`` rows.
+
+    Every row of the host after ``complete_since`` (a (ts, id) key) is in the
+    window, or was trimmed off its old end; late rows at or before the bound
+    are dropped instead of merged, they would sit next to a gap.
+    """
+
+    __slots__ = ("data", "start", "end", "points", "complete_since")
+
+    def __init__(self, points: int, complete_since: Tuple[int, int]):
+        self.points = points
+        self.complete_since = complete_since
+        self.data = np.empty(min(MIN_CAPACITY, 2 * points), dtype=ROW)
+        self.start = self.end = 0
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def rows(self) -> np.ndarray:
+        return self.data[self.start:self.end]
+
+    def add(self, rows: np.ndarray):
+        """Fold rows sorted by (ts, id) into the window."""
+        since_ts, since_id = self.complete_since
+        rows = rows[_first_at_or_after(rows, since_ts, since_id + 1):]
+        if not len(rows):
+            return
+        if len(self) and (rows["ts"][0], rows["id"][0]) <= (self.data["ts"][self.end - 1], self.data["id"][self.end - 1]):
+            merged = np.concatenate([self.rows(), rows])
+            merged = merged[np.lexsort((merged["id"], merged["ts"]))]
+            keep = np.r_[True, merged["id"][1:] != merged["id"][:-1]]
+            self._replace(merged[keep])
+            return
+        rows = rows[-self.points:]
+        if self.end + len(rows) > len(self.data):
+            live = self.rows()[max(0, len(self) + len(rows) - self.points):]
+            capacity = len(self.data)
+            while capacity < len(live) + len(rows):
+                capacity *= 2
+            capacity = min(max(capacity, MIN_CAPACITY), 2 * self.points)
+            data = np.empty(capacity, dtype=ROW) if capacity != len(self.data) else self.data
+            data[:len(live)] = live
+            self.data, self.start, self.end = data, 0, len(live)
+        self.data[self.end:self.end + len(rows)] = rows
+        self.end += len(rows)
+        self.start = max(self.start, self.end - self.points)
+
+    def _replace(self, rows: np.ndarray):
+        rows = rows[-self.points:]
+        capacity = max(MIN_CAPACITY, min(2 * self.points, 1 << int(np.ceil(np.log2(max(len(rows), 1))) + 1)))
+        self.data = np.empty(capacity, dtype=ROW)
+        self.data[:len(rows)] = rows
+        self.start, self.end = 0, len(rows)
+
+
+class HotWindowCache:
+    """Per host window of the newest metrics, kept in NumPy arrays and fed by ingest.
+
+    ``recent`` answers "newest ``limit`` rows of a host (before a cursor)" when the
+    window holds enough rows inside the last ``minutes`` and its complete range;
+    otherwise it returns None and the caller reads the DB. A window is complete
+    from its first ingested row (or from what ``warm`` loaded). Rows written
+    around this process (bulk loads, other workers) are not seen.
+    Whole hosts are evicted least recently written first to stay under
+    ``max_bytes``.
+    """
+
+    def __init__(self, points: int, minutes: float, max_bytes: int):
+        self.points = points
+        self.minutes = minutes
+        self.max_bytes = max_bytes
+        self._hosts: "OrderedDict[str, HostWindow]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def add(self, batch: MetricBatch):
+        """Fold a committed batch in; rows without ids (not written yet) are skipped."""
+        self._fold(batch)
+
+    def _fold(self, batch: MetricBatch, complete_since: Optional[Dict[str, Tuple[int, int]]] = None):
+        if not len(batch) or batch.ids is None:
+            return
+        rows = np.empty(len(batch), dtype=ROW)
+        rows["id"] = batch.ids
+        rows["ts"] = [to_micros(t) for t in batch.timestamps]
+        for field in ("cpu_usage", "memory_usage", "latency"):
+            rows[field] = batch.column(field)
+        unique_hosts, codes = batch.host_index
+        order = np.lexsort((rows["id"], rows["ts"], codes))
+        bounds = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1], True])
+        with self._lock:
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                host = unique_hosts[codes[order[lo]]]
+                self._add_rows(host, rows[order[lo:hi]], None if complete_since is None else complete_since[host])
+            self._evict()
+
+    def _add_rows(self, host: str, rows: np.ndarray, complete_since: Optional[Tuple[int, int]] = None):
+        # a window made by ingest is complete from the first row it sees
+        since = (int(rows["ts"][0]), int(rows["id"][0]) - 1) if complete_since is None else complete_since
+        window = self._hosts.get(host)
+        if window is None:
+            window = self._hosts[host] = HostWindow(self.points, since)
+            self._bytes += window.nbytes
+        else:
+            self._hosts.move_to_end(host)
+            if complete_since is not None:
+                window.complete_since = min(window.complete_since, complete_since)
+        before = window.nbytes
+        window.add(rows)
+        self._bytes += window.nbytes - before
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._hosts) > 1:
+            _, window = self._hosts.popitem(last=False)
+            self._bytes -= window.nbytes
+
+    def recent(self, host: str, limit: int, before: Optional[Tuple[datetime, int]] = None) -> Optional[List[CachedMetric]]:
+        """Newest ``limit`` rows of ``host`` (before the cursor), or None when the DB has to answer."""
+        with self._lock:
+            window = self._hosts.get(host)
+            rows = window.rows() if window is not None else None
+            if rows is not None and self.minutes > 0:
+                oldest = int((time.time() - self.minutes * 60) * 1e6)
+                rows = rows[np.searchsorted(rows["ts"], oldest, side="left"):]
+            if rows is not None and before is not None:
+                rows = rows[:_first_at_or_after(rows, to_micros(before[0]), before[1])]
+            # the oldest row served has to be after anything the window may be missing
+            if rows is None or len(rows) < limit or \
+                    (int(rows["ts"][len(rows) - limit]), int(rows["id"][len(rows) - limit])) <= window.complete_since:
+                self.misses += 1
+                return None
+            self.hits += 1
+            rows = rows[len(rows) - limit:][::-1].copy()
+        return [
+            CachedMetric(int(r["id"]), host, float(r["cpu_usage"]), float(r["memory_usage"]),
+                         float(r["latency"]), from_micros(int(r["ts"])))
+            for r in rows
+        ]
+
+    def warm(self, db: Session) -> int:
+        """Load the newest ``points`` rows per host inside the time window; returns rows loaded."""
+        rank = func.row_number().over(
+            partition_by=Metric.host, order_by=(Metric.timestamp.desc(), Metric.id.desc())
+        ).label("rank")
+        inner = select(
+            Metric.id, Metric.host, Metric.timestamp, Metric.cpu_usage, Metric.memory_usage, Metric.latency, rank
+        )
+        since = None
+        if self.minutes > 0:
+            since = datetime.utcnow() - timedelta(minutes=self.minutes)
+            inner = inner.where(Metric.timestamp >= since)
+        inner = inner.subquery()
+        result = db.execute(select(inner).where(inner.c.rank <= self.points)).all()
+        if not result:
+            return 0
+        batch = MetricBatch.from_items(result)
+        batch.ids = np.array([r.id for r in result], dtype=np.int64)
+        # a host cut at ``points`` is complete from its oldest loaded row, otherwise
+        # everything since the time window start (or ever) was loaded
+        loaded: Dict[str, int] = {}
+        oldest: Dict[str, Tuple[int, int]] = {}
+        for r in result:
+            loaded[r.host] = loaded.get(r.host, 0) + 1
+            key = (to_micros(r.timestamp), r.id - 1)
+            oldest[r.host] = min(oldest.get(r.host, key), key)
+        everything = NO_BOUND if since is None else (to_micros(since), 0)
+        complete_since = {host: oldest[host] if count >= self.points else everything for host, count in loaded.items()}
+        # rows ingested meanwhile are already in; add() dedupes by id when merging
+        self._fold(batch, complete_since)
+        return len(result)
+
+
+hot_cache = HotWindowCache(
+    points=settings.HOT_CACHE_POINTS,
+    minutes=settings.HOT_CACHE_MINUTES,
+    max_bytes=int(settings.HOT_CACHE_MAX_MB * 1024 * 1024),
+)
@@ -0,0 +1,170 @@
+# backend/app/services/latest_index.py
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.alert import Alert
+from app.models.metric import Metric
+from app.services.alert_state import ACTIVE_STATUSES, open_alerts
+from app.services.metric_batch import MetricBatch, to_epoch
+
+# host -> (epoch seconds, timestamp, cpu_usage, memory_usage, latency)
+Latest = Tuple[float, datetime, float, float, float]
+
+
+def latest_per_host_statement(dialect: str):
+    """Newest row per host: DISTINCT ON on PostgreSQL, row_number() elsewhere."""
+    columns = (Metric.host, Metric.timestamp, Metric.cpu_usage, Metric.memory_usage, Metric.latency)
+    if dialect == "postgresql":
+        return (
+            select(*columns)
+            .distinct(Metric.host)
+            .order_by(Metric.host, Metric.timestamp.desc(), Metric.id.desc())
+        )
+    rank = func.row_number().over(
+        partition_by=Metric.host, order_by=(Metric.timestamp.desc(), Metric.id.desc())
+    ).label("rank")
+    inner = select(*columns, rank).subquery()
+    return select(*(inner.c[c.key] for c in columns)).where(inner.c.rank == 1)
+
+
+class LatestValueIndex:
+    """Newest cpu/memory/latency per host, kept up to date by ingest.
+
+    ``add`` runs once per committed batch and touches each host of the batch
+    once (the newest row per host is picked with NumPy); a row older than what
+    the index holds (late or replayed data) never replaces it. Until ``warm``
+    has run, hosts that have not been ingested by this process are missing.
+    """
+
+    def __init__(self):
+        self._latest: Dict[str, Latest] = {}
+        self._lock = threading.Lock()
+        self.warm_loaded = False
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def reset(self):
+        with self._lock:
+            self._latest.clear()
+            self.warm_loaded = False
+
+    def add(self, batch: MetricBatch):
+        if not len(batch):
+            return
+        hosts, codes = batch.host_index
+        # sort by (host, ts); the last row of each host group is its newest
+        order = np.lexsort((batch.ts, codes))
+        ends = np.flatnonzero(np.diff(codes[order], append=-1))
+        newest = order[ends]
+        ts = batch.ts[newest].tolist()
+        cpu, mem, lat = (batch.column(f)[newest].tolist() for f in ("cpu_usage", "memory_usage", "latency"))
+        with self._lock:
+            latest = self._latest
+            for i, row in enumerate(newest.tolist()):
+                host = hosts[codes[row]]
+                current = latest.get(host)
+                if current is None or ts[i] >= current[0]:
+                    latest[host] = (ts[i], batch.timestamps[row], cpu[i], mem[i], lat[i])
+
+    def _merge(self, rows):
+        with self._lock:
+            for host, timestamp, cpu, mem, lat in rows:
+                epoch = to_epoch(timestamp)
+                current = self._latest.get(host)
+                if current is None or epoch > current[0]:
+                    self._latest[host] = (epoch, timestamp, cpu, mem, lat)
+            self.warm_loaded = True
+
+    def warm(self, db: Session) -> int:
+        """Load the newest row of every host from the DB (one pass over the host index); returns hosts."""
+        rows = db.execute(latest_per_host_statement(db.get_bind().dialect.name)).all()
+        self._merge(rows)
+        return len(rows)
+
+    async def warm_async(self, db: AsyncSession) -> int:
+        rows = (await db.execute(latest_per_host_statement(db.get_bind().dialect.name))).all()
+        self._merge(rows)
+        return len(rows)
+
+    def snapshot(self) -> Dict[str, Latest]:
+        with self._lock:
+            return dict(self._latest)
+
+
+latest_index = LatestValueIndex()
+
+
+def active_alert_counts_statement():
+    return select(Alert.host, func.count()).where(Alert.status.in_(ACTIVE_STATUSES)).group_by(Alert.host)
+
+
+def build_summary(latest: Dict[str, Latest], alert_counts: Dict[str, int], stale_after: float,
+                  now: Optional[datetime] = None) -> dict:
+    """FleetSummary document: one entry per host, sorted by name; O(hosts)."""
+    now = now or datetime.utcnow()
+    cutoff = to_epoch(now) - stale_after
+    hosts: List[dict] = []
+    stale = 0
+    for host in sorted(latest):
+        epoch, timestamp, cpu, mem, lat = latest[host]
+        is_stale = epoch < cutoff
+        stale += is_stale
+        hosts.append({
+            "host": host, "cpu_usage": cpu, "memory_usage": mem, "latency": lat, "last_seen": timestamp,
+            "active_alerts": alert_counts.get(host, 0), "stale": is_stale,
+        })
+    return {
+        "generated_at": now,
+        "stale_after_seconds": stale_after,
+        "total_hosts": len(hosts),
+        "stale_hosts": stale,
+        "active_alerts": sum(alert_counts.values()),
+        "hosts": hosts,
+    }
+
+
+def _from_rows(rows) -> Dict[str, Latest]:
+    return {host: (to_epoch(ts), ts, cpu, mem, lat) for host, ts, cpu, mem, lat in rows}
+
+
+def get_fleet_summary(db: Session, stale_after: Optional[float] = None) -> dict:
+    """From the latest-value and open-alert indexes; the DB is only read to warm them.
+
+    With the index disabled (several ingesting workers) both parts come from the DB,
+    the open-alert index of this worker is as partial as the latest values would be.
+    """
+    stale_after = settings.HOST_STALE_SECONDS if stale_after is None else stale_after
+    if not settings.LATEST_INDEX_ENABLED:
+        latest = _from_rows(db.execute(latest_per_host_statement(db.get_bind().dialect.name)).all())
+        counts = None
+    else:
+        if not latest_index.warm_loaded:
+            latest_index.warm(db)
+        latest = latest_index.snapshot()
+        counts = open_alerts.counts_by_host()
+    if counts is None:
+        counts = dict(db.execute(active_alert_counts_statement()).all())
+    return build_summary(latest, counts, stale_after)
+
+
+async def get_fleet_summary_async(db: AsyncSession, stale_after: Optional[float] = None) -> dict:
+    stale_after = settings.HOST_STALE_SECONDS if stale_after is None else stale_after
+    if not settings.LATEST_INDEX_ENABLED:
+        latest = _from_rows((await db.execute(latest_per_host_statement(db.get_bind().dialect.name))).all())
+        counts = None
+    else:
+        if not latest_index.warm_loaded:
+            await latest_index.warm_async(db)
+        latest = latest_index.snapshot()
+        counts = open_alerts.counts_by_host()
+    if counts is None:
+        counts = dict((await db.execute(active_alert_counts_statement())).all())
+    return build_summary(latest, counts, stale_after)
@@ -0,0 +1,135 @@
+# backend/app/services/live_bus.py
+import asyncio
+import json
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.metric_batch import METRIC_FIELDS, MetricBatch
+
+# sent instead of the frames a slow subscriber missed; clients refetch once
+RESYNC = json.dumps({"type": "resync"})
+
+
+class Subscription:
+    """One connected client: a bounded queue on its event loop plus a host filter."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, hosts: Optional[Iterable[str]], maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.hosts = set(hosts) if hosts else None
+        self.lagged = False
+
+    def wants(self, host: str) -> bool:
+        return self.hosts is None or host in self.hosts
+
+    def _offer(self, message: str):
+        # runs on the subscriber's loop
+        if self.lagged:
+            if self.queue.full():
+                return
+            self.queue.put_nowait(RESYNC)
+            self.lagged = False
+        if self.queue.full():
+            self.lagged = True
+            return
+        self.queue.put_nowait(message)
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+
+class LiveBus:
+    """In-process fan-out of committed metrics to WebSocket/SSE subscribers.
+
+    Every batch is serialized once per host; subscribers get the fragments for
+    the hosts they follow (the unfiltered frame is shared by all of them).
+    Publishing never blocks ingest: a subscriber that falls behind skips frames
+    and gets a single ``resync`` message instead.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, hosts: Optional[Iterable[str]] = None) -> Subscription:
+        sub = Subscription(asyncio.get_running_loop(), hosts, self.queue_size)
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def reset(self):
+        with self._lock:
+            self._subscribers.clear()
+
+    def publish_metrics(self, batch: MetricBatch):
+        """Thread-safe; call after the batch is committed."""
+        if not len(batch) or not self._subscribers:
+            return
+        fragments = _host_fragments(batch)
+        everything = None
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.hosts is None:
+                if everything is None:
+                    everything = _frame("metrics", ",".join(fragments.values()))
+                message = everything
+            else:
+                parts = [fragments[h] for h in sub.hosts if h in fragments]
+                if not parts:
+                    continue
+                message = _frame("metrics", ",".join(parts))
+            self._send(sub, message)
+
+    def publish_alerts(self, hosts: Iterable[str]):
+        """Tell subscribers that alerts of these hosts changed (clients refetch /alerts/active)."""
+        hosts = sorted(set(hosts))
+        if not hosts or not self._subscribers:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            wanted = [h for h in hosts if sub.wants(h)]
+            if wanted:
+                self._send(sub, json.dumps({"type": "alerts", "hosts": wanted}))
+
+    def _send(self, sub: Subscription, message: str):
+        try:
+            sub.loop.call_soon_threadsafe(sub._offer, message)
+        except RuntimeError:
+            # loop closed under us: the client is gone
+            self.unsubscribe(sub)
+
+
+def _frame(kind: str, rows_json: str) -> str:
+    return f'{{"type":"{kind}","data":[{rows_json}]}}'
+
+
+def _host_fragments(batch: MetricBatch) -> Dict[str, str]:
+    # comma-joined row objects per host, in timestamp order
+    order = np.lexsort((batch.ts, batch.host_index[1]))
+    columns = {f: batch.column(f).tolist() for f in METRIC_FIELDS}
+    ids = batch.ids.tolist() if batch.ids is not None else None
+    rows: Dict[str, List[str]] = {}
+    for i in order.tolist():
+        row = {"host": batch.hosts[i], **{f: columns[f][i] for f in METRIC_FIELDS},
+               "timestamp": batch.timestamps[i].isoformat()}
+        if ids is not None:
+            row["id"] = ids[i]
+        rows.setdefault(batch.hosts[i], []).append(json.dumps(row))
+    return {host: ",".join(parts) for host, parts in rows.items()}
+
+
+live_bus = LiveBus(settings.LIVE_QUEUE_SIZE)
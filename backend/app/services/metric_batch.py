@@ -0,0 +1,66 @@
+# backend/app/services/metric_batch.py
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+METRIC_FIELDS = ("cpu_usage", "memory_usage", "latency")
+
+
+def to_epoch(ts: datetime) -> float:
+    """Seconds since epoch; naive datetimes are treated as UTC like the rest of the app."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+@dataclass
+class MetricBatch:
+    """Column view of a batch of metrics, shared by the vectorized ingest stages."""
+    hosts: np.ndarray
+    cpu_usage: np.ndarray
+    memory_usage: np.ndarray
+    latency: np.ndarray
+    ts: np.ndarray
+    timestamps: List[datetime]
+    ids: Optional[np.ndarray] = field(default=None)
+
+    @classmethod
+    def from_items(cls, items: Iterable) -> "MetricBatch":
+        """Build from anything with metric attributes (MetricCreate, Metric rows)."""
+        items = list(items)
+        timestamps = [m.timestamp for m in items]
+        return cls(
+            hosts=np.array([m.host for m in items], dtype=object),
+            cpu_usage=np.array([m.cpu_usage for m in items], dtype=np.float64),
+            memory_usage=np.array([m.memory_usage for m in items], dtype=np.float64),
+            latency=np.array([m.latency for m in items], dtype=np.float64),
+            ts=np.array([to_epoch(t) for t in timestamps], dtype=np.float64),
+            timestamps=timestamps,
+        )
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    def to_rows(self) -> List[dict]:
+        """Insert rows (host, the metric fields, timestamp) for write_metric_rows."""
+        return [
+            {"host": h, "cpu_usage": c, "memory_usage": m, "latency": l, "timestamp": t}
+            for h, c, m, l, t in zip(
+                self.hosts.tolist(), self.cpu_usage.tolist(), self.memory_usage.tolist(),
+                self.latency.tolist(), self.timestamps,
+            )
+        ]
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in METRIC_FIELDS:
+            raise KeyError(f"Unknown metric column: {name}")
+        return getattr(self, name)
+
+    @cached_property
+    def host_index(self):
+        """(unique_hosts, codes) so per-host work can use integer codes instead of strings."""
+        unique_hosts, codes = np.unique(self.hosts, return_inverse=True)
+        return unique_hosts, codes
@@ -1,51 +1,168 @@
 # backend/app/services/metric_generator.py
+import asyncio
+import logging
 import time
-import threading
-import random
 from datetime import datetime
-from typing import List
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
-from app.models.metric import Metric as MetricModel
+from app.services.metric_batch import MetricBatch, to_epoch
+from app.services.metric_services import ingest_metric_batch
+from app.services.simulation import FleetSimulator, host_names
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # metrics are optional, like the /prometheus mount
+    Counter = Gauge = Histogram = None
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_HOSTS = ["dev-host-1", "dev-host-2", "dev-host-3"]
 
-def _insert_metrics_loop(hosts: List[str], interval_seconds: float = 5.0):
+if Gauge is not None:
+    DRIFT = Gauge("hydra_generator_drift_seconds", "How late the last generator tick started")
+    TICK_SECONDS = Histogram(
+        "hydra_generator_tick_seconds", "Time to sample and ingest one generator tick",
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    SKIPPED = Counter("hydra_generator_skipped_ticks_total", "Generator ticks skipped because the previous one overran")
+else:
+    DRIFT = TICK_SECONDS = SKIPPED = None
+
+
+def parse_hosts(value: Optional[str]) -> Optional[List[str]]:
+    """HYDRA_GEN_HOSTS: comma separated names, or a count ("5000") for dev-host-00000..."""
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return host_names(int(value), "dev-host").tolist()
+    return [h.strip() for h in value.split(",") if h.strip()]
+
 
-    while True:
+class MetricGenerator:
+    """Synthetic metrics for every host each ``interval_seconds``, as an asyncio task.
+
+    A tick samples all hosts at once (FleetSimulator) and writes them as one
+    batch through ingest_metric_batch in a worker thread, so alerts, rollups and
+    live subscribers see generated data exactly like ingested data. Ticks are
+    scheduled on a fixed grid from the start, so slow ticks do not accumulate
+    drift; when a tick overruns, the missed ones are skipped instead of bursting.
+    """
+
+    def __init__(self, hosts: Sequence[str], interval_seconds: float = 5.0,
+                 session_factory: Callable[[], Session] = SessionLocal, seed: Optional[int] = None):
+        self.hosts = list(hosts)
+        self.interval = interval_seconds
+        self.session_factory = session_factory
+        self.simulator = FleetSimulator(self.hosts, seed=seed)
+        self.ticks = self.rows = self.errors = self.skipped = 0
+        self.last_drift = self.max_drift = self.last_tick_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """Sample every host at ``now`` (default: current UTC) and ingest them; returns rows written."""
+        now = now or datetime.utcnow()
+        epoch = to_epoch(now)
+        columns = self.simulator.sample(epoch)
+        batch = MetricBatch(
+            hosts=columns["host"],
+            cpu_usage=columns["cpu_usage"],
+            memory_usage=columns["memory_usage"],
+            latency=columns["latency"],
+            ts=np.full(len(self.hosts), epoch),
+            timestamps=[now] * len(self.hosts),
+        )
+        db = self.session_factory()
         try:
-            db = SessionLocal()
-            now = datetime.utcnow()
-            for host in hosts:
-                # Create synthetic but plausible values
-                cpu = round(random.uniform(5, 95), 2)
-                mem = round(random.uniform(10, 95), 2)
-                # small random latency
-                latency = round(random.uniform(10, 300), 1)
-
-                m = MetricModel(
-                    host=host,
-                    cpu_usage=cpu,
-                    memory_usage=mem,
-                    latency=latency,
-                    timestamp=now,
-                )
-                db.add(m)
-            db.commit()
+            ingest_metric_batch(db, batch)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
             db.close()
-        except Exception as exc:
+        return len(batch)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        n = 0
+        while not self._stop.is_set():
+            due = start + n * self.interval
+            delay = due - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            self._record_drift(loop.time() - due)
+
+            began = time.perf_counter()
             try:
-                db.rollback()
-                db.close()
-            except Exception:
-                pass
-            # don't crash thread; print to stdout/stderr to help debug
-            print("Metric generator error:", exc)
-        time.sleep(interval_seconds)
-
-def start_metric_generator(hosts: List[str] = None, interval_seconds: float = 5.0, daemon: bool = True):
-    if hosts is None:
-        hosts = DEFAULT_HOSTS
-    t = threading.Thread(target=_insert_metrics_loop, args=(hosts, interval_seconds), daemon=daemon)
-    t.start()
-    return t
\ No newline at end of file
+                self.rows += await asyncio.to_thread(self.tick)
+                self.ticks += 1
+            except Exception as exc:
+                self.errors += 1
+                logger.error(f"Metric generator tick failed: {exc}")
+            self.last_tick_seconds = time.perf_counter() - began
+            if TICK_SECONDS is not None:
+                TICK_SECONDS.observe(self.last_tick_seconds)
+
+            # next slot on the grid that has not started yet
+            following = max(n + 1, int((loop.time() - start) // self.interval) + 1)
+            if following > n + 1:
+                missed = following - n - 1
+                self.skipped += missed
+                if SKIPPED is not None:
+                    SKIPPED.inc(missed)
+                logger.warning(
+                    f"Metric generator behind: tick took {self.last_tick_seconds:.2f}s for {len(self.hosts)} hosts "
+                    f"(interval {self.interval}s), skipping {missed} tick(s)"
+                )
+            n = following
+
+    def _record_drift(self, drift: float):
+        self.last_drift = drift
+        self.max_drift = max(self.max_drift, drift)
+        if DRIFT is not None:
+            DRIFT.set(drift)
+
+    def start(self) -> asyncio.Task:
+        """Schedule ``run`` on the running event loop (call from async code, e.g. a startup hook)."""
+        if not self.running:
+            self._stop = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self.run(), name="metric-generator")
+        return self._task
+
+    async def stop(self):
+        """End the loop; a tick in progress finishes (and commits) first."""
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+        logger.info(f"Metric generator stopped ({self.ticks} ticks, {self.rows} rows, {self.skipped} skipped, "
+                    f"{self.errors} errors, max drift {self.max_drift * 1000:.0f} ms)")
+
+    def stats(self) -> dict:
+        return {
+            "hosts": len(self.hosts), "interval": self.interval, "running": self.running,
+            "ticks": self.ticks, "rows": self.rows, "errors": self.errors, "skipped": self.skipped,
+            "last_drift": self.last_drift, "max_drift": self.max_drift, "last_tick_seconds": self.last_tick_seconds,
+        }
+
+
+def start_metric_generator(hosts: List[str] = None, interval_seconds: float = 5.0) -> MetricGenerator:
+    """Start a generator on the running event loop and return it (``await generator.stop()`` to end it)."""
+    generator = MetricGenerator(hosts or DEFAULT_HOSTS, interval_seconds)
+    generator.start()
+    return generator
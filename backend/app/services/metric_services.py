@@ -1,7 +1,26 @@
+import csv
+import io
+import numpy as np
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.metric import Metric
 from app.schemas.metric import MetricCreate
-from app.services.alert_service import check_for_alerts
+from app.services.alert_service import check_for_alerts_batch
+from app.services.anomaly_detector import anomaly_detector
+from app.services.hot_cache import hot_cache
+from app.services.latest_index import latest_index
+from app.services.live_bus import live_bus
+from app.services.metric_batch import MetricBatch
+from app.services.response_cache import ALERTS, response_cache
+from app.services.rollup_service import update_rollups
+from app.services.stats_engine import stats_engine
+
+# below this size a multi-row INSERT is as fast as COPY
+COPY_MIN_ROWS = 500
 
 
 # create a new metric and check for alerts
@@ -9,12 +28,164 @@ def create_metric(db: Session, metric_data: MetricCreate):
     # save metric 
     metric = Metric(**metric_data.model_dump())
     db.add(metric)
+    db.flush()
+    # alerts, rollups, ... then one commit
+    batch = MetricBatch.from_items([metric])
+    batch.ids = np.array([metric.id])
+    alerts_changed = process_metric_batch(db, batch)
     db.commit()
+    publish_metric_batch(batch, alerts_changed)
     db.refresh(metric)
-    # check for alerts
-    check_for_alerts(db, metric)
     return metric
 
+# create many metrics in one round trip, evaluate alerts once, commit once
+def create_metrics_batch(db: Session, items: Sequence[MetricCreate]) -> List[int]:
+    if not items:
+        return []
+    return ingest_metric_batch(db, MetricBatch.from_items(items), [item.model_dump() for item in items])
+
+# bulk ingest of a column batch: write, alerts/rollups, one commit, publish
+def ingest_metric_batch(db: Session, batch: MetricBatch, rows: Optional[List[dict]] = None) -> List[int]:
+    if not len(batch):
+        return []
+    alerts_changed = commit_metric_batch(db, batch, rows)
+    publish_metric_batch(batch, alerts_changed)
+    return batch.ids.tolist()
+
+# the part of ingest that is safe to retry: write, alerts/rollups and the commit
+# (sets batch.ids); returns True when alert rows changed
+def commit_metric_batch(db: Session, batch: MetricBatch, rows: Optional[List[dict]] = None) -> bool:
+    ids = write_metric_rows(db, batch.to_rows() if rows is None else rows)
+    batch.ids = np.array(ids)
+    alerts_changed = process_metric_batch(db, batch)
+    db.commit()
+    return alerts_changed
+
+# everything that has to happen to freshly written metrics (no commit);
+# returns True when alert rows changed
+def process_metric_batch(db: Session, batch: MetricBatch) -> bool:
+    alerts_touched = check_for_alerts_batch(db, batch)
+    if settings.ANOMALY_DETECTION_ENABLED:
+        anomaly_detector.checkpoint(db)
+    if settings.ROLLUPS_ENABLED:
+        update_rollups(db, batch)
+    return alerts_touched > 0
+
+# feed in-process consumers once the batch is committed
+def publish_metric_batch(batch: MetricBatch, alerts_changed: bool = False):
+    stats_engine.observe(batch)
+    if settings.HOT_CACHE_ENABLED:
+        hot_cache.add(batch)
+    if settings.LATEST_INDEX_ENABLED:
+        latest_index.add(batch)
+    response_cache.invalidate_metrics(batch.host_index[0])
+    live_bus.publish_metrics(batch)
+    if alerts_changed:
+        response_cache.invalidate([ALERTS])
+        live_bus.publish_alerts(batch.host_index[0])
+
+# write plain metric dicts and return their ids in input order (no commit)
+def write_metric_rows(db: Session, rows: List[dict]) -> List[int]:
+    if settings.INGEST_USE_COPY and len(rows) >= COPY_MIN_ROWS and supports_copy(db):
+        return _copy_metric_rows(db, rows)
+    stmt = insert(Metric).returning(Metric.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, rows))
+
+def supports_copy(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+def _copy_metric_rows(db: Session, rows: List[dict]) -> List[int]:
+    conn = db.connection()
+    # reserve ids up front so COPY can write them and callers still get ids back
+    ids = list(conn.execute(
+        text("SELECT nextval(pg_get_serial_sequence('metrics', 'id')) FROM generate_series(1, :n)"),
+        {"n": len(rows)},
+    ).scalars())
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for metric_id, row in zip(ids, rows):
+        writer.writerow((
+            metric_id, row["host"], row["cpu_usage"], row["memory_usage"],
+            row["latency"], row["timestamp"].isoformat(),
+        ))
+    buf.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY metrics (id, host, cpu_usage, memory_usage, latency, timestamp) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+    return ids
+
+Cursor = Tuple[datetime, int]
+
+# keyset cursor "<iso timestamp>,<id>" of the last row of a page (X-Next-Cursor)
+def parse_cursor(raw: str) -> Cursor:
+    ts, sep, metric_id = raw.rpartition(",")
+    if not sep:
+        raise ValueError("Cursor must look like '<timestamp>,<id>'")
+    ts = datetime.fromisoformat(ts)
+    if ts.tzinfo is not None:
+        # metrics.timestamp is naive UTC
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts, int(metric_id)
+
+def next_cursor(metrics: Sequence[Metric], limit: int) -> Optional[str]:
+    if len(metrics) < limit:
+        return None
+    last = metrics[-1]
+    return f"{last.timestamp.isoformat()},{last.id}"
+
+# plain columns for read paths that only serialize (no ORM identity map / instrumentation)
+METRIC_COLUMNS = (Metric.id, Metric.host, Metric.cpu_usage, Metric.memory_usage, Metric.latency, Metric.timestamp)
+
+# newest first, (timestamp, id) keyset so deep pages walk the index instead of OFFSET
+def recent_metrics_statement(limit: int, host: str = "", before: Optional[Cursor] = None, columns: bool = False):
+    stmt = select(*METRIC_COLUMNS) if columns else select(Metric)
+    if host:
+        stmt = stmt.where(Metric.host == host)
+    if before is not None:
+        # the plain timestamp bound is what lets PostgreSQL prune partitions
+        stmt = stmt.where(Metric.timestamp <= before[0], tuple_(Metric.timestamp, Metric.id) < tuple_(*before))
+    return stmt.order_by(Metric.timestamp.desc(), Metric.id.desc()).limit(limit)
+
+# newest rows of one host straight from memory when the hot window holds them
+def _from_hot_cache(limit: int, host: str, before: Optional[Cursor]):
+    if not host or not settings.HOT_CACHE_ENABLED:
+        return None
+    return hot_cache.recent(host, limit, before)
+
 # retrieve recent metrics
-def get_recent_metrics(db: Session, limit: int = 50):
-    return db.query(Metric).order_by(Metric.timestamp.desc()).limit(limit).all()
\ No newline at end of file
+def get_recent_metrics(db: Session, limit: int = 50, host: str = "", before: Optional[Cursor] = None):
+    cached = _from_hot_cache(limit, host, before)
+    if cached is not None:
+        return cached
+    return db.scalars(recent_metrics_statement(limit, host, before)).all()
+
+# same rows as get_recent_metrics, as column tuples (attribute access like Metric)
+def get_recent_metric_rows(db: Session, limit: int = 50, host: str = "", before: Optional[Cursor] = None):
+    cached = _from_hot_cache(limit, host, before)
+    if cached is not None:
+        return cached
+    return db.execute(recent_metrics_statement(limit, host, before, columns=True)).all()
+
+# async variants for DB_ASYNC reads. Writes have none: the async routes run the
+# sync pipeline in the threadpool on their own Session, because the alert and
+# anomaly indexes hold threading locks across statements (greenlets under
+# run_sync share the event loop thread, so the locks would not exclude them)
+# and the NumPy work would block the loop
+async def get_recent_metrics_async(db: AsyncSession, limit: int = 50, host: str = "", before: Optional[Cursor] = None):
+    cached = _from_hot_cache(limit, host, before)
+    if cached is not None:
+        return cached
+    return (await db.scalars(recent_metrics_statement(limit, host, before))).all()
+
+async def get_recent_metric_rows_async(db: AsyncSession, limit: int = 50, host: str = "", before: Optional[Cursor] = None):
+    cached = _from_hot_cache(limit, host, before)
+    if cached is not None:
+        return cached
+    return (await db.execute(recent_metrics_statement(limit, host, before, columns=True))).all()
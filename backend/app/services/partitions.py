@@ -0,0 +1,182 @@
+# backend/app/services/partitions.py
+import logging
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.metric import Metric
+from app.models.rollup import MetricRollup1h, MetricRollup1m
+
+logger = logging.getLogger(__name__)
+
+PARENT = "metrics"
+DEFAULT_PARTITION = "metrics_default"  # catches rows no daily partition covers
+DAY = timedelta(days=1)
+DELETE_CHUNK = 50_000  # rows per DELETE on an unpartitioned metrics table
+LOCK_KEY = 0x48594452  # pg advisory lock so several workers don't race on DDL
+
+_PARTITION_NAME = re.compile(r"^metrics_p(\d{8})$")
+
+
+def partition_name(day: date) -> str:
+    return f"{PARENT}_p{day:%Y%m%d}"
+
+
+def _bounds(day: date):
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return start, start + DAY
+
+
+def partition_ddl(day: date) -> str:
+    """CREATE statement for the partition holding [day, day + 1) in UTC."""
+    start, end = _bounds(day)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def create_partition(db: Session, day: date):
+    """Create one daily partition, first moving any rows for that day out of the default partition."""
+    start, end = _bounds(day)
+    bounds = {"start": start, "end": end}
+    stray = db.scalar(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end)"
+    ), bounds)
+    if not stray:
+        db.execute(text(partition_ddl(day)))
+        return
+    name = partition_name(day)
+    db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    db.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :parent AND pg_table_is_visible(c.oid))"
+    ), {"parent": PARENT}))
+
+
+def list_partitions(db: Session) -> Dict[date, str]:
+    """Daily partitions currently attached to metrics (the default partition is skipped)."""
+    names = db.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent AND pg_table_is_visible(p.oid)"
+    ), {"parent": PARENT})
+    partitions = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[datetime.strptime(match.group(1), "%Y%m%d").date()] = name
+    return partitions
+
+
+def ensure_partitions(db: Session, today: date, days_ahead: int) -> List[str]:
+    """Create the partitions for today .. today + days_ahead that are missing."""
+    existing = list_partitions(db)
+    created = []
+    for offset in range(days_ahead + 1):
+        day = today + offset * DAY
+        if day not in existing:
+            create_partition(db, day)
+            created.append(partition_name(day))
+    return created
+
+
+def expire_partitions(db: Session, cutoff: date, detach: bool = False) -> List[str]:
+    """Drop (or detach, keeping the table for archiving) partitions entirely before ``cutoff``."""
+    expired = []
+    for day, name in sorted(list_partitions(db).items()):
+        if day >= cutoff:
+            break
+        if detach:
+            db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        else:
+            db.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+    return expired
+
+
+def delete_expired_metrics(db: Session, cutoff: datetime, chunk: int = DELETE_CHUNK) -> int:
+    """Retention for an unpartitioned metrics table: chunked DELETE, committed per chunk."""
+    if db.get_bind().dialect.name != "postgresql":
+        # metrics.timestamp is naive UTC outside PostgreSQL
+        cutoff = cutoff.replace(tzinfo=None)
+    total = 0
+    while True:
+        ids = select(Metric.id).where(Metric.timestamp < cutoff).limit(chunk).scalar_subquery()
+        deleted = db.execute(delete(Metric).where(Metric.id.in_(ids))).rowcount
+        db.commit()
+        total += deleted
+        if deleted < chunk:
+            return total
+
+
+def prune_rollups(db: Session, now: datetime) -> Dict[str, int]:
+    deleted = {}
+    for model, days in ((MetricRollup1m, settings.RETENTION_1M_DAYS), (MetricRollup1h, settings.RETENTION_1H_DAYS)):
+        if days > 0:
+            result = db.execute(delete(model).where(model.bucket < now - timedelta(days=days)))
+            deleted[model.__tablename__] = result.rowcount
+    return deleted
+
+
+def run_maintenance(db: Session, now: Optional[datetime] = None) -> dict:
+    """Pre-create future partitions and apply the retention policy (commits)."""
+    now = now or datetime.now(timezone.utc)
+    today = now.astimezone(timezone.utc).date()
+    raw_cutoff = today - settings.RETENTION_RAW_DAYS * DAY if settings.RETENTION_RAW_DAYS > 0 else None
+    report = {"partitioned": is_partitioned(db), "created": [], "expired": [], "deleted_raw": 0, "deleted_rollups": {}}
+
+    if report["partitioned"]:
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+        report["created"] = ensure_partitions(db, today, settings.PARTITION_PREMAKE_DAYS)
+        if raw_cutoff is not None:
+            report["expired"] = expire_partitions(db, raw_cutoff, detach=settings.RETENTION_DETACH_ONLY)
+        db.commit()
+    elif raw_cutoff is not None:
+        cutoff = datetime(raw_cutoff.year, raw_cutoff.month, raw_cutoff.day, tzinfo=timezone.utc)
+        report["deleted_raw"] = delete_expired_metrics(db, cutoff)
+
+    report["deleted_rollups"] = prune_rollups(db, now)
+    db.commit()
+    return report
+
+
+def _maintenance_loop(interval_seconds: float):
+    while True:
+        db = SessionLocal()
+        try:
+            report = run_maintenance(db)
+            if report["created"] or report["expired"] or report["deleted_raw"]:
+                logger.info(f"Partition maintenance: {report}")
+        except Exception as exc:
+            db.rollback()
+            logger.error(f"Partition maintenance failed: {exc}")
+        finally:
+            db.close()
+        time.sleep(interval_seconds)
+
+
+def start_partition_maintenance(interval_minutes: float, daemon: bool = True):
+    t = threading.Thread(target=_maintenance_loop, args=(interval_minutes * 60,), daemon=daemon)
+    t.start()
+    return t
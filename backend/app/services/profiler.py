@@ -0,0 +1,150 @@
+# backend/app/services/profiler.py
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# a stack is a tuple of code objects, outermost first
+Stack = Tuple[object, ...]
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Statistical wall-clock profiler over every thread of the process.
+
+    A daemon thread wakes every ``interval`` seconds, reads all thread stacks
+    with ``sys._current_frames()`` and counts identical stacks, so the cost is
+    one stack walk per thread per sample, independent of what the threads do.
+    ``overhead`` is the share of wall time spent sampling (it holds the GIL).
+    Threads blocked in I/O or waiting on locks are sampled too: this is
+    wall-clock time, not CPU time.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.counts: Counter = Counter()  # (thread name, stack) -> samples
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started = self.stopped = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.stopped or time.perf_counter()) - self.started
+
+    @property
+    def overhead(self) -> float:
+        return self.sampling_seconds / self.duration if self.duration > 0 else 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="hydra-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped = time.perf_counter()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            began = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.reverse()
+                self.counts[(names.get(ident, f"thread-{ident}"), tuple(stack))] += 1
+            self.samples += 1
+            self.sampling_seconds += time.perf_counter() - began
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format: ``thread;outer;...;inner count`` per line (flamegraph.pl, speedscope)."""
+        lines = []
+        for (thread, stack), count in self.counts.most_common():
+            lines.append(";".join([thread.replace(";", ":"), *(_label(c).replace(";", ":") for c in stack)]) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "hydra") -> dict:
+        """Speedscope file format: one sampled profile per thread, weights in seconds."""
+        frames: List[dict] = []
+        index: Dict[object, int] = {}
+        profiles: Dict[str, dict] = {}
+        for (thread, stack), count in self.counts.most_common():
+            ids = []
+            for code in stack:
+                if code not in index:
+                    index[code] = len(frames)
+                    frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+                ids.append(index[code])
+            profile = profiles.setdefault(thread, {
+                "type": "sampled", "name": thread, "unit": "seconds",
+                "startValue": 0, "endValue": round(self.duration, 6), "samples": [], "weights": [],
+            })
+            profile["samples"].append(ids)
+            profile["weights"].append(round(count * self.interval, 6))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "hydra",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": sorted(profiles.values(), key=lambda p: -sum(p["weights"])),
+        }
+
+
+class HeapTracker:
+    """tracemalloc on demand: ``start`` costs memory and allocation speed until ``stop``."""
+
+    def __init__(self):
+        self._last: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._last = None
+
+    def stop(self):
+        tracemalloc.stop()
+        self._last = None
+
+    def top(self, limit: int = 25, group_by: str = "lineno", diff: bool = False) -> dict:
+        """Largest allocation sites still alive; with ``diff``, growth since the previous call."""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, self._last = self._last, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        if diff and previous is not None:
+            stats = snapshot.compare_to(previous, group_by)
+            top = [{"location": _location(s.traceback), "size": s.size, "count": s.count,
+                    "size_diff": s.size_diff, "count_diff": s.count_diff} for s in stats[:limit]]
+        else:
+            stats = snapshot.statistics(group_by)
+            top = [{"location": _location(s.traceback), "size": s.size, "count": s.count} for s in stats[:limit]]
+        return {"traced_bytes": current, "peak_bytes": peak, "group_by": group_by, "diff": diff and previous is not None,
+                "top": top}
+
+
+def _location(traceback) -> List[str]:
+    return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+
+heap_tracker = HeapTracker()
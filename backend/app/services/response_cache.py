@@ -0,0 +1,236 @@
+# backend/app/services/response_cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # the shared backend is optional, in-process works without it
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# invalidation tags: ingest bumps the hosts it wrote plus ALL_METRICS, alert writes bump ALERTS
+ALERTS = "alerts"
+ALL_METRICS = "metrics:*"
+
+Headers = Dict[str, str]
+Builder = Callable[[], Tuple[bytes, Headers]]
+
+
+def metrics_tag(host: str = "") -> str:
+    return f"metrics:{host}" if host else ALL_METRICS
+
+
+def etag_of(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class CachedResponse:
+    """Serialized JSON body plus the headers that go with it."""
+
+    __slots__ = ("body", "headers", "etag", "generations")
+
+    def __init__(self, body: bytes, headers: Headers, generations: Sequence[int] = ()):
+        self.body = body
+        self.headers = headers
+        self.etag = etag_of(body)
+        self.generations = tuple(generations)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items()) + 200
+
+
+class MemoryBackend:
+    """Per-process LRU bounded by entry count and bytes; expired entries are dropped on read."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, entry: CachedResponse, ttl: float):
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._bytes += entry.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        _, entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def generations(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def bump(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._bytes = 0
+
+
+class RedisBackend:
+    """Entries and tag generations in Redis, so every worker sees every invalidation."""
+
+    def __init__(self, url: str, prefix: str = "hydra:rc:"):
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        blob = self.client.get(self.prefix + key)
+        if blob is None:
+            return None
+        meta, body = blob.split(b"\n", 1)
+        meta = json.loads(meta)
+        return CachedResponse(body, meta["headers"], meta["generations"])
+
+    def set(self, key: str, entry: CachedResponse, ttl: float):
+        meta = json.dumps({"headers": entry.headers, "generations": entry.generations}).encode()
+        self.client.set(self.prefix + key, meta + b"\n" + entry.body, px=max(int(ttl * 1000), 1))
+
+    def generations(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        if not tags:
+            return ()
+        return tuple(int(v or 0) for v in self.client.mget([self.prefix + "gen:" + t for t in tags]))
+
+    def bump(self, tags: Iterable[str]):
+        pipe = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(self.prefix + "gen:" + tag)
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """Short-TTL cache of serialized read responses, invalidated by tag.
+
+    Every entry records the generation of its tags at the time it started being
+    built; a write bumps the generations, so anything cached before (or while)
+    the write committed is never served again.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = self.misses = 0
+
+    def lookup(self, key: str, tags: Sequence[str]) -> Tuple[Optional[CachedResponse], Tuple[int, ...]]:
+        """Cached entry (or None) and the current tag generations to store a fresh one under."""
+        generations = self.backend.generations(tags)
+        entry = self.backend.get(key)
+        if entry is not None and entry.generations == generations:
+            self.hits += 1
+            return entry, generations
+        self.misses += 1
+        return None, generations
+
+    def store(self, key: str, generations: Sequence[int], body: bytes, headers: Headers) -> CachedResponse:
+        entry = CachedResponse(body, headers, generations)
+        self.backend.set(key, entry, self.ttl)
+        return entry
+
+    def invalidate(self, tags: Iterable[str]):
+        self.backend.bump(tags)
+
+    def invalidate_metrics(self, hosts: Iterable[str]):
+        self.invalidate([ALL_METRICS, *(metrics_tag(h) for h in hosts)])
+
+    def reset(self):
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+
+def _make_backend():
+    if settings.RESPONSE_CACHE_REDIS_URL:
+        if redis is not None:
+            return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+        logger.warning("RESPONSE_CACHE_REDIS_URL is set but redis is not installed; using the in-process cache")
+    return MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, int(settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024))
+
+
+response_cache = ResponseCache(_make_backend(), settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+# route helpers
+
+def cache_key(request: Request) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _respond(request: Request, entry: CachedResponse) -> Response:
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def cached_json(request: Request, tags: Sequence[str], build: Builder) -> Response:
+    """Serve ``build()`` -> (JSON bytes, headers) through the response cache, with ETag/304."""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return _respond(request, CachedResponse(*build()))
+    key = cache_key(request)
+    entry, generations = response_cache.lookup(key, tags)
+    if entry is None:
+        entry = response_cache.store(key, generations, *build())
+    return _respond(request, entry)
+
+
+async def cached_json_async(request: Request, tags: Sequence[str], build: Callable[[], Awaitable[Tuple[bytes, Headers]]]) -> Response:
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return _respond(request, CachedResponse(*await build()))
+    key = cache_key(request)
+    entry, generations = response_cache.lookup(key, tags)
+    if entry is None:
+        entry = response_cache.store(key, generations, *await build())
+    return _respond(request, entry)
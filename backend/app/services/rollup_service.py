@@ -0,0 +1,165 @@
+# backend/app/services/rollup_service.py
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, delete, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.metric import Metric
+from app.models.rollup import MetricRollup1h, MetricRollup1m
+from app.services.metric_batch import METRIC_FIELDS, MetricBatch, to_epoch
+from app.services.sketch import QuantileSketch
+
+ROLLUPS = (MetricRollup1m, MetricRollup1h)  # finest first
+KEY_CHUNK = 1000  # (host, bucket) keys per statement
+
+RollupKey = Tuple[str, int]  # (host, bucket start in epoch seconds)
+
+
+def bucket_datetime(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class RollupPartial:
+    """Aggregate of one (host, bucket) computed from a batch, mergeable into a row."""
+    __slots__ = ("count", "sums", "mins", "maxs", "sketches")
+
+    def __init__(self, count, sums, mins, maxs, sketches):
+        self.count = count
+        self.sums = sums
+        self.mins = mins
+        self.maxs = maxs
+        self.sketches = sketches
+
+    def merged_row(self, row) -> dict:
+        """Column values after folding this partial into an existing rollup row (a mapping)."""
+        values = {"count": row["count"] + self.count}
+        for i, field in enumerate(METRIC_FIELDS):
+            old_min, old_max = row[f"{field}_min"], row[f"{field}_max"]
+            values[f"{field}_sum"] = row[f"{field}_sum"] + self.sums[i]
+            values[f"{field}_min"] = self.mins[i] if old_min is None else min(old_min, self.mins[i])
+            values[f"{field}_max"] = self.maxs[i] if old_max is None else max(old_max, self.maxs[i])
+            sketch = QuantileSketch.from_bytes(row[f"{field}_sketch"]).merge(self.sketches[i])
+            values[f"{field}_sketch"] = sketch.to_bytes()
+        return values
+
+
+def aggregate_batch(batch: MetricBatch, width: int) -> Dict[RollupKey, RollupPartial]:
+    """Group a batch by (host, bucket) with NumPy reductions."""
+    if not len(batch):
+        return {}
+    _, codes = batch.host_index
+    buckets = (np.floor(batch.ts / width) * width).astype(np.int64)
+    order = np.lexsort((buckets, codes))
+    codes_sorted, buckets_sorted = codes[order], buckets[order]
+    starts = np.flatnonzero(np.r_[True, (codes_sorted[1:] != codes_sorted[:-1]) | (buckets_sorted[1:] != buckets_sorted[:-1])])
+    ends = np.r_[starts[1:], len(order)]
+    counts = ends - starts
+
+    columns = [batch.column(field)[order] for field in METRIC_FIELDS]
+    sums = [np.add.reduceat(col, starts) for col in columns]
+    mins = [np.minimum.reduceat(col, starts) for col in columns]
+    maxs = [np.maximum.reduceat(col, starts) for col in columns]
+
+    partials = {}
+    for g, (start, end) in enumerate(zip(starts, ends)):
+        sketches = []
+        for col in columns:
+            sketch = QuantileSketch()
+            sketch.add_many(col[start:end])
+            sketches.append(sketch)
+        key = (batch.hosts[order[start]], int(buckets_sorted[start]))
+        partials[key] = RollupPartial(
+            int(counts[g]),
+            [float(s[g]) for s in sums],
+            [float(m[g]) for m in mins],
+            [float(m[g]) for m in maxs],
+            sketches,
+        )
+    return partials
+
+
+def update_rollups(db: Session, batch: MetricBatch):
+    """Fold a freshly ingested batch into every rollup table (no commit)."""
+    for model in ROLLUPS:
+        partials = aggregate_batch(batch, model.bucket_seconds)
+        keys = list(partials)
+        for i in range(0, len(keys), KEY_CHUNK):
+            _merge_partials(db, model, {k: partials[k] for k in keys[i:i + KEY_CHUNK]})
+
+
+def _merge_partials(db: Session, model, partials: Dict[RollupKey, RollupPartial]):
+    table = model.__table__
+    keys = [(host, bucket_datetime(bucket)) for host, bucket in partials]
+    key_filter = tuple_(table.c.host, table.c.bucket).in_(keys)
+
+    # make sure every row exists, then lock them so concurrent batches merge serially
+    empty_rows = [{"host": host, "bucket": bucket, "count": 0} for host, bucket in keys]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(dialect_insert(table).on_conflict_do_nothing(), empty_rows)
+    else:
+        found = {(r.host, to_epoch(r.bucket)) for r in db.execute(select(table.c.host, table.c.bucket).where(key_filter))}
+        missing = [row for row in empty_rows if (row["host"], to_epoch(row["bucket"])) not in found]
+        if missing:
+            db.execute(insert(table), missing)
+
+    rows = db.execute(select(table).where(key_filter).with_for_update()).mappings().all()
+    params = []
+    for row in rows:
+        partial = partials[(row["host"], int(to_epoch(row["bucket"])))]
+        values = partial.merged_row(row)
+        params.append({"b_host": row["host"], "b_bucket": row["bucket"], **{f"b_{k}": v for k, v in values.items()}})
+    if params:
+        columns = [c for c in params[0] if c not in ("b_host", "b_bucket")]
+        stmt = (
+            update(table)
+            .where(table.c.host == bindparam("b_host"), table.c.bucket == bindparam("b_bucket"))
+            .values({c[2:]: bindparam(c) for c in columns})
+        )
+        db.execute(stmt, params)
+
+
+def rebuild_rollups(db: Session, start: datetime, end: datetime, chunk: timedelta = timedelta(hours=1)) -> int:
+    """Recompute rollups for [start, end) from raw metrics in one transaction.
+
+    The range is widened to whole hours so the 1h rollup is rebuilt completely.
+    Readers keep seeing the old rows until the commit; ``chunk`` only bounds how
+    many raw rows are held in memory at once. Returns the number of raw metrics read.
+    """
+    coarsest = ROLLUPS[-1].bucket_seconds
+    start = bucket_datetime(int(to_epoch(start) // coarsest * coarsest))
+    end = bucket_datetime(int(-(-to_epoch(end) // coarsest) * coarsest))
+    try:
+        for model in ROLLUPS:
+            db.execute(delete(model.__table__).where(model.bucket >= start, model.bucket < end))
+        total = 0
+        cursor = start
+        while cursor < end:
+            upper = min(cursor + chunk, end)
+            rows = raw_metric_rows(db, cursor, upper)
+            if rows:
+                update_rollups(db, MetricBatch.from_items(rows))
+                total += len(rows)
+            cursor = upper
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return total
+
+
+def raw_metric_rows(db: Session, start: datetime, end: datetime, hosts: Sequence[str] = ()) -> List:
+    """Raw metrics in [start, end), optionally for some hosts, as rows MetricBatch can read."""
+    # metrics.timestamp is naive in the ORM model; compare in naive UTC on non-PG dialects
+    if db.get_bind().dialect.name != "postgresql":
+        start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    stmt = select(
+        Metric.host, Metric.cpu_usage, Metric.memory_usage, Metric.latency, Metric.timestamp
+    ).where(Metric.timestamp >= start, Metric.timestamp < end)
+    if hosts:
+        stmt = stmt.where(Metric.host.in_(list(hosts)))
+    return db.execute(stmt).all()
@@ -0,0 +1,43 @@
+# backend/app/services/serialization.py
+import json
+from datetime import datetime
+from typing import Iterable, Sequence
+
+try:
+    import orjson
+except ImportError:  # stdlib json is slower but produces the same documents
+    orjson = None
+
+# MetricResponse field order, so rows serialize like the pydantic model would
+METRIC_FIELDS = ("host", "cpu_usage", "memory_usage", "latency", "timestamp", "id")
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+
+def metric_rows_json(rows: Sequence) -> bytes:
+    """``[{host, cpu_usage, ..., id}, ...]`` straight from column tuples (or anything with those attributes)."""
+    return dumps([
+        {"host": r.host, "cpu_usage": r.cpu_usage, "memory_usage": r.memory_usage,
+         "latency": r.latency, "timestamp": r.timestamp, "id": r.id}
+        for r in rows
+    ])
+
+
+def metric_columns_json(rows: Iterable) -> bytes:
+    """Columnar ``{field: [...]}``, one array per MetricResponse field in row order."""
+    columns = {field: [] for field in METRIC_FIELDS}
+    appends = [columns[field].append for field in METRIC_FIELDS]
+    for r in rows:
+        for append, value in zip(appends, (r.host, r.cpu_usage, r.memory_usage, r.latency, r.timestamp, r.id)):
+            append(value)
+    return dumps(columns)
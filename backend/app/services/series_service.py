@@ -0,0 +1,297 @@
+# backend/app/services/series_service.py
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.metric import Metric
+from app.models.rollup import MetricRollup1h, MetricRollup1m
+from app.services.metric_batch import METRIC_FIELDS, MetricBatch, to_epoch
+from app.services.rollup_service import aggregate_batch, bucket_datetime, raw_metric_rows
+from app.services.sketch import QuantileSketch
+
+BUCKETS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+BASIC_AGGS = ("avg", "min", "max", "sum")
+MAX_BUCKETS = 20_000  # per host
+SOURCES = ("auto", "raw", "rollup")
+
+
+def parse_aggs(raw: str) -> List[str]:
+    """Validate an agg list like "avg,max,p95"; raises ValueError on unknown names."""
+    aggs = []
+    for agg in (a.strip().lower() for a in raw.split(",")):
+        if not agg:
+            continue
+        if agg not in BASIC_AGGS and not _percentile(agg):
+            raise ValueError(f"Unknown aggregation '{agg}' (use {', '.join(BASIC_AGGS)} or p1..p99)")
+        if agg not in aggs:
+            aggs.append(agg)
+    if not aggs:
+        raise ValueError("At least one aggregation is required")
+    return aggs
+
+
+def parse_fields(raw: str) -> List[str]:
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in METRIC_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown metric field(s) {unknown} (use {', '.join(METRIC_FIELDS)})")
+    return fields
+
+
+def _percentile(agg: str) -> Optional[float]:
+    if agg.startswith("p") and agg[1:].isdigit() and 1 <= int(agg[1:]) <= 99:
+        return int(agg[1:]) / 100.0
+    return None
+
+
+def choose_rollup(width: int):
+    """Coarsest rollup table whose buckets tile the requested bucket width."""
+    for model in (MetricRollup1h, MetricRollup1m):
+        if width % model.bucket_seconds == 0:
+            return model
+    return None
+
+
+def get_series(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    bucket: str = "5m",
+    aggs: Sequence[str] = ("avg",),
+    fields: Sequence[str] = METRIC_FIELDS,
+    hosts: Sequence[str] = (),
+    source: str = "auto",
+) -> dict:
+    """Bucket metrics per host over [start, end) and return compact column arrays.
+
+    Buckets are aligned to the epoch (``floor(ts / width) * width``) and only
+    non-empty buckets are returned. ``ts`` holds bucket starts in epoch seconds.
+    With ``source="auto"`` the coarsest usable rollup table answers the query
+    and raw metrics are only scanned when rollups are disabled.
+    """
+    width = BUCKETS[bucket]
+    start, end = _as_utc(start), _as_utc(end)
+    if (to_epoch(end) - to_epoch(start)) / width > MAX_BUCKETS:
+        raise ValueError(f"Range too wide for bucket '{bucket}' (more than {MAX_BUCKETS} buckets)")
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source '{source}' (use {', '.join(SOURCES)})")
+
+    rollup = None
+    if source == "rollup" or (source == "auto" and settings.ROLLUPS_ENABLED):
+        rollup = choose_rollup(width)
+        if rollup is None and source == "rollup":
+            raise ValueError(f"No rollup table can serve bucket '{bucket}'")
+
+    if rollup is not None:
+        series = _series_rollup(db, rollup, start, end, width, aggs, fields, hosts)
+    elif db.get_bind().dialect.name == "postgresql":
+        series = _series_sql(db, start, end, width, aggs, fields, hosts)
+    else:
+        series = _series_numpy(db, start, end, width, aggs, fields, hosts)
+    return {
+        "bucket": bucket,
+        "bucket_seconds": width,
+        "source": rollup.__tablename__ if rollup is not None else "metrics",
+        "from": start,
+        "to": end,
+        "aggs": list(aggs),
+        "fields": list(fields),
+        "series": series,
+    }
+
+
+def _as_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _agg_expr(agg: str, column):
+    q = _percentile(agg)
+    if q is not None:
+        return func.percentile_cont(q).within_group(column)
+    return {"avg": func.avg, "min": func.min, "max": func.max, "sum": func.sum}[agg](column)
+
+
+def series_statement(start, end, width, aggs, fields, hosts):
+    """SQL bucketing statement (PostgreSQL) grouping by host and bucket start."""
+    bucket_col = (func.floor(func.extract("epoch", Metric.timestamp) / width) * width).label("bucket")
+    columns = [Metric.host, bucket_col, func.count().label("count")]
+    for field in fields:
+        column = getattr(Metric, field)
+        columns.extend(_agg_expr(agg, column).label(f"{field}_{agg}") for agg in aggs)
+    stmt = select(*columns).where(Metric.timestamp >= start, Metric.timestamp < end)
+    if hosts:
+        stmt = stmt.where(Metric.host.in_(list(hosts)))
+    return stmt.group_by(Metric.host, bucket_col).order_by(Metric.host, bucket_col)
+
+
+def _series_sql(db, start, end, width, aggs, fields, hosts) -> List[dict]:
+    result = db.execute(series_statement(start, end, width, aggs, fields, hosts))
+    keys = list(result.keys())[2:]
+    series: Dict[str, dict] = {}
+    for row in result:
+        entry = series.get(row[0])
+        if entry is None:
+            entry = series[row[0]] = {"host": row[0], "ts": [], **{k: [] for k in keys}}
+        entry["ts"].append(int(row[1]))
+        for key, value in zip(keys, row[2:]):
+            entry[key].append(None if value is None else round(float(value), 3))
+    return list(series.values())
+
+
+def _to_list(values: np.ndarray) -> list:
+    rounded = np.round(values, 3)
+    if np.isnan(rounded).any():
+        return np.where(np.isnan(rounded), None, rounded).tolist()
+    return rounded.tolist()
+
+
+def _series_numpy(db, start, end, width, aggs, fields, hosts) -> List[dict]:
+    # fallback for SQLite: pull plain columns and bucket in NumPy
+    naive_start = start.replace(tzinfo=None)
+    naive_end = end.replace(tzinfo=None)
+    stmt = select(Metric.host, Metric.timestamp, *[getattr(Metric, f) for f in fields]).where(
+        Metric.timestamp >= naive_start, Metric.timestamp < naive_end
+    )
+    if hosts:
+        stmt = stmt.where(Metric.host.in_(list(hosts)))
+    rows = db.execute(stmt).all()
+    if not rows:
+        return []
+
+    host_col = np.array([r[0] for r in rows], dtype=object)
+    buckets = np.floor(np.array([to_epoch(r[1]) for r in rows]) / width).astype(np.int64) * width
+    values = np.array([r[2:] for r in rows], dtype=np.float64).reshape(len(rows), len(fields))
+
+    host_names, codes = np.unique(host_col, return_inverse=True)
+    order = np.lexsort((buckets, codes))
+    codes, buckets, values = codes[order], buckets[order], values[order]
+    starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (buckets[1:] != buckets[:-1])])
+    ends = np.r_[starts[1:], len(order)]
+    counts = ends - starts
+
+    columns = {"count": counts.tolist()}
+    for j, field in enumerate(fields):
+        col = values[:, j]
+        for agg in aggs:
+            q = _percentile(agg)
+            if q is not None:
+                out = np.array([np.percentile(col[s:e], q * 100) for s, e in zip(starts, ends)])
+            elif agg == "avg":
+                out = np.add.reduceat(col, starts) / counts
+            elif agg == "sum":
+                out = np.add.reduceat(col, starts)
+            elif agg == "min":
+                out = np.minimum.reduceat(col, starts)
+            else:
+                out = np.maximum.reduceat(col, starts)
+            columns[f"{field}_{agg}"] = _to_list(out)
+
+    return _split_by_host(host_names, codes[starts], buckets[starts], columns)
+
+
+def _series_rollup(db, model, start, end, width, aggs, fields, hosts) -> List[dict]:
+    # merge rollup rows into the requested buckets; sketches only when a percentile is asked
+    want_sketch = any(_percentile(a) is not None for a in aggs)
+    columns = [model.host, model.bucket, model.count]
+    for field in fields:
+        columns += [getattr(model, f"{field}_{part}") for part in ("sum", "min", "max")]
+        if want_sketch:
+            columns.append(getattr(model, f"{field}_sketch"))
+    # only tiles that lie inside [start, end) are read; the partial tiles at either
+    # edge are aggregated from raw rows so no sample outside the range is counted
+    tile = model.bucket_seconds
+    inner_start = int(-(-to_epoch(start) // tile) * tile)
+    inner_end = max(int(to_epoch(end) // tile * tile), inner_start)
+    rows = []
+    if inner_start < inner_end:
+        stmt = select(*columns).where(
+            model.bucket >= bucket_datetime(inner_start), model.bucket < bucket_datetime(inner_end), model.count > 0
+        )
+        if hosts:
+            stmt = stmt.where(model.host.in_(list(hosts)))
+        rows = db.execute(stmt).all()
+        edges = [(start, bucket_datetime(inner_start)), (bucket_datetime(inner_end), end)]
+    else:
+        edges = [(start, end)]
+    for lo, hi in edges:
+        if lo < hi:
+            rows += _edge_rows(db, lo, hi, tile, fields, hosts, want_sketch)
+    if not rows:
+        return []
+
+    per_field = 4 if want_sketch else 3
+    host_col = np.array([r[0] for r in rows], dtype=object)
+    buckets = (np.array([to_epoch(r[1]) for r in rows]) // width).astype(np.int64) * width
+    counts_raw = np.array([r[2] for r in rows], dtype=np.int64)
+
+    host_names, codes = np.unique(host_col, return_inverse=True)
+    order = np.lexsort((buckets, codes))
+    codes, buckets, counts_raw = codes[order], buckets[order], counts_raw[order]
+    rows = [rows[i] for i in order]
+    starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (buckets[1:] != buckets[:-1])])
+    ends = np.r_[starts[1:], len(order)]
+    counts = np.add.reduceat(counts_raw, starts)
+
+    out_columns = {"count": counts.tolist()}
+    for j, field in enumerate(fields):
+        base = 3 + j * per_field
+        sums = np.array([r[base] for r in rows], dtype=np.float64)
+        mins = np.array([r[base + 1] for r in rows], dtype=np.float64)
+        maxs = np.array([r[base + 2] for r in rows], dtype=np.float64)
+        sketches = None
+        if want_sketch:
+            sketches = []
+            for s, e in zip(starts, ends):
+                merged = QuantileSketch()
+                for r in rows[s:e]:
+                    merged.merge(QuantileSketch.from_bytes(r[base + 3]))
+                sketches.append(merged)
+        for agg in aggs:
+            q = _percentile(agg)
+            if q is not None:
+                out = np.array([sk.quantile(q) for sk in sketches], dtype=np.float64)
+            elif agg == "avg":
+                out = np.add.reduceat(sums, starts) / counts
+            elif agg == "sum":
+                out = np.add.reduceat(sums, starts)
+            elif agg == "min":
+                out = np.minimum.reduceat(mins, starts)
+            else:
+                out = np.maximum.reduceat(maxs, starts)
+            out_columns[f"{field}_{agg}"] = _to_list(out)
+    return _split_by_host(host_names, codes[starts], buckets[starts], out_columns)
+
+
+def _edge_rows(db, start, end, tile, fields, hosts, want_sketch) -> List[tuple]:
+    # raw rows aggregated per tile with the ingest code path, laid out like rollup rows
+    raw = raw_metric_rows(db, start, end, hosts)
+    if not raw:
+        return []
+    rows = []
+    for (host, bucket), partial in aggregate_batch(MetricBatch.from_items(raw), tile).items():
+        row = [host, bucket_datetime(bucket), partial.count]
+        for field in fields:
+            i = METRIC_FIELDS.index(field)
+            row += [partial.sums[i], partial.mins[i], partial.maxs[i]]
+            if want_sketch:
+                row.append(partial.sketches[i].to_bytes())
+        rows.append(tuple(row))
+    return rows
+
+
+def _split_by_host(host_names, group_hosts, group_buckets, columns) -> List[dict]:
+    # groups are sorted by host code, so each host is one contiguous slice
+    series = []
+    bucket_starts = group_buckets.tolist()
+    bounds = np.flatnonzero(np.r_[True, group_hosts[1:] != group_hosts[:-1], True])
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        entry = {"host": host_names[group_hosts[lo]], "ts": bucket_starts[lo:hi]}
+        entry.update({key: col[lo:hi] for key, col in columns.items()})
+        series.append(entry)
+    return series
@@ -0,0 +1,92 @@
+# backend/app/services/simulation.py
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+DAY_SECONDS = 86_400.0
+
+
+def host_names(count: int, prefix: str = "sim-host") -> np.ndarray:
+    width = max(5, len(str(count - 1)))
+    return np.array([f"{prefix}-{i:0{width}d}" for i in range(count)], dtype=object)
+
+
+class FleetSimulator:
+    """Vectorized synthetic fleet; every ``sample`` advances a set of hosts to a timestamp.
+
+    Per host there is a base load, a daily cycle (own amplitude and phase), AR(1)
+    noise, Poisson spikes that decay, and a slow memory drift that resets like a
+    restart. Memory follows CPU, and latency grows sharply as CPU saturates, so
+    the three series are correlated the way real hosts are. Host parameters only
+    depend on ``seed``, so processes sharing a seed can each drive a disjoint
+    shard of the same fleet.
+    """
+
+    def __init__(self, hosts: Sequence[str], seed: Optional[int] = None):
+        self.hosts = np.asarray(hosts, dtype=object)
+        n = len(self.hosts)
+        params = np.random.default_rng(seed)
+        self.base_cpu = params.uniform(10.0, 55.0, n)
+        self.diurnal_amplitude = params.uniform(5.0, 30.0, n)
+        self.phase = params.uniform(0.0, 2 * np.pi, n)
+        self.base_memory = params.uniform(20.0, 60.0, n)
+        self.memory_drift = params.exponential(0.5, n)  # percent per hour, a slow leak on some hosts
+        self.base_latency = params.lognormal(np.log(20.0), 0.5, n)
+        self.spike_rate = params.uniform(0.05, 0.5, n)  # spikes per hour
+        # evolving state; noise draws are independent of the host parameters
+        self.rng = np.random.default_rng(None if seed is None else seed + 1)
+        self._noise = np.zeros(n)
+        self._spike = np.zeros(n)
+        self._memory_offset = np.zeros(n)
+        self._last = np.full(n, np.nan)
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    def sample(self, ts: float, index: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Columns (host, cpu_usage, memory_usage, latency) for ``index`` hosts (all by default) at epoch ``ts``."""
+        index = np.arange(len(self.hosts)) if index is None else np.asarray(index)
+        k = len(index)
+        rng = self.rng
+        last = self._last[index]
+        hours = np.clip(np.where(np.isnan(last), 0.0, ts - last) / 3600.0, 0.0, 24.0)
+        self._last[index] = ts
+
+        # AR(1) noise, correlation time ~15 min
+        rho = np.exp(-hours / 0.25)
+        noise = rho * self._noise[index] + np.sqrt(1 - rho ** 2) * rng.normal(0.0, 4.0, k)
+        self._noise[index] = noise
+        # spikes arrive as a Poisson process and decay over ~6 min
+        arrived = rng.random(k) < -np.expm1(-self.spike_rate[index] * hours)
+        spike = self._spike[index] * np.exp(-hours / 0.1) + arrived * rng.uniform(30.0, 60.0, k)
+        self._spike[index] = spike
+        # memory creeps up until the host "restarts"
+        offset = self._memory_offset[index] + self.memory_drift[index] * hours
+        offset[self.base_memory[index] + offset > 95.0] = 0.0
+        self._memory_offset[index] = offset
+
+        day = 2 * np.pi * (ts % DAY_SECONDS) / DAY_SECONDS
+        diurnal = self.diurnal_amplitude[index] * np.sin(day + self.phase[index])
+        cpu = np.clip(self.base_cpu[index] + diurnal + noise + spike, 0.0, 100.0)
+        memory = np.clip(self.base_memory[index] + offset + 0.15 * cpu + rng.normal(0.0, 1.0, k), 0.0, 100.0)
+        # queueing: latency explodes as cpu approaches saturation
+        latency = self.base_latency[index] * (1.0 + 8.0 * (cpu / 100.0) ** 4) * rng.lognormal(0.0, 0.1, k)
+        return {
+            "host": self.hosts[index],
+            "cpu_usage": np.round(cpu, 1),
+            "memory_usage": np.round(memory, 1),
+            "latency": np.round(latency, 1),
+        }
+
+
+def to_rows(columns: Dict[str, np.ndarray], ts: float) -> list:
+    """Columns from ``sample`` as /metrics/batch JSON objects (naive UTC ISO timestamps)."""
+    stamp = datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None).isoformat()
+    return [
+        {"host": h, "cpu_usage": c, "memory_usage": m, "latency": l, "timestamp": stamp}
+        for h, c, m, l in zip(
+            columns["host"].tolist(), columns["cpu_usage"].tolist(),
+            columns["memory_usage"].tolist(), columns["latency"].tolist(),
+        )
+    ]
@@ -0,0 +1,213 @@
+# backend/app/services/stats_engine.py
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.metric_batch import METRIC_FIELDS, MetricBatch
+from app.services.sketch import QuantileSketch
+
+SLOT_SECONDS = 60
+# |slope| * window below this fraction of the mean counts as "stable"
+STABLE_FRACTION = 0.05
+
+
+class RunningStats:
+    """Mergeable Welford accumulator plus min/max, a quantile sketch and
+    least-squares sums for the trend slope (t in seconds since the engine epoch)."""
+
+    __slots__ = ("n", "mean", "m2", "min", "max", "sketch", "st", "stt", "sy", "sty")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+        self.st = self.stt = self.sy = self.sty = 0.0
+
+    def add_many(self, values: np.ndarray, t: np.ndarray):
+        n = int(values.size)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        self._merge_moments(n, mean, m2)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.add_many(values)
+        self.st += float(t.sum())
+        self.stt += float((t * t).sum())
+        self.sy += float(values.sum())
+        self.sty += float((t * values).sum())
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.n:
+            self._merge_moments(other.n, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.sketch.merge(other.sketch)
+            self.st += other.st
+            self.stt += other.stt
+            self.sy += other.sy
+            self.sty += other.sty
+        return self
+
+    def _merge_moments(self, n_b, mean_b, m2_b):
+        # Chan et al. parallel variance
+        n_a = self.n
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.n = n
+
+    def slope(self) -> Optional[float]:
+        """Least-squares slope in units per minute."""
+        denom = self.n * self.stt - self.st * self.st
+        if self.n < 2 or denom <= 0:
+            return None
+        return (self.n * self.sty - self.st * self.sy) / denom * 60.0
+
+    def summary(self, window_minutes: int) -> dict:
+        if not self.n:
+            return {"count": 0}
+        slope = self.slope()
+        return {
+            "count": self.n,
+            "mean": round(self.mean, 3),
+            "stddev": round(math.sqrt(self.m2 / (self.n - 1)), 3) if self.n > 1 else 0.0,
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+            "p50": _round(self.sketch.quantile(0.50)),
+            "p95": _round(self.sketch.quantile(0.95)),
+            "p99": _round(self.sketch.quantile(0.99)),
+            "slope_per_min": _round(slope),
+            "trend": _trend(slope, self.mean, window_minutes),
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def _trend(slope, mean, window_minutes) -> str:
+    if slope is None:
+        return "stable"
+    change = slope * window_minutes
+    if abs(change) <= STABLE_FRACTION * max(abs(mean), 1e-9):
+        return "stable"
+    return "rising" if change > 0 else "falling"
+
+
+class _Slot:
+    __slots__ = ("minute", "stats")
+
+    def __init__(self, minute: int):
+        self.minute = minute
+        self.stats = {field: RunningStats() for field in METRIC_FIELDS}
+
+
+class StatsEngine:
+    """Per host rolling statistics kept in one-minute slots.
+
+    Ingest folds each batch into the slot of its minute; a query merges the
+    slots inside the window, so /analytics/trends never touches the DB. Hosts
+    with no sample inside the window are dropped.
+    """
+
+    def __init__(self, window_minutes: int):
+        self.max_window = window_minutes
+        self.epoch = time.time()
+        self._hosts: Dict[str, Deque[_Slot]] = {}
+        self._expired = 0  # ``oldest`` minute of the last sweep
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+            self._expired = 0
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    def observe(self, batch: MetricBatch):
+        if not len(batch):
+            return
+        unique_hosts, codes = batch.host_index
+        minutes = (batch.ts // SLOT_SECONDS).astype(np.int64)
+        oldest = int(time.time() // SLOT_SECONDS) - self.max_window
+        order = np.lexsort((minutes, codes))
+        keys = codes[order] * (1 << 40) + minutes[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        t = batch.ts - self.epoch
+        with self._lock:
+            self._expire(oldest)
+            for start, end in zip(starts, ends):
+                rows = order[start:end]
+                minute = int(minutes[rows[0]])
+                if minute <= oldest:
+                    continue
+                slot = self._slot(unique_hosts[codes[rows[0]]], minute, oldest)
+                for field in METRIC_FIELDS:
+                    slot.stats[field].add_many(batch.column(field)[rows], t[rows])
+
+    def _slot(self, host: str, minute: int, oldest: int) -> _Slot:
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = deque()
+        while slots and slots[0].minute <= oldest:
+            slots.popleft()
+        # slots stay sorted by minute; late samples are rare so a scan from the right is cheap
+        for i in range(len(slots) - 1, -1, -1):
+            if slots[i].minute == minute:
+                return slots[i]
+            if slots[i].minute < minute:
+                slots.insert(i + 1, _Slot(minute))
+                return slots[i + 1]
+        slots.appendleft(_Slot(minute))
+        return slots[0]
+
+    def _expire(self, oldest: int):
+        # at most one sweep per minute; a host whose newest slot left the window goes
+        if oldest <= self._expired:
+            return
+        self._expired = oldest
+        for host in [h for h, slots in self._hosts.items() if not slots or slots[-1].minute <= oldest]:
+            del self._hosts[host]
+
+    def trends(self, window_minutes: int, hosts: Optional[Iterable[str]] = None) -> dict:
+        """Per host and fleet-wide summaries over the last ``window_minutes``."""
+        now = int(time.time() // SLOT_SECONDS)
+        first = now - window_minutes + 1
+        fleet = {field: RunningStats() for field in METRIC_FIELDS}
+        per_host = {}
+        with self._lock:
+            self._expire(now - self.max_window)
+            names = list(self._hosts) if hosts is None else [h for h in hosts if h in self._hosts]
+            for host in names:
+                merged = {field: RunningStats() for field in METRIC_FIELDS}
+                for slot in self._hosts[host]:
+                    if slot.minute >= first:
+                        for field in METRIC_FIELDS:
+                            merged[field].merge(slot.stats[field])
+                if merged[METRIC_FIELDS[0]].n:
+                    per_host[host] = merged
+                    for field in METRIC_FIELDS:
+                        fleet[field].merge(merged[field])
+        return {
+            "fleet": {field: fleet[field].summary(window_minutes) for field in METRIC_FIELDS},
+            "hosts": {
+                host: {field: stats[field].summary(window_minutes) for field in METRIC_FIELDS}
+                for host, stats in sorted(per_host.items())
+            },
+        }
+
+
+stats_engine = StatsEngine(settings.STATS_WINDOW_MINUTES)
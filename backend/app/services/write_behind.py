@@ -0,0 +1,237 @@
+# backend/app/services/write_behind.py
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.schemas.metric import MetricCreate
+from app.services.metric_batch import MetricBatch
+from app.services.metric_services import commit_metric_batch, publish_metric_batch
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # metrics are optional, like the /prometheus mount
+    Counter = Gauge = Histogram = None
+
+logger = logging.getLogger(__name__)
+
+if Gauge is not None:
+    QUEUE_ROWS = Gauge("hydra_write_behind_queue_rows", "Acknowledged metrics not yet committed")
+    FLUSHED = Counter("hydra_write_behind_flushed_rows_total", "Metrics committed by the write-behind flusher")
+    REJECTED = Counter("hydra_write_behind_rejected_rows_total", "Metrics refused with 429 because the queue was full")
+    DROPPED = Counter("hydra_write_behind_dropped_rows_total", "Acknowledged metrics lost after repeated flush failures")
+    FLUSH_SECONDS = Histogram(
+        "hydra_write_behind_flush_seconds", "Time to write, alert on and commit one flushed batch",
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+else:
+    QUEUE_ROWS = FLUSHED = REJECTED = DROPPED = FLUSH_SECONDS = None
+
+FLUSH_ATTEMPTS = 3
+
+
+class WriteBehindQueue:
+    """Bounded in-process queue of validated metrics, committed in batches by one thread.
+
+    ``offer`` is all-or-nothing and never blocks: it returns False when the rows
+    would push the queue past ``capacity`` (callers answer 429). The flusher takes
+    up to ``flush_rows`` rows once that many are waiting or the oldest has waited
+    ``flush_seconds``, and runs them through the ingest pipeline (alerts,
+    rollups, one commit). Rows count against the capacity until committed.
+    Acknowledged rows live only in memory, so a crash loses them; ``stop`` drains.
+
+    Only the commit is retried, never what runs after it. A batch that still
+    fails is split in halves until the rows that cannot be written are alone,
+    and only those are dropped.
+    """
+
+    def __init__(self, capacity: int, flush_rows: int, flush_seconds: float,
+                 session_factory: Callable[[], Session] = SessionLocal):
+        self.capacity = capacity
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.session_factory = session_factory
+        self._pending: Deque[Tuple[float, List[MetricCreate]]] = deque()
+        self._queued = 0  # rows waiting in _pending
+        self._rows = 0  # queued + being flushed
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # one writer at a time keeps commit order = arrival order
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.flushed = self.rejected = self.dropped = self.flushes = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def offer(self, items: Sequence[MetricCreate]) -> bool:
+        if not items:
+            return True
+        with self._cond:
+            if self._stopping or self._rows + len(items) > self.capacity:
+                self.rejected += len(items)
+                if REJECTED is not None:
+                    REJECTED.inc(len(items))
+                return False
+            # wake the flusher to arm its timer (first rows) or to flush (enough rows)
+            wake = not self._pending or self._queued + len(items) >= self.flush_rows
+            self._pending.append((time.monotonic(), list(items)))
+            self._queued += len(items)
+            self._rows += len(items)
+            if wake:
+                self._cond.notify()
+        self._export_depth()
+        return True
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Refuse new rows, commit everything queued, then stop the flusher."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.error(f"Write-behind drain timed out with {self._rows} rows left")
+            self._thread = None
+        else:
+            self.flush()
+
+    def reset(self):
+        with self._cond:
+            self._pending.clear()
+            self._queued = self._rows = 0
+            self._stopping = False
+        self.flushed = self.rejected = self.dropped = self.flushes = 0
+        self._export_depth()
+
+    def flush(self) -> int:
+        """Commit everything queued right now on the calling thread; returns rows committed."""
+        written = 0
+        while True:
+            with self._flush_lock:
+                with self._cond:
+                    items = self._take()
+                if not items:
+                    return written
+                written += self._write(items)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._rows, "capacity": self.capacity, "running": self.running,
+            "flushed": self.flushed, "flushes": self.flushes, "rejected": self.rejected, "dropped": self.dropped,
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping and not self._due():
+                    self._cond.wait(self._until_due())
+                if self._stopping and not self._queued:
+                    return
+            with self._flush_lock:
+                with self._cond:
+                    items = self._take()
+                if items:
+                    self._write(items)
+
+    def _due(self) -> bool:
+        if self._queued >= self.flush_rows:
+            return True
+        return bool(self._pending) and time.monotonic() - self._pending[0][0] >= self.flush_seconds
+
+    def _until_due(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        return max(0.0, self._pending[0][0] + self.flush_seconds - time.monotonic())
+
+    def _take(self) -> List[MetricCreate]:
+        # caller holds _cond
+        items: List[MetricCreate] = []
+        while self._pending and len(items) < self.flush_rows:
+            enqueued, chunk = self._pending[0]
+            room = self.flush_rows - len(items)
+            if len(chunk) <= room:
+                items += chunk
+                self._pending.popleft()
+            else:
+                items += chunk[:room]
+                self._pending[0] = (enqueued, chunk[room:])
+        self._queued -= len(items)
+        return items
+
+    def _write(self, items: List[MetricCreate]) -> int:
+        began = time.perf_counter()
+        try:
+            written = self._commit(items, FLUSH_ATTEMPTS)
+            if FLUSH_SECONDS is not None:
+                FLUSH_SECONDS.observe(time.perf_counter() - began)
+            return written
+        finally:
+            with self._cond:
+                self._rows -= len(items)
+            self._export_depth()
+
+    def _commit(self, items: List[MetricCreate], attempts: int) -> int:
+        """Commit ``items`` in one transaction, else in halves; returns rows committed."""
+        for attempt in range(attempts):
+            db = self.session_factory()
+            try:
+                batch = MetricBatch.from_items(items)
+                alerts_changed = commit_metric_batch(db, batch, [item.model_dump() for item in items])
+                break
+            except Exception as exc:
+                db.rollback()
+                error = exc
+                logger.warning(f"Write-behind flush of {len(items)} rows failed (attempt {attempt + 1}): {exc}")
+                if attempt + 1 < attempts:
+                    time.sleep(0.1 * 2 ** attempt)
+            finally:
+                db.close()
+        else:
+            # an unreachable DB fails every half too; anything else is narrowed down to the bad rows
+            if len(items) > 1 and not isinstance(error, (OperationalError, InterfaceError)):
+                half = len(items) // 2
+                return self._commit(items[:half], 1) + self._commit(items[half:], 1)
+            self.dropped += len(items)
+            if DROPPED is not None:
+                DROPPED.inc(len(items))
+            logger.error(f"Write-behind dropped {len(items)} rows: {error}")
+            return 0
+
+        self.flushed += len(items)
+        self.flushes += 1
+        if FLUSHED is not None:
+            FLUSHED.inc(len(items))
+        # committed: a failure from here on must not write the rows again
+        try:
+            publish_metric_batch(batch, alerts_changed)
+        except Exception:
+            logger.exception(f"Write-behind publish of {len(items)} committed rows failed")
+        return len(items)
+
+    def _export_depth(self):
+        if QUEUE_ROWS is not None:
+            QUEUE_ROWS.set(self._rows)
+
+
+write_behind = WriteBehindQueue(
+    capacity=settings.WRITE_BEHIND_MAX_ROWS,
+    flush_rows=settings.WRITE_BEHIND_FLUSH_ROWS,
+    flush_seconds=settings.WRITE_BEHIND_FLUSH_MS / 1000.0,
+)
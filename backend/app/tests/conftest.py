@@ -9,6 +9,10 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+# no background DB work (partition maintenance, cache warm-up) against the configured DB
+os.environ.setdefault("PARTITION_MAINTENANCE_MINUTES", "0")
+os.environ.setdefault("HYDRA_WARM_CACHE", "false")
+
 from app.main import app  
 from app.core.database import Base, get_db
 
@@ -45,13 +49,42 @@ def db_session(engine, tables):
 
 
 @pytest.fixture()
-def client(monkeypatch, db_session):
+def client(db_session):
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
-    monkeypatch.setattr("app.core.database.get_db", override_get_db)
-    with TestClient(app) as c:
-        yield c
\ No newline at end of file
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(autouse=True)
+def reset_in_memory_state():
+    # the db is rolled back per test; in-process state has to follow
+    from app.services.alert_engine import alert_engine
+    from app.services.alert_state import open_alerts
+    from app.services.stats_engine import stats_engine
+    from app.services.forecast_service import forecaster
+    from app.services.anomaly_detector import anomaly_detector
+    from app.services.live_bus import live_bus
+    from app.services.hot_cache import hot_cache
+    from app.services.latest_index import latest_index
+    from app.services.response_cache import response_cache
+    from app.services.write_behind import write_behind
+    yield
+    alert_engine.reset()
+    open_alerts.reset()
+    stats_engine.reset()
+    forecaster.reset()
+    anomaly_detector.reset()
+    live_bus.reset()
+    hot_cache.reset()
+    latest_index.reset()
+    response_cache.reset()
+    write_behind.reset()
@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import Session
+from app.models.alert import Alert
+from app.services.alert_engine import AlertEngine, AlertRule, DEFAULT_RULES, alert_engine, load_rules
+from app.services.alert_service import check_for_alerts_batch
+from app.services.metric_batch import MetricBatch
+from app.services.metric_services import write_metric_rows
+from app.tests.factories import metric_payload
+
+def _batch(*payloads):
+    return MetricBatch.from_items(payloads)
+
+def _fired(observations):
+    return sorted((o.host, o.type, o.value) for o in observations if o.breaches)
+
+def test_default_rules_match_legacy_thresholds():
+    engine = AlertEngine(DEFAULT_RULES)
+    observations = engine.evaluate(_batch(
+        metric_payload(host="e1", cpu=91.0, mem=86.0, lat=251.0),
+        metric_payload(host="e2", cpu=90.0, mem=85.0, lat=250.0),
+    ))
+    assert _fired(observations) == [
+        ("e1", "CPU Usage High", 91.0), ("e1", "Latency High", 251.0), ("e1", "Memory Usage High", 86.0),
+    ]
+    # e2 was evaluated by every rule and is healthy
+    assert sorted(o.type for o in observations if o.host == "e2" and o.recovered) == [
+        "CPU Usage High", "Latency High", "Memory Usage High",
+    ]
+
+def test_host_rule_overrides_fleet_rule_and_supports_less_than():
+    engine = AlertEngine([
+        AlertRule(metric="cpu_usage", op=">", threshold=90.0, type="CPU Usage High"),
+        AlertRule(metric="cpu_usage", op=">", threshold=50.0, type="CPU Usage High", host="db-1"),
+        AlertRule(metric="latency", op="<", threshold=1.0, type="Latency Suspiciously Low"),
+    ])
+    observations = engine.evaluate(_batch(
+        metric_payload(host="db-1", cpu=60.0, lat=0.5),
+        metric_payload(host="web-1", cpu=60.0),
+    ))
+    assert [(h, t) for h, t, _ in _fired(observations)] == [
+        ("db-1", "CPU Usage High"), ("db-1", "Latency Suspiciously Low"),
+    ]
+
+def test_batch_collapses_to_newest_breach_per_host():
+    engine = AlertEngine(DEFAULT_RULES[:1])
+    t0 = datetime.utcnow()
+    [obs] = engine.evaluate(_batch(
+        metric_payload(host="c", cpu=97.0, ts=t0 + timedelta(seconds=10)),
+        metric_payload(host="c", cpu=95.0, ts=t0),
+        metric_payload(host="c", cpu=10.0, ts=t0 + timedelta(seconds=5)),
+    ))
+    assert (obs.breaches, obs.value, obs.recovered) == (2, 97.0, False)
+
+def test_n_of_m_rule_carries_history_across_batches():
+    engine = AlertEngine([AlertRule(metric="cpu_usage", op=">", threshold=80.0, type="CPU Sustained", n=2, m=3)])
+    t0 = datetime.utcnow()
+    # out of order within the batch on purpose: evaluation follows timestamps
+    [first] = engine.evaluate(_batch(
+        metric_payload(host="w", cpu=10.0, ts=t0 + timedelta(seconds=5)),
+        metric_payload(host="w", cpu=95.0, ts=t0),
+    ))
+    assert first.breaches == 0
+    [second] = engine.evaluate(_batch(metric_payload(host="w", cpu=85.0, ts=t0 + timedelta(seconds=10))))
+    assert (second.breaches, second.value) == (1, 85.0)
+
+def test_rolled_back_batch_does_not_count_towards_the_window(db_session, monkeypatch):
+    monkeypatch.setattr(alert_engine, "rules", [
+        AlertRule(metric="cpu_usage", op=">", threshold=80.0, type="CPU Sustained", n=2, m=3),
+    ])
+    t0 = datetime.utcnow()
+    check_for_alerts_batch(db_session, [metric_payload(host="rw", cpu=95.0, ts=t0)])
+    db_session.commit()
+
+    retried = [metric_payload(host="rw", cpu=10.0, ts=t0 + timedelta(seconds=5)),
+               metric_payload(host="rw-new", cpu=95.0, ts=t0 + timedelta(seconds=5))]
+    session = Session(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    write_metric_rows(session, [m.model_dump() for m in retried])
+    check_for_alerts_batch(session, retried)
+    session.rollback()
+    session.close()
+    # the retry is evaluated against the committed window only, not against itself
+    check_for_alerts_batch(db_session, retried)
+    [observation] = alert_engine.detect(db_session, _batch(
+        metric_payload(host="rw-new", cpu=10.0, ts=t0 + timedelta(seconds=10))))
+    assert observation.breaches == 0
+    [observation] = alert_engine.detect(db_session, _batch(
+        metric_payload(host="rw", cpu=85.0, ts=t0 + timedelta(seconds=10))))
+    assert observation.breaches == 1
+
+def test_load_rules_from_json(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"metric": "latency", "op": ">=", "threshold": 100, "type": "Slow", "n": 3, "m": 5}]))
+    rules = load_rules(str(path))
+    assert rules == [AlertRule(metric="latency", op=">=", threshold=100.0, type="Slow", n=3, m=5)]
+    assert load_rules(None) == DEFAULT_RULES
+
+def test_invalid_rule_rejected():
+    with pytest.raises(ValueError):
+        AlertRule(metric="disk", op=">", threshold=1.0, type="x")
+    with pytest.raises(ValueError):
+        AlertRule(metric="cpu_usage", op=">", threshold=1.0, type="x", n=4, m=3)
+
+def test_check_for_alerts_batch_writes_rows(db_session):
+    written = check_for_alerts_batch(db_session, [
+        metric_payload(host="eng-db", cpu=99.0),
+        metric_payload(host="eng-db", mem=99.0),
+    ])
+    # cpu breach then recovery inside the batch, memory still breaching on the newest sample
+    assert written == 2
+    rows = db_session.query(Alert).filter(Alert.host == "eng-db").order_by(Alert.type).all()
+    assert [(a.type, a.status) for a in rows] == [
+        ("CPU Usage High", "resolved"), ("Memory Usage High", "active"),
+    ]
@@ -1,8 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
 from app.schemas.metric import MetricCreate
-from app.services.metric_services import create_metric
-from app.services.alert_service import get_active_alerts
+from app.services.metric_services import create_metric, create_metrics_batch
+from app.services.alert_service import check_for_alerts_batch, create_alert, get_active_alerts, resolve_alert
+from app.services.alert_state import open_alerts
 from app.models.alert import Alert
+from app.tests.factories import metric_payload
 
 def test_alert_created_and_can_be_resolved(db_session):
     # create a metric that triggers an alert
@@ -30,4 +33,79 @@ def test_alert_created_and_can_be_resolved(db_session):
     new_alerts = get_active_alerts(db_session)
     if isinstance(new_alerts, tuple):
         new_alerts = new_alerts[0]
-    assert not any(x.id == a.id and (getattr(x, "status") in (True, "active")) for x in new_alerts)
\ No newline at end of file
+    assert not any(x.id == a.id and (getattr(x, "status") in (True, "active")) for x in new_alerts)
+
+def _host_alerts(db_session, host):
+    return db_session.query(Alert).filter(Alert.host == host).all()
+
+def test_sustained_breach_updates_single_alert(db_session):
+    for cpu in (95.0, 97.0, 99.0):
+        create_metrics_batch(db_session, [metric_payload(host="pegged", cpu=cpu)])
+
+    [alert] = _host_alerts(db_session, "pegged")
+    assert alert.status == "firing"
+    assert alert.value == 99.0
+    assert alert.breach_count == 3
+    assert alert.last_seen >= alert.timestamp
+
+def test_recovery_resolves_and_next_breach_reopens(db_session):
+    create_metrics_batch(db_session, [metric_payload(host="flappy", cpu=95.0)])
+    create_metrics_batch(db_session, [metric_payload(host="flappy", cpu=20.0)])
+    [alert] = _host_alerts(db_session, "flappy")
+    assert alert.status == "resolved" and alert.resolved_at is not None
+
+    create_metrics_batch(db_session, [metric_payload(host="flappy", cpu=96.0)])
+    statuses = sorted(a.status for a in _host_alerts(db_session, "flappy"))
+    assert statuses == ["active", "resolved"]
+
+def test_manual_resolve_clears_open_index(db_session):
+    create_metrics_batch(db_session, [metric_payload(host="manual", lat=400.0)])
+    [alert] = _host_alerts(db_session, "manual")
+    assert open_alerts.get("manual", "Latency High") == alert.id
+
+    resolved = resolve_alert(db_session, alert.id)
+    assert resolved.status == "resolved"
+    assert open_alerts.get("manual", "Latency High") is None
+    assert resolve_alert(db_session, 10**9) is None
+
+def test_manual_alert_joins_the_open_index(db_session):
+    create_metrics_batch(db_session, [metric_payload(host="by-hand", cpu=99.0)])
+    now = datetime.utcnow()
+    merged = create_alert(db_session, {"host": "by-hand", "type": "CPU Usage High", "value": 97.0,
+                                       "timestamp": now, "status": "active", "breach_count": 2})
+    [alert] = _host_alerts(db_session, "by-hand")
+    assert (merged.id, merged.status, merged.value, merged.breach_count) == (alert.id, "firing", 97.0, 3)
+
+    added = create_alert(db_session, {"host": "by-hand", "type": "Disk Full", "value": 1.0,
+                                      "timestamp": now, "status": "active"})
+    assert open_alerts.get("by-hand", "Disk Full") == added.id
+    assert open_alerts.counts_by_host()["by-hand"] == 2
+    check_for_alerts_batch(db_session, [metric_payload(host="by-hand")])
+    assert open_alerts.counts_by_host()["by-hand"] == 1
+
+def test_rolled_back_batch_does_not_leak_into_index(db_session):
+    session = Session(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    check_for_alerts_batch(session, [metric_payload(host="ghost", cpu=99.0)])
+    assert open_alerts.get("ghost", "CPU Usage High") is not None
+    session.rollback()
+    session.close()
+    assert open_alerts.get("ghost", "CPU Usage High") is None
+
+def test_index_is_warm_only_after_the_dedup_commits(db_session):
+    now = datetime.utcnow()
+    for age in (2, 1):
+        db_session.add(Alert(host="dup", type="CPU Usage High", value=95.0, timestamp=now - timedelta(minutes=age)))
+    db_session.commit()
+    open_alerts.reset()
+
+    session = Session(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    check_for_alerts_batch(session, [metric_payload(host="other", cpu=99.0)])
+    session.rollback()
+    session.close()
+    assert open_alerts.counts_by_host() is None
+    assert [a.status for a in _host_alerts(db_session, "dup")] == ["active", "active"]
+
+    check_for_alerts_batch(db_session, [metric_payload(host="other", cpu=99.0)])
+    db_session.commit()
+    assert open_alerts.counts_by_host()["dup"] == 1
+    assert sorted(a.status for a in _host_alerts(db_session, "dup")) == ["active", "resolved"]
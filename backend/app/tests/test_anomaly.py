@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models.alert import Alert
+from app.models.anomaly_state import AnomalyState
+from app.services.alert_service import check_for_alerts_batch
+from app.services.anomaly_detector import AnomalyDetector, anomaly_detector
+from app.services.metric_batch import MetricBatch
+from app.tests.factories import metric_payload
+
+def _history(host, n, start, cpu=lambda i: 40.0 + (i % 5)):
+    return [metric_payload(host=host, cpu=cpu(i), ts=start + timedelta(seconds=10 * i)) for i in range(n)]
+
+def _detector(**kwargs):
+    options = dict(capacity=100, alpha=0.1, threshold=4.0, warmup=20, checkpoint_seconds=60.0)
+    options.update(kwargs)
+    return AnomalyDetector(**options)
+
+def _fired(observations):
+    return sorted((o.host, o.type, o.value) for o in observations if o.breaches)
+
+def test_spike_is_flagged_after_warmup_only():
+    detector = _detector()
+    start = datetime(2026, 1, 1)
+    # a spike during warmup is learned, not flagged
+    early = _history("a1", 10, start) + [metric_payload(host="a1", cpu=99.0, ts=start + timedelta(seconds=101))]
+    assert _fired(detector.evaluate(MetricBatch.from_items(early))) == []
+
+    detector = _detector()
+    steady = _history("a1", 50, start)
+    spike = metric_payload(host="a1", cpu=99.0, ts=start + timedelta(seconds=500))
+    observations = detector.evaluate(MetricBatch.from_items(steady + [spike]))
+    assert _fired(observations) == [("a1", "CPU Usage Anomaly", 99.0)]
+    state = detector.state("a1")
+    assert state["count"] == 51
+
+def test_rounds_match_one_sample_at_a_time():
+    start = datetime(2026, 1, 1)
+    items = _history("r1", 40, start) + _history("r2", 25, start, cpu=lambda i: 70.0 - (i % 3))
+    together, single = _detector(), _detector()
+    together.evaluate(MetricBatch.from_items(items))
+    for item in sorted(items, key=lambda m: m.timestamp):
+        single.evaluate(MetricBatch.from_items([item]))
+    for host in ("r1", "r2"):
+        a, b = together.state(host), single.state(host)
+        assert a["count"] == b["count"]
+        for field, value in a["mean"].items():
+            assert abs(value - b["mean"][field]) < 1e-9
+
+def test_capacity_evicts_least_recently_seen_host():
+    detector = _detector(capacity=2)
+    now = datetime(2026, 1, 1)
+    detector.evaluate(MetricBatch.from_items([metric_payload(host="old", ts=now)]))
+    detector.evaluate(MetricBatch.from_items([metric_payload(host="mid", ts=now + timedelta(seconds=1))]))
+    detector.evaluate(MetricBatch.from_items([metric_payload(host="new", ts=now + timedelta(seconds=2))]))
+    assert len(detector) == 2
+    assert detector.state("old") is None
+    assert detector.state("mid") is not None and detector.state("new") is not None
+
+def test_batch_crossing_capacity_evicts_only_existing_hosts():
+    detector = _detector(capacity=3)
+    now = datetime(2026, 1, 1)
+    detector.evaluate(MetricBatch.from_items([metric_payload(host=h, ts=now) for h in ("a", "b")]))
+    # one fresh slot left: c takes it, d evicts a or b, never the slot c just got
+    later = now + timedelta(seconds=1)
+    detector.evaluate(MetricBatch.from_items([metric_payload(host=h, ts=later) for h in ("c", "d")]))
+    assert len(detector) == 3
+    assert detector.state("c") is not None and detector.state("d") is not None
+    assert (detector.state("a") is None) != (detector.state("b") is None)
+
+def test_rolled_back_batch_does_not_move_the_baseline(db_session):
+    start = datetime.utcnow() - timedelta(hours=1)
+    check_for_alerts_batch(db_session, _history("rb-1", 30, start))
+    db_session.commit()
+    anomaly_detector.checkpoint(db_session, force=True)
+    db_session.commit()
+    before = anomaly_detector.state("rb-1")
+
+    session = Session(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    check_for_alerts_batch(session, [metric_payload(host="rb-1", cpu=90.0, ts=start + timedelta(minutes=10)),
+                                     metric_payload(host="rb-2", ts=start + timedelta(minutes=10))])
+    assert anomaly_detector.checkpoint(session, force=True) == 2
+    session.rollback()
+    session.close()
+    assert anomaly_detector.state("rb-1") == before
+    assert anomaly_detector.state("rb-2") is None
+    # nothing was persisted, so the next checkpoint has nothing new for rb-1 either
+    assert anomaly_detector.checkpoint(db_session, force=True) == 0
+
+def test_anomaly_alerts_open_and_state_survives_a_restart(db_session):
+    start = datetime.utcnow() - timedelta(hours=1)
+    history = _history("an-1", 60, start)
+    check_for_alerts_batch(db_session, history)
+    assert anomaly_detector.checkpoint(db_session, force=True) == 1
+    db_session.commit()
+
+    # a fresh process reloads the baseline instead of warming up again
+    anomaly_detector.reset()
+    spike = metric_payload(host="an-1", cpu=42.0, lat=400.0, ts=start + timedelta(minutes=30))
+    check_for_alerts_batch(db_session, [spike])
+    db_session.commit()
+    assert anomaly_detector.state("an-1")["count"] == 61
+    alerts = db_session.query(Alert).filter(Alert.host == "an-1").all()
+    assert sorted(a.type for a in alerts) == ["Latency Anomaly", "Latency High"]
+
+    row = db_session.get(AnomalyState, "an-1")
+    assert row.count == 60
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.core.database import Base, get_async_db, get_db
+from app.routes import alert_routes, api_metrics, metric_routes
+from app.services.latest_index import latest_index
+
+@pytest.fixture()
+def async_client(tmp_path):
+    # reads use aiosqlite, writes the sync pipeline on its own Session: one file for both
+    path = tmp_path / "async.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=StaticPool)
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+    sync_sessions = sessionmaker(bind=sync_engine, autoflush=False)
+    Base.metadata.create_all(bind=sync_engine)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    def override_get_db():
+        db = sync_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    for module in (metric_routes, alert_routes, api_metrics):
+        app.include_router(module.async_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(engine.dispose)
+    sync_engine.dispose()
+
+def _payload(host, cpu, ts):
+    return {"host": host, "cpu_usage": cpu, "memory_usage": 20.0, "latency": 5.0, "timestamp": ts.isoformat()}
+
+def test_async_ingest_read_and_alert_lifecycle(async_client):
+    now = datetime.utcnow().replace(microsecond=0)
+    resp = async_client.post("/metrics/batch", json=[_payload("as-1", 95.0, now), _payload("as-2", 10.0, now), {"host": "bad"}])
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["inserted"] == 2 and [e["index"] for e in body["errors"]] == [2]
+
+    one = async_client.post("/metrics/", json=_payload("as-2", 11.0, now + timedelta(seconds=1)))
+    assert one.status_code == 200 and one.json()["id"] not in body["ids"]
+    assert {m["host"] for m in async_client.get("/metrics/").json()} == {"as-1", "as-2"}
+    assert [m["cpu_usage"] for m in async_client.get("/api/metrics", params={"host": "as-2"}).json()] == [11.0, 10.0]
+
+    active = async_client.get("/alerts/active").json()
+    assert [(a["host"], a["type"]) for a in active] == [("as-1", "CPU Usage High")]
+    resolved = async_client.post(f"/alerts/{active[0]['id']}/resolve")
+    assert resolved.status_code == 200 and resolved.json()["status"] == "resolved"
+    assert async_client.get("/alerts/active").json() == []
+    assert async_client.post("/alerts/999999/resolve").status_code == 404
+
+def test_concurrent_async_ingest_opens_one_alert(async_client):
+    now = datetime.utcnow().replace(microsecond=0)
+
+    def post(i):
+        return async_client.post("/metrics/batch", json=[_payload("as-race", 95.0 + i / 10, now + timedelta(seconds=i))])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert {r.status_code for r in pool.map(post, range(16))} == {200}
+    active = [a for a in async_client.get("/alerts/active").json() if a["host"] == "as-race"]
+    assert [(a["type"], a["breach_count"]) for a in active] == [("CPU Usage High", 16)]
+
+def test_async_series_matches_validation(async_client):
+    now = datetime.utcnow().replace(microsecond=0)
+    async_client.post("/metrics/batch", json=[_payload("as-3", 40.0, now - timedelta(minutes=1))])
+    series = async_client.get("/api/metrics/series", params={"bucket": "1h", "source": "raw", "host": "as-3"}).json()
+    assert [s["host"] for s in series["series"]] == ["as-3"]
+    assert async_client.get("/api/metrics/series", params={"bucket": "7m"}).status_code == 422
+    assert async_client.get("/api/metrics/series", params={"source": "bogus"}).status_code == 422
+
+def test_async_export_streams_rows(async_client):
+    now = datetime.utcnow().replace(microsecond=0)
+    async_client.post("/metrics/batch", json=[_payload("as-4", float(i), now - timedelta(minutes=i)) for i in range(3)])
+    resp = async_client.get("/api/metrics/export", params={"format": "ndjson", "host": "as-4"})
+    assert resp.status_code == 200
+    assert [line.count(b'"as-4"') for line in resp.content.splitlines()] == [1, 1, 1]
+
+def test_async_hosts_summary_warms_from_the_db(async_client, monkeypatch):
+    now = datetime.utcnow().replace(microsecond=0)
+    async_client.post("/metrics/batch", json=[_payload("as-5", 30.0, now - timedelta(seconds=5)), _payload("as-5", 35.0, now)])
+    latest_index.reset()
+    hosts = async_client.get("/api/hosts/summary").json()["hosts"]
+    assert [(h["host"], h["cpu_usage"], h["stale"]) for h in hosts] == [("as-5", 35.0, False)]
+    monkeypatch.setattr(settings, "LATEST_INDEX_ENABLED", False)
+    assert async_client.get("/api/hosts/summary", params={"stale_after": 60}).json()["hosts"][0]["cpu_usage"] == 35.0
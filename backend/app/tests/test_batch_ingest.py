@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+from app.models.alert import Alert
+from app.models.metric import Metric
+from app.routes.metric_routes import parse_metric_batch
+from app.services.metric_services import create_metrics_batch
+from app.tests.factories import metric_payload, random_metrics
+
+def test_create_metrics_batch_inserts_all_rows_in_order(db_session):
+    items = random_metrics(n=200, host_prefix="batch")
+    ids = create_metrics_batch(db_session, items)
+    assert len(ids) == 200
+    assert len(set(ids)) == 200
+
+    first = db_session.get(Metric, ids[0])
+    assert first.host == items[0].host
+    assert abs(first.cpu_usage - items[0].cpu_usage) < 1e-6
+
+def test_create_metrics_batch_evaluates_alerts_once_per_batch(db_session):
+    items = [
+        metric_payload(host="batch-alert", cpu=95.0),
+        metric_payload(host="batch-alert", cpu=10.0, lat=300.0),
+        metric_payload(host="batch-ok"),
+    ]
+    create_metrics_batch(db_session, items)
+    alerts = db_session.query(Alert).filter(Alert.host.in_(["batch-alert", "batch-ok"])).all()
+    assert sorted(a.type for a in alerts) == ["CPU Usage High", "Latency High"]
+
+def test_create_metrics_batch_empty(db_session):
+    assert create_metrics_batch(db_session, []) == []
+
+def test_parse_json_array_reports_indexed_errors():
+    body = json.dumps([
+        {"host": "p1", "cpu_usage": 1, "memory_usage": 2, "latency": 3, "timestamp": datetime.utcnow().isoformat()},
+        {"host": "p2", "cpu_usage": "bad", "memory_usage": 2, "latency": 3, "timestamp": datetime.utcnow().isoformat()},
+    ]).encode()
+    items, errors = parse_metric_batch(body, "application/json")
+    assert [i.host for i in items] == ["p1"]
+    assert len(errors) == 1 and errors[0].index == 1
+    assert errors[0].errors[0]["loc"] == ("cpu_usage",)
+
+def test_parse_ndjson_keeps_going_after_bad_line():
+    ts = datetime.utcnow().isoformat()
+    body = "\n".join([
+        json.dumps({"host": "n1", "cpu_usage": 1, "memory_usage": 2, "latency": 3, "timestamp": ts}),
+        "{not json",
+        json.dumps({"host": "n2", "cpu_usage": 1, "memory_usage": 2, "latency": 3, "timestamp": ts}),
+    ]).encode()
+    items, errors = parse_metric_batch(body, "application/x-ndjson")
+    assert [i.host for i in items] == ["n1", "n2"]
+    assert [e.index for e in errors] == [1]
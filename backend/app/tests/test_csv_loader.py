@@ -0,0 +1,99 @@
+import io
+from datetime import datetime
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from app.models.alert import Alert
+from app.models.load_checkpoint import LoadCheckpoint
+from app.models.metric import Metric
+from app.services import csv_loader
+from app.services.csv_loader import TABLES, checkpoint_source, convert_chunk, load_csv, write_chunk
+
+def _metrics_csv(path, n):
+    lines = ["host,cpu_usage,memory_usage,latency,timestamp"]
+    lines += [f"csv-{i % 3},{i}.5,40,12.5,2025-10-31T00:{i % 60:02d}:00Z" for i in range(n)]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+def test_metrics_load_in_chunks_and_skip_bad_rows(db_session, tmp_path):
+    path = tmp_path / "metrics.csv"
+    _metrics_csv(path, 10)
+    with path.open("a") as f:
+        f.write("csv-x,not-a-number,1,1,2025-10-31T01:00:00Z\ncsv-x,1,1,1,\n")
+    seen = []
+    report = load_csv(db_session, str(path), "metrics", chunk_rows=4, progress=lambda r, done, size: seen.append(done))
+    assert (report.rows, report.skipped, report.chunks) == (10, 2, 3)
+    assert seen[-1] == path.stat().st_size
+    row = db_session.query(Metric).filter(Metric.cpu_usage == 3.5).one()
+    assert row.host == "csv-0" and row.timestamp == datetime(2025, 10, 31, 0, 3)
+
+def test_interrupted_load_resumes_after_last_committed_chunk(db_session, tmp_path, monkeypatch):
+    path = _metrics_csv(tmp_path / "big.csv", 9)
+    real_write = csv_loader.write_chunk
+    calls = []
+
+    def failing_write(db, spec, frame):
+        calls.append(len(frame))
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        real_write(db, spec, frame)
+
+    monkeypatch.setattr(csv_loader, "write_chunk", failing_write)
+    with pytest.raises(RuntimeError):
+        load_csv(db_session, path, "metrics", chunk_rows=4)
+    db_session.rollback()
+    assert db_session.get(LoadCheckpoint, checkpoint_source("metrics", path)).rows_loaded == 4
+
+    monkeypatch.setattr(csv_loader, "write_chunk", real_write)
+    report = load_csv(db_session, path, "metrics", chunk_rows=4)
+    assert (report.resumed_rows, report.rows) == (4, 5)
+    assert db_session.query(Metric).filter(Metric.host.like("csv-%")).count() == 9
+    # a finished file is a no-op until --restart
+    assert load_csv(db_session, path, "metrics", chunk_rows=4).rows == 0
+    assert load_csv(db_session, path, "metrics", chunk_rows=4, restart=True).rows == 9
+
+def test_alerts_load_with_optional_columns(db_session, tmp_path):
+    path = tmp_path / "alerts.csv"
+    path.write_text(
+        "id,host,type,value,timestamp,status,breach_count\n"
+        "1,csv-a,cpu_high,92.3,2025-10-31T03:25:00Z,active,4\n"
+        "2,csv-b,latency_high,268.5,2025-10-31T04:10:00Z,resolved,\n"
+    )
+    assert load_csv(db_session, str(path), "alerts").rows == 2
+    alerts = {a.host: a for a in db_session.query(Alert).filter(Alert.host.like("csv-%"))}
+    assert alerts["csv-a"].breach_count == 4 and alerts["csv-b"].breach_count == 1
+    assert alerts["csv-b"].status == "resolved"
+
+def test_copy_payload_fills_not_null_defaults(monkeypatch):
+    copied = []
+
+    class Cursor:
+        def copy_expert(self, sql, buf):
+            copied.append((sql, buf.read()))
+
+        def close(self):
+            pass
+
+    db = SimpleNamespace(connection=lambda: SimpleNamespace(connection=SimpleNamespace(cursor=Cursor)))
+    monkeypatch.setattr(csv_loader, "supports_copy", lambda db: True)
+    frame = pd.read_csv(io.StringIO(
+        "host,type,value,timestamp,status,breach_count\n"
+        "copy-a,cpu_high,92.3,2025-10-31T03:25:00Z,active,4\n"
+        "copy-b,latency_high,268.5,2025-10-31T04:10:00Z,resolved,\n"
+    ), dtype=str, keep_default_na=False, na_values=[""])
+    clean, skipped = convert_chunk(frame, TABLES["alerts"])
+    write_chunk(db, TABLES["alerts"], clean)
+    [(sql, payload)] = copied
+    columns = sql[sql.index("(") + 1:sql.index(")")].split(", ")
+    rows = [dict(zip(columns, line.split(","))) for line in payload.splitlines()]
+    assert skipped == 0 and [r["breach_count"] for r in rows] == ["4", "1"]
+
+    # a file without the column still writes it
+    clean, _ = convert_chunk(frame.drop(columns="breach_count"), TABLES["alerts"])
+    assert clean["breach_count"].tolist() == [1, 1]
+
+def test_missing_required_columns_are_rejected(db_session, tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("host,cpu_usage\nx,1\n")
+    with pytest.raises(ValueError, match="missing columns"):
+        load_csv(db_session, str(path), "metrics")
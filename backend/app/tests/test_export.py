@@ -0,0 +1,70 @@
+import io
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.models.metric import Metric
+from app.services.export_service import negotiate
+
+pa = pytest.importorskip("pyarrow")
+msgpack = pytest.importorskip("msgpack")
+import pyarrow.parquet as pq  # noqa: E402
+
+START = datetime(2026, 3, 1)
+
+def _seed(client, n=7):
+    rows = [{"host": f"ex-{i % 3}", "cpu_usage": float(i), "memory_usage": 50.0, "latency": 2.5,
+             "timestamp": (START + timedelta(seconds=i)).isoformat()} for i in range(n)]
+    assert client.post("/metrics/batch", json=rows).json()["inserted"] == n
+
+def _export(client, accept=None, **params):
+    params = {"from": START.isoformat(), "to": (START + timedelta(hours=1)).isoformat(), **params}
+    return client.get("/api/metrics/export", params=params, headers={"Accept": accept} if accept else {})
+
+def test_export_formats_stream_all_rows_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_ROWS", 3)
+    _seed(client)
+
+    arrow = _export(client, "application/vnd.apache.arrow.stream")
+    assert arrow.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    batches = list(pa.ipc.open_stream(arrow.content))
+    assert [b.num_rows for b in batches] == [3, 3, 1]
+    table = pa.Table.from_batches(batches)
+    assert table.column("cpu_usage").to_pylist() == [float(i) for i in range(7)]
+    assert table.column("timestamp").to_pylist()[1].replace(tzinfo=None) == START + timedelta(seconds=1)
+
+    parquet = pq.read_table(io.BytesIO(_export(client, "application/vnd.apache.parquet").content))
+    assert parquet.equals(table)
+    assert pq.ParquetFile(io.BytesIO(_export(client, format="parquet").content)).num_row_groups == 3
+
+    packed = list(msgpack.Unpacker(io.BytesIO(_export(client, "application/msgpack", host="ex-1").content)))
+    assert [c["cpu_usage"] for c in packed] == [[1.0, 4.0]]
+
+    lines = _export(client, "application/x-ndjson").text.splitlines()
+    assert len(lines) == 7
+    assert _export(client, "text/csv").status_code == 406
+
+def test_import_round_trips_an_export(client, db_session):
+    _seed(client, 5)
+    exported = _export(client, "application/vnd.apache.parquet").content
+    resp = client.post("/api/metrics/import", content=exported, headers={"Content-Type": "application/vnd.apache.parquet"})
+    assert resp.status_code == 200 and resp.json()["inserted"] == 5
+    assert db_session.query(Metric).filter(Metric.host == "ex-1").count() == 4
+
+    bad = msgpack.packb({"host": ["x"], "cpu_usage": [1.0]})
+    resp = client.post("/api/metrics/import", content=bad, headers={"Content-Type": "application/msgpack"})
+    assert resp.status_code == 422 and "Missing columns" in resp.json()["detail"]
+    assert client.post("/api/metrics/import", content=b"a,b", headers={"Content-Type": "text/csv"}).status_code == 415
+
+def test_import_refuses_bodies_over_the_limit(client, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_MB", 1 / 1024)
+    headers = {"Content-Type": "application/x-ndjson"}
+    assert client.post("/api/metrics/import", content=b"{}\n" * 400, headers=headers).status_code == 413
+    # no Content-Length on a chunked upload: counted while it is read
+    chunked = client.post("/api/metrics/import", content=iter([b"{}\n" * 200] * 2), headers=headers)
+    assert chunked.status_code == 413
+
+def test_accept_negotiation_honours_q_values():
+    assert negotiate("application/msgpack;q=0.5, application/vnd.apache.parquet") == "parquet"
+    assert negotiate("text/html, */*;q=0.1") == "arrow"
+    assert negotiate("application/vnd.apache.parquet;q=0, application/x-ndjson") == "ndjson"
+    assert negotiate("text/html") is None
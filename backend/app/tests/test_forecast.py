@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from app.services import forecast_service
+from app.services.forecast_service import Forecaster, holt_run
+from app.services.metric_services import create_metrics_batch
+from app.tests.factories import metric_payload
+
+WIDTH = 300
+NOW = 1_760_000_100  # a few seconds into a 5m bucket
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+    def time(self):
+        return self.now
+
+def _bucket_ts(k):
+    # naive UTC start of the k-th complete bucket before NOW
+    start = NOW // WIDTH * WIDTH - k * WIDTH
+    return datetime.fromtimestamp(start, tz=timezone.utc).replace(tzinfo=None)
+
+def test_holt_run_tracks_linear_trend_for_all_series_at_once():
+    y = np.vstack([10 + 2.0 * np.arange(50), 80 - 0.5 * np.arange(50)])
+    level, trend, sse, n = holt_run(y, y[:, 0], 0.0, 0.5, 0.2)
+    assert trend == pytest.approx([2.0, -0.5], rel=1e-2)
+    assert (level + trend) == pytest.approx([110.0, 55.0], rel=1e-2)
+    assert list(n) == [50, 50]
+
+def test_forecast_fits_then_folds_in_new_buckets_only(db_session, monkeypatch):
+    clock = FakeClock(NOW)
+    monkeypatch.setattr(forecast_service, "time", clock)
+    # cpu rises by 1 per 5m bucket
+    create_metrics_batch(db_session, [
+        metric_payload(host="fc-1", cpu=40.0 - k, mem=50.0, lat=100.0, ts=_bucket_ts(k)) for k in range(12, 0, -1)
+    ])
+    f = Forecaster("5m", lookback_hours=2)
+    [first] = f.forecast(db_session, ["fc-1"], horizon_minutes=10)
+    model = f._models[("fc-1", "cpu_usage")]
+    assert model.n == 12
+    # last complete bucket had cpu 39 -> two buckets ahead is about 41
+    assert first["predicted_cpu"] == pytest.approx(41.0, abs=0.5)
+    assert first["predicted_memory"] == pytest.approx(50.0, abs=0.1)
+
+    # two more buckets arrive; only those are fed to the cached model
+    clock.now += 2 * WIDTH
+    create_metrics_batch(db_session, [
+        metric_payload(host="fc-1", cpu=40.0 + k, mem=50.0, lat=100.0, ts=_bucket_ts(-k)) for k in range(2)
+    ])
+    [second] = f.forecast(db_session, ["fc-1"], horizon_minutes=10)
+    assert f._models[("fc-1", "cpu_usage")] is model
+    assert model.n == 14
+    assert second["predicted_cpu"] == pytest.approx(43.0, abs=0.5)
+
+def test_fleet_mode_forecasts_every_host(db_session, monkeypatch):
+    monkeypatch.setattr(forecast_service, "time", FakeClock(NOW))
+    create_metrics_batch(db_session, [
+        metric_payload(host=h, cpu=c, ts=_bucket_ts(k)) for h, c in (("fl-a", 20.0), ("fl-b", 60.0)) for k in range(1, 6)
+    ])
+    results = Forecaster("5m", lookback_hours=1).forecast(db_session, None, horizon_minutes=30)
+    assert [(r["host"], r["predicted_cpu"]) for r in results] == [("fl-a", 20.0), ("fl-b", 60.0)]
+    assert results[0]["models"]["cpu_usage"]["buckets"] == 5
+
+def test_unknown_host_is_not_refetched_until_the_next_bucket(db_session, monkeypatch):
+    clock = FakeClock(NOW)
+    monkeypatch.setattr(forecast_service, "time", clock)
+    fetched = []
+    real_get_series = forecast_service.get_series
+
+    def counting_get_series(db, *args):
+        fetched.append(args[-1])
+        return real_get_series(db, *args)
+
+    monkeypatch.setattr(forecast_service, "get_series", counting_get_series)
+    f = Forecaster("5m", lookback_hours=1)
+    assert f.forecast(db_session, ["fc-none"]) == []
+    assert f.forecast(db_session, ["fc-none"]) == []
+    assert len(fetched) == 1
+    clock.now += WIDTH
+    f.forecast(db_session, ["fc-none"])
+    assert len(fetched) == 2
+
+def test_silent_host_does_not_widen_fleet_refreshes(db_session, monkeypatch):
+    clock = FakeClock(NOW)
+    monkeypatch.setattr(forecast_service, "time", clock)
+    ranges = []
+    real_get_series = forecast_service.get_series
+
+    def recording_get_series(db, start, end, *args):
+        ranges.append((end - start).total_seconds())
+        return real_get_series(db, start, end, *args)
+
+    monkeypatch.setattr(forecast_service, "get_series", recording_get_series)
+    create_metrics_batch(db_session, [
+        metric_payload(host=h, cpu=30.0, ts=_bucket_ts(k)) for h in ("fq-quiet", "fq-live") for k in range(1, 4)
+    ])
+    f = Forecaster("5m", lookback_hours=1)
+    assert [r["host"] for r in f.forecast(db_session, None)] == ["fq-live", "fq-quiet"]
+
+    # only fq-live keeps reporting for two hours
+    for step in range(24):
+        clock.now += WIDTH
+        create_metrics_batch(db_session, [metric_payload(host="fq-live", cpu=30.0, ts=_bucket_ts(-step))])
+        results = f.forecast(db_session, None)
+    assert [r["host"] for r in results] == ["fq-live"]
+    assert ("fq-quiet", "cpu_usage") not in f._models
+    assert max(ranges) <= 3600
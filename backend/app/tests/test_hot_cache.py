@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from app.services import metric_services
+from app.services.hot_cache import HotWindowCache, hot_cache
+from app.services.metric_batch import MetricBatch
+from app.services.metric_services import create_metrics_batch, get_recent_metrics, recent_metrics_statement
+from app.tests.factories import metric_payload
+
+def _batch(host, n, start, first_id=1, step=10):
+    batch = MetricBatch.from_items(
+        [metric_payload(host=host, cpu=float(i), ts=start + timedelta(seconds=step * i)) for i in range(n)]
+    )
+    batch.ids = list(range(first_id, first_id + n))
+    return batch
+
+def _rows(metrics):
+    return [(m.id, m.host, m.cpu_usage, m.timestamp) for m in metrics]
+
+def test_hits_match_the_database(db_session):
+    start = datetime.utcnow() - timedelta(minutes=10)
+    items = [metric_payload(host=f"hc-{i % 2}", cpu=float(i), ts=start + timedelta(seconds=i)) for i in range(40)]
+    create_metrics_batch(db_session, items)
+    assert len(hot_cache) == 2
+
+    first = get_recent_metrics(db_session, limit=5, host="hc-0")
+    assert hot_cache.hits == 1
+    from_db = db_session.scalars(recent_metrics_statement(5, "hc-0", None)).all()
+    assert _rows(first) == _rows(from_db)
+
+    before = (first[-1].timestamp, first[-1].id)
+    page = get_recent_metrics(db_session, limit=5, host="hc-0", before=before)
+    assert hot_cache.hits == 2
+    assert _rows(page) == _rows(db_session.scalars(recent_metrics_statement(5, "hc-0", before)).all())
+
+def test_short_window_falls_back_to_the_database(db_session, monkeypatch):
+    create_metrics_batch(db_session, [metric_payload(host="hc-short")])
+    hot_cache.reset()  # e.g. rows written before this process started
+    create_metrics_batch(db_session, [metric_payload(host="hc-short")])
+    assert hot_cache.recent("hc-short", 2) is None
+    assert len(get_recent_metrics(db_session, limit=2, host="hc-short")) == 2
+
+    monkeypatch.setattr(metric_services.settings, "HOT_CACHE_ENABLED", False)
+    assert len(get_recent_metrics(db_session, limit=1, host="hc-short")) == 1
+    assert hot_cache.hits == 0
+
+def test_late_rows_are_merged_and_deduplicated():
+    cache = HotWindowCache(points=8, minutes=0, max_bytes=1 << 20)
+    start = datetime(2026, 1, 1)
+    cache.add(_batch("late", 6, start, first_id=10, step=20))
+    # interleaved late rows plus a repeat of id 12
+    late = _batch("late", 3, start + timedelta(seconds=10), first_id=100, step=20)
+    cache.add(late)
+    cache.add(_batch("late", 1, start + timedelta(seconds=40), first_id=12))
+    rows = cache.recent("late", 8)
+    assert [m.id for m in rows] == [15, 14, 13, 102, 12, 101, 11, 100]
+    assert rows == sorted(rows, key=lambda m: (m.timestamp, m.id), reverse=True)
+    assert cache.recent("late", 9) is None  # oldest row fell out of the window
+
+def test_late_row_before_the_window_is_not_served_next_to_a_gap():
+    cache = HotWindowCache(points=8, minutes=0, max_bytes=1 << 20)
+    t0 = datetime(2026, 1, 1, 12)
+    cache.add(_batch("h", 5, t0, first_id=50, step=1))
+    # the DB may hold rows between t0 - 30min and t0 that this window never saw
+    cache.add(_batch("h", 1, t0 - timedelta(minutes=30), first_id=900))
+    assert [m.id for m in cache.recent("h", 5)] == [54, 53, 52, 51, 50]
+    assert cache.recent("h", 6) is None
+    assert cache.recent("h", 1, before=(t0, 50)) is None
+
+def test_byte_budget_evicts_least_recently_written_host():
+    start = datetime(2026, 1, 1)
+    probe = HotWindowCache(points=100, minutes=0, max_bytes=1 << 20)
+    probe.add(_batch("x", 100, start))
+    cache = HotWindowCache(points=100, minutes=0, max_bytes=2 * probe.nbytes)
+    for host in ("a", "b", "c"):
+        cache.add(_batch(host, 100, start))
+    assert len(cache) == 2
+    assert cache.recent("a", 1) is None
+    assert cache.recent("c", 100)[0].cpu_usage == 99.0
+    assert cache.nbytes <= cache.max_bytes
+
+def test_warm_loads_the_newest_rows_per_host(db_session):
+    start = datetime.utcnow() - timedelta(minutes=30)
+    create_metrics_batch(db_session, [metric_payload(host="w1", ts=start + timedelta(seconds=i)) for i in range(12)])
+    create_metrics_batch(db_session, [metric_payload(host="w2", ts=start + timedelta(seconds=i)) for i in range(3)])
+    cache = HotWindowCache(points=10, minutes=60, max_bytes=1 << 20)
+    assert cache.warm(db_session) == 13
+    assert _rows(cache.recent("w1", 10)) == _rows(db_session.scalars(recent_metrics_statement(10, "w1", None)).all())
+    assert cache.recent("w2", 4) is None
@@ -0,0 +1,54 @@
+import logging
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.core.instrumentation import BACKGROUND, fingerprint, instrument_engine, normalize_statement
+from app.services.metric_services import create_metrics_batch
+from app.tests.factories import metric_payload
+
+def test_fingerprints_ignore_literals_and_list_lengths():
+    a = "SELECT metrics.id FROM metrics WHERE metrics.host IN (?, ?, ?) AND cpu_usage > 90 LIMIT ?"
+    b = "SELECT metrics.id FROM metrics\n WHERE metrics.host IN (%(host_1)s, %(host_2)s) AND cpu_usage > 75.5 LIMIT %(param_1)s"
+    assert normalize_statement(a) == normalize_statement(b)
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a).startswith("SELECT metrics ")
+
+    rows = "INSERT INTO metrics (host, cpu_usage) VALUES (?, ?), (?, ?), (?, ?)"
+    assert normalize_statement(rows) == "INSERT INTO metrics (host, cpu_usage) VALUES (?)"
+    assert fingerprint(rows).startswith("INSERT metrics ")
+    assert fingerprint("SELECT 'x' FROM alerts") != fingerprint("SELECT 'x' FROM metrics")
+
+def test_server_timing_and_route_histograms(client, db_session, engine, monkeypatch):
+    instrument_engine(engine)
+    monkeypatch.setattr(settings, "SERVER_TIMING_HEADER", True)
+    create_metrics_batch(db_session, [metric_payload(host="it-1", cpu=float(i)) for i in range(5)])
+    before = REGISTRY.get_sample_value("hydra_request_queries_count", {"route": "/metrics/"}) or 0
+
+    resp = client.get("/metrics/?limit=5")
+    assert resp.status_code == 200
+    timing = dict(part.split(";", 1) for part in resp.headers["Server-Timing"].split(", "))
+    assert set(timing) >= {"db", "serialize", "total"}
+    assert "queries=1" in timing["db"]
+    assert REGISTRY.get_sample_value("hydra_request_queries_count", {"route": "/metrics/"}) == before + 1
+    assert REGISTRY.get_sample_value("hydra_request_phase_seconds_count", {"route": "/metrics/", "phase": "serialize"})
+
+    monkeypatch.setattr(settings, "SERVER_TIMING_HEADER", False)
+    assert "Server-Timing" not in client.get("/metrics/?limit=4").headers
+
+def test_slow_queries_are_logged_with_their_route(db_session, engine, monkeypatch, caplog):
+    instrument_engine(engine)
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.core.instrumentation"):
+        db_session.execute(text("SELECT 42"))
+    assert any("Slow query" in r.message and BACKGROUND in r.message and "SELECT ?" in r.message for r in caplog.records)
+
+def test_failed_statements_do_not_leak_start_times(engine):
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            conn.rollback()
+        assert conn.info["hydra_query_start"] == []
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.models.alert import Alert
+from app.services.alert_state import ACTIVE_STATUSES, open_alerts
+from app.services.latest_index import LatestValueIndex, get_fleet_summary, latest_index
+from app.services.metric_batch import MetricBatch
+from app.services.metric_services import create_metrics_batch
+from app.tests.factories import metric_payload
+
+def test_newest_row_per_host_wins():
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    index = LatestValueIndex()
+    index.add(MetricBatch.from_items([
+        metric_payload(host="b", cpu=2.0, ts=t0 + timedelta(seconds=20)),
+        metric_payload(host="a", cpu=1.0, ts=t0 + timedelta(seconds=30)),
+        metric_payload(host="b", cpu=3.0, ts=t0 + timedelta(seconds=10)),  # out of order inside the batch
+        metric_payload(host="a", cpu=4.0, ts=t0),
+    ]))
+    assert {h: v[2] for h, v in index.snapshot().items()} == {"a": 1.0, "b": 2.0}
+
+    # late data does not move a host back in time, newer data does
+    index.add(MetricBatch.from_items([
+        metric_payload(host="a", cpu=9.0, ts=t0),
+        metric_payload(host="b", cpu=7.0, ts=t0 + timedelta(minutes=1)),
+    ]))
+    latest = index.snapshot()
+    assert latest["a"][2] == 1.0
+    assert latest["b"][2] == 7.0 and latest["b"][1] == t0 + timedelta(minutes=1)
+
+def test_summary_endpoint(client, db_session):
+    now = datetime.utcnow()
+    create_metrics_batch(db_session, [
+        metric_payload(host="fs-ok", cpu=20.0, ts=now - timedelta(seconds=30)),
+        metric_payload(host="fs-ok", cpu=25.0, ts=now - timedelta(seconds=5)),
+        metric_payload(host="fs-hot", cpu=97.0, mem=90.0, ts=now - timedelta(seconds=5)),
+        metric_payload(host="fs-old", cpu=15.0, ts=now - timedelta(hours=2)),
+    ])
+
+    body = client.get("/api/hosts/summary").json()
+    hosts = {h["host"]: h for h in body["hosts"]}
+    assert list(hosts) == ["fs-hot", "fs-ok", "fs-old"]
+    assert hosts["fs-ok"]["cpu_usage"] == 25.0 and not hosts["fs-ok"]["stale"]
+    open_for_hot = db_session.scalar(
+        select(func.count()).select_from(Alert).where(Alert.host == "fs-hot", Alert.status.in_(ACTIVE_STATUSES))
+    )
+    assert open_for_hot >= 1
+    assert hosts["fs-hot"]["active_alerts"] == open_for_hot and hosts["fs-ok"]["active_alerts"] == 0
+    assert hosts["fs-old"]["stale"] and body["stale_hosts"] == 1 and body["total_hosts"] == 3
+
+    narrow = client.get("/api/hosts/summary?stale_after=1").json()
+    assert narrow["stale_hosts"] == 3
+
+def test_index_warms_from_the_db_and_matches_the_fallback(db_session, monkeypatch):
+    now = datetime.utcnow()
+    create_metrics_batch(db_session, [
+        metric_payload(host=f"fw-{i % 4}", cpu=float(i), ts=now - timedelta(seconds=100 - i)) for i in range(40)
+    ])
+    latest_index.reset()  # e.g. a fresh process
+
+    warmed = get_fleet_summary(db_session)
+    assert latest_index.warm_loaded and len(latest_index) == 4
+    assert [h["cpu_usage"] for h in warmed["hosts"]] == [36.0, 37.0, 38.0, 39.0]
+
+    monkeypatch.setattr(settings, "LATEST_INDEX_ENABLED", False)
+    from_db = get_fleet_summary(db_session)
+    assert [{**h, "stale": None} for h in from_db["hosts"]] == [{**h, "stale": None} for h in warmed["hosts"]]
+
+def test_disabled_index_counts_alerts_in_the_db(db_session, monkeypatch):
+    create_metrics_batch(db_session, [metric_payload(host="fc-hot", cpu=99.0)])
+    monkeypatch.setattr(settings, "LATEST_INDEX_ENABLED", False)
+    # e.g. the alert was opened by another worker: this worker's index does not know it
+    open_alerts.reset()
+    monkeypatch.setattr(open_alerts, "_warm", True)
+    summary = get_fleet_summary(db_session)
+    assert {h["host"]: h["active_alerts"] for h in summary["hosts"]}["fc-hot"] == 1
@@ -0,0 +1,48 @@
+import asyncio
+import json
+from datetime import datetime
+from app.services.live_bus import LiveBus, RESYNC
+from app.services.metric_batch import MetricBatch
+from app.tests.factories import metric_payload
+
+def _payload(host, cpu):
+    return {"host": host, "cpu_usage": cpu, "memory_usage": 1.0, "latency": 1.0, "timestamp": datetime.utcnow().isoformat()}
+
+def test_bus_filters_by_host_and_resyncs_slow_subscribers():
+    async def scenario():
+        bus = LiveBus(queue_size=2)
+        everyone, only_b = bus.subscribe(), bus.subscribe(["b"])
+        for cpu in (1.0, 2.0, 3.0, 4.0):
+            bus.publish_metrics(MetricBatch.from_items([metric_payload(host="a", cpu=cpu), metric_payload(host="b", cpu=cpu)]))
+        await asyncio.sleep(0)
+        frames = [json.loads(everyone.queue.get_nowait()) for _ in range(2)]
+        assert [[r["cpu_usage"] for r in f["data"]] for f in frames] == [[1.0, 1.0], [2.0, 2.0]]
+        # frames 3 and 4 were dropped; the next delivery starts with a resync marker
+        bus.publish_metrics(MetricBatch.from_items([metric_payload(host="b", cpu=5.0)]))
+        await asyncio.sleep(0)
+        assert everyone.queue.get_nowait() == RESYNC
+        assert json.loads(everyone.queue.get_nowait())["data"][0]["cpu_usage"] == 5.0
+        assert {r["host"] for r in json.loads(only_b.queue.get_nowait())["data"]} == {"b"}
+        bus.publish_alerts(["a"])
+        await asyncio.sleep(0)
+        assert only_b.queue.qsize() == 1  # still lagging from the earlier frames, no alert for "a"
+        bus.unsubscribe(everyone)
+        bus.unsubscribe(only_b)
+        assert len(bus) == 0
+    asyncio.run(scenario())
+
+def test_websocket_receives_ingested_metrics_and_alert_notices(client):
+    with client.websocket_connect("/ws/metrics?hosts=ws-1") as ws:
+        client.post("/metrics/batch", json=[_payload("ws-2", 10.0), _payload("ws-1", 99.0)])
+        frame = json.loads(ws.receive_text())
+        assert frame["type"] == "metrics"
+        assert [(r["host"], r["cpu_usage"]) for r in frame["data"]] == [("ws-1", 99.0)]
+        assert isinstance(frame["data"][0]["id"], int)
+        assert json.loads(ws.receive_text()) == {"type": "alerts", "hosts": ["ws-1"]}
+
+        ws.send_text(json.dumps({"hosts": ["ws-2"]}))
+        assert json.loads(ws.receive_text()) == {"type": "subscribed", "hosts": ["ws-2"]}
+        client.post("/metrics/", json=_payload("ws-1", 1.0))
+        client.post("/metrics/", json=_payload("ws-2", 2.0))
+        frame = json.loads(ws.receive_text())
+        assert [(r["host"], r["cpu_usage"]) for r in frame["data"]] == [("ws-2", 2.0)]
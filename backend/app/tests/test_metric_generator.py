@@ -0,0 +1,58 @@
+import asyncio
+import time
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from app.models.metric import Metric
+from app.models.rollup import MetricRollup1m
+from app.services.hot_cache import hot_cache
+from app.services.metric_generator import MetricGenerator, parse_hosts
+
+def _generator(db_session, hosts, interval=0.05):
+    return MetricGenerator(hosts, interval, session_factory=sessionmaker(bind=db_session.get_bind()), seed=3)
+
+def _count(db, prefix):
+    return db.scalar(select(func.count()).select_from(Metric).where(Metric.host.like(f"{prefix}%")))
+
+def test_parse_hosts():
+    assert parse_hosts(None) is None
+    assert parse_hosts(" a, b ,,c ") == ["a", "b", "c"]
+    hosts = parse_hosts("1200")
+    assert len(hosts) == 1200 and hosts[0] == "dev-host-00000" and len(set(hosts)) == 1200
+
+def test_tick_writes_every_host_through_the_ingest_path(db_session):
+    generator = _generator(db_session, parse_hosts("250"))
+    assert generator.tick(datetime(2026, 1, 1, 12, 0, 0)) == 250
+    assert _count(db_session, "dev-host-") == 250
+    # same pipeline as /metrics/batch: rollups and the hot cache are fed too
+    assert db_session.scalar(select(func.count()).select_from(MetricRollup1m)) == 250
+    assert len(hot_cache) == 250
+
+def test_runs_on_schedule_and_stops_cleanly(db_session):
+    generator = _generator(db_session, ["gen-a", "gen-b"], interval=0.05)
+
+    async def scenario():
+        generator.start()
+        await asyncio.sleep(0.22)
+        await generator.stop()
+
+    asyncio.run(scenario())
+    assert not generator.running
+    assert 3 <= generator.ticks <= 6
+    assert generator.errors == 0
+    assert _count(db_session, "gen-") == generator.rows == 2 * generator.ticks
+    assert 0 <= generator.max_drift < 0.2
+
+def test_slow_ticks_are_skipped_not_queued(db_session, monkeypatch):
+    generator = _generator(db_session, ["gen-slow"], interval=0.02)
+    monkeypatch.setattr(generator, "tick", lambda: time.sleep(0.07) or 1)
+
+    async def scenario():
+        generator.start()
+        await asyncio.sleep(0.2)
+        await generator.stop()
+
+    asyncio.run(scenario())
+    assert generator.skipped >= generator.ticks
+    # starts stay on the grid: no tick begins a whole interval late
+    assert generator.max_drift < 0.02
@@ -0,0 +1,35 @@
+from datetime import date, datetime, timedelta, timezone
+from app.core.config import settings
+from app.models.metric import Metric
+from app.models.rollup import MetricRollup1m
+from app.services.metric_batch import MetricBatch
+from app.services.metric_services import write_metric_rows
+from app.services.partitions import partition_ddl, partition_name, run_maintenance
+from app.services.rollup_service import update_rollups
+from app.tests.factories import metric_payload
+
+def test_partition_ddl_covers_one_utc_day():
+    assert partition_name(date(2026, 3, 9)) == "metrics_p20260309"
+    assert partition_ddl(date(2026, 3, 9)) == (
+        "CREATE TABLE IF NOT EXISTS metrics_p20260309 PARTITION OF metrics "
+        "FOR VALUES FROM ('2026-03-09T00:00:00+00:00') TO ('2026-03-10T00:00:00+00:00')"
+    )
+
+def test_retention_without_partitions_deletes_old_rows(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "RETENTION_RAW_DAYS", 7)
+    monkeypatch.setattr(settings, "RETENTION_1M_DAYS", 3)
+    now = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+    naive = now.replace(tzinfo=None)
+    items = [metric_payload(host="ret-1", ts=naive - timedelta(days=d)) for d in (0, 2, 6, 8, 30)]
+    write_metric_rows(db_session, [i.model_dump() for i in items])
+    update_rollups(db_session, MetricBatch.from_items(items))
+    db_session.commit()
+
+    report = run_maintenance(db_session, now=now)
+    assert report["partitioned"] is False and report["created"] == []
+    # the cutoff is midnight 7 days back, so day 6 stays and days 8 and 30 go
+    assert report["deleted_raw"] == 2
+    assert report["deleted_rollups"] == {"metrics_1m": 3}
+    kept = sorted(round((naive - m.timestamp).days) for m in db_session.query(Metric).filter(Metric.host == "ret-1"))
+    assert kept == [0, 2, 6]
+    assert db_session.query(MetricRollup1m).filter(MetricRollup1m.host == "ret-1").count() == 2
@@ -0,0 +1,30 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+from app.core.database import engine
+from app.core.pool import TimedQueuePool, export_pool_stats, pool_options
+
+def _sample(name, label):
+    return REGISTRY.get_sample_value(name, {"engine": label}) or 0.0
+
+def test_engine_uses_pool_settings():
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+    assert engine.pool._recycle == settings.DB_POOL_RECYCLE
+    assert pool_options(settings)["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+
+def test_pool_wait_and_occupancy_are_exported():
+    test_engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=1)
+    export_pool_stats(test_engine, "sync")
+    waits = _sample("hydra_db_pool_wait_seconds_count", "sync")
+    with test_engine.connect() as a, test_engine.connect() as b:
+        a.execute(text("SELECT 1"))
+        b.execute(text("SELECT 1"))
+        assert _sample("hydra_db_pool_checked_out", "sync") == 2
+        assert _sample("hydra_db_pool_overflow", "sync") == 1
+    assert _sample("hydra_db_pool_wait_seconds_count", "sync") == waits + 2
+    assert _sample("hydra_db_pool_checked_out", "sync") == 0
+    # hand the gauges back to the app engine
+    export_pool_stats(engine, "sync")
+    test_engine.dispose()
@@ -0,0 +1,63 @@
+import threading
+import time
+from app.core.config import settings
+from app.services.profiler import SamplingProfiler, heap_tracker
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+def test_sampler_sees_every_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    worker.start()
+    profiler = SamplingProfiler(interval=0.005)
+    profiler.start()
+    time.sleep(0.3)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert profiler.samples >= 10
+    assert profiler.overhead < 0.05
+    busy = [line for line in profiler.collapsed().splitlines() if line.startswith("busy-worker;")]
+    assert busy and all("_spin (" in line for line in busy)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) == profiler.samples
+    assert not any(line.startswith("hydra-profiler;") for line in profiler.collapsed().splitlines())
+
+    doc = profiler.speedscope()
+    frames = doc["shared"]["frames"]
+    busy_profile = next(p for p in doc["profiles"] if p["name"] == "busy-worker")
+    assert len(busy_profile["samples"]) == len(busy_profile["weights"])
+    assert any(frames[stack[-1]]["name"] in ("_spin", "<genexpr>") for stack in busy_profile["samples"])
+
+def test_debug_endpoints_need_the_token(client, monkeypatch):
+    assert client.get("/debug/profile?seconds=0.1").status_code == 404
+    monkeypatch.setattr(settings, "DEBUG_TOKEN", "s3cret")
+    assert client.get("/debug/profile?seconds=0.1").status_code == 401
+    assert client.get("/debug/profile?seconds=0.1", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.get("/debug/profile?seconds=9999", headers={"Authorization": "Bearer s3cret"}).status_code == 422
+
+def test_profile_and_heap_endpoints(client, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG_TOKEN", "s3cret")
+    auth = {"Authorization": "Bearer s3cret"}
+
+    resp = client.get("/debug/profile?seconds=0.2&format=speedscope&interval_ms=5", headers=auth)
+    assert resp.status_code == 200
+    assert resp.json()["profiles"] and int(resp.headers["X-Profile-Samples"]) > 0
+    assert resp.headers["X-Profile-Overhead"].endswith("%")
+    text = client.get("/debug/profile?seconds=0.1", headers=auth).text
+    assert text.strip() and all(line.rsplit(" ", 1)[1].isdigit() for line in text.splitlines())
+
+    assert client.get("/debug/heap", headers=auth).status_code == 409
+    try:
+        assert client.post("/debug/heap/start?frames=2", headers=auth).json()["tracing"]
+        kept = [bytearray(1024) for _ in range(200)]
+        first = client.get("/debug/heap?top=5", headers=auth).json()
+        assert first["traced_bytes"] > 0 and len(first["top"]) == 5
+        kept += [bytearray(4096) for _ in range(200)]
+        grown = client.get("/debug/heap?top=5&diff=true", headers=auth).json()
+        assert grown["diff"] and "size_diff" in grown["top"][0]
+    finally:
+        client.post("/debug/heap/stop", headers=auth)
+    assert not heap_tracker.tracing
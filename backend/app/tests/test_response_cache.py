@@ -0,0 +1,59 @@
+from datetime import datetime
+from app.services.response_cache import CachedResponse, MemoryBackend, ResponseCache, response_cache
+from app.tests.factories import metric_payload
+
+def _post(client, host, cpu=10.0):
+    resp = client.post("/metrics/", json=metric_payload(host=host, cpu=cpu).model_dump(mode="json"))
+    assert resp.status_code == 200
+
+def test_repeated_reads_are_served_from_cache_with_etag(client):
+    _post(client, "rc-1")
+    first = client.get("/api/metrics", params={"host": "rc-1", "limit": 10})
+    second = client.get("/api/metrics", params={"limit": 10, "host": "rc-1"})
+    assert response_cache.hits == 1
+    assert first.content == second.content and first.headers["etag"] == second.headers["etag"]
+
+    not_modified = client.get("/api/metrics", params={"host": "rc-1", "limit": 10},
+                              headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+def test_ingest_invalidates_only_affected_hosts(client):
+    _post(client, "rc-a")
+    _post(client, "rc-b")
+    for host in ("rc-a", "rc-b"):
+        client.get("/api/metrics", params={"host": host})
+    client.get("/metrics/")
+
+    _post(client, "rc-a", cpu=77.0)
+    hits = response_cache.hits
+    assert client.get("/api/metrics", params={"host": "rc-a"}).json()[0]["cpu_usage"] == 77.0
+    assert client.get("/metrics/").json()[0]["cpu_usage"] == 77.0
+    assert response_cache.hits == hits
+    client.get("/api/metrics", params={"host": "rc-b"})
+    assert response_cache.hits == hits + 1
+
+def test_alert_writes_invalidate_active_alerts(client):
+    assert client.get("/alerts/active").json() == []
+    alert = {"id": 0, "host": "rc-x", "type": "CPU High", "value": 99.0,
+             "timestamp": datetime.utcnow().isoformat(), "status": "active"}
+    created = client.post("/alerts/", json=alert).json()
+    assert [a["id"] for a in client.get("/alerts/active").json()] == [created["id"]]
+    client.post(f"/alerts/{created['id']}/resolve")
+    assert client.get("/alerts/active").json() == []
+
+def test_memory_backend_respects_entry_and_byte_budgets():
+    backend = MemoryBackend(max_entries=3, max_bytes=1 << 20)
+    cache = ResponseCache(backend, ttl=60)
+    for i in range(5):
+        cache.store(f"k{i}", (), b"x" * 100, {})
+    assert len(backend) == 3 and backend.get("k0") is None
+
+    small = MemoryBackend(max_entries=100, max_bytes=3 * CachedResponse(b"x" * 1000, {}).nbytes)
+    for i in range(5):
+        small.set(f"k{i}", CachedResponse(b"x" * 1000, {}), 60)
+    assert len(small) == 3 and small.nbytes <= small.max_bytes
+    assert small.get("k4") is not None
+
+    expired = MemoryBackend(max_entries=10, max_bytes=1 << 20)
+    expired.set("k", CachedResponse(b"{}", {}), ttl=0)
+    assert expired.get("k") is None and len(expired) == 0
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+from app.models.metric import Metric
+from app.models.rollup import MetricRollup1h, MetricRollup1m
+from app.services.metric_services import create_metrics_batch
+from app.services import rollup_service
+from app.services.rollup_service import rebuild_rollups
+from app.services.series_service import choose_rollup, get_series
+from app.services.sketch import QuantileSketch
+from app.tests.factories import metric_payload
+
+T0 = datetime(2025, 11, 2, 8, 0, 0)
+
+def test_sketch_quantiles_are_within_relative_error_and_merge():
+    values = np.linspace(1, 1000, 5000)
+    a, b = QuantileSketch(), QuantileSketch()
+    a.add_many(values[:2500])
+    b.add_many(values[2500:])
+    merged = QuantileSketch.from_bytes(a.merge(b).to_bytes())
+    assert merged.count == 5000
+    for q in (0.5, 0.95, 0.99):
+        assert merged.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+
+def test_rollups_merge_across_batches(db_session):
+    create_metrics_batch(db_session, [metric_payload(host="r-1", cpu=10.0, ts=T0 + timedelta(seconds=5))])
+    create_metrics_batch(db_session, [
+        metric_payload(host="r-1", cpu=30.0, ts=T0 + timedelta(seconds=50)),
+        metric_payload(host="r-1", cpu=50.0, ts=T0 + timedelta(minutes=1, seconds=1)),
+    ])
+    minutes = db_session.query(MetricRollup1m).filter_by(host="r-1").order_by(MetricRollup1m.bucket).all()
+    assert [(m.count, m.cpu_usage_sum, m.cpu_usage_min, m.cpu_usage_max) for m in minutes] == [
+        (2, 40.0, 10.0, 30.0), (1, 50.0, 50.0, 50.0),
+    ]
+    [hour] = db_session.query(MetricRollup1h).filter_by(host="r-1").all()
+    assert (hour.count, hour.cpu_usage_sum) == (3, 90.0)
+    assert QuantileSketch.from_bytes(hour.cpu_usage_sketch).count == 3
+
+def test_series_picks_coarsest_rollup(db_session):
+    assert choose_rollup(300) is MetricRollup1m
+    assert choose_rollup(3600) is MetricRollup1h
+    assert choose_rollup(86400) is MetricRollup1h
+
+    create_metrics_batch(db_session, [
+        metric_payload(host="r-2", cpu=float(10 * i), ts=T0 + timedelta(minutes=i)) for i in range(10)
+    ])
+    out = get_series(db_session, T0, T0 + timedelta(hours=2), "1h", ["avg", "max", "p50"], ["cpu_usage"], ["r-2"])
+    assert out["source"] == "metrics_1h"
+    [s] = out["series"]
+    assert s["count"] == [10]
+    assert s["cpu_usage_avg"] == [45.0] and s["cpu_usage_max"] == [90.0]
+    assert s["cpu_usage_p50"][0] == pytest.approx(40.0, rel=0.02)
+
+    five = get_series(db_session, T0, T0 + timedelta(hours=1), "5m", ["avg"], ["cpu_usage"], ["r-2"])
+    assert five["source"] == "metrics_1m"
+    assert five["series"][0]["cpu_usage_avg"] == [20.0, 70.0]
+
+def test_rollup_series_matches_raw_on_unaligned_ranges(db_session):
+    create_metrics_batch(db_session, [
+        metric_payload(host="r-4", cpu=float(i), ts=T0 + timedelta(minutes=5 * i, seconds=10)) for i in range(30)
+    ])
+    args = (["avg", "min", "max", "sum"], ["cpu_usage"], ["r-4"])
+    for start, end, bucket in (
+        (T0 + timedelta(minutes=17), T0 + timedelta(hours=2, minutes=3), "1h"),
+        (T0 + timedelta(minutes=5, seconds=30), T0 + timedelta(minutes=50, seconds=5), "15m"),
+        (T0 + timedelta(minutes=20), T0 + timedelta(minutes=40), "1h"),
+    ):
+        rollup = get_series(db_session, start, end, bucket, *args, source="rollup")
+        raw = get_series(db_session, start, end, bucket, *args, source="raw")
+        assert rollup["series"] == raw["series"]
+
+def test_rebuild_rollups_from_raw(db_session):
+    db_session.add_all([
+        Metric(host="r-3", cpu_usage=c, memory_usage=1.0, latency=1.0, timestamp=T0 + timedelta(minutes=m))
+        for m, c in ((0, 10.0), (0, 20.0), (61, 30.0))
+    ])
+    db_session.commit()
+    read = rebuild_rollups(db_session, T0, T0 + timedelta(hours=2))
+    assert read == 3
+    hours = db_session.query(MetricRollup1h).filter_by(host="r-3").order_by(MetricRollup1h.bucket).all()
+    assert [h.count for h in hours] == [2, 1]
+    assert db_session.query(MetricRollup1m).filter_by(host="r-3").count() == 2
+
+def test_failed_rebuild_keeps_the_old_rollups(db_session, monkeypatch):
+    create_metrics_batch(db_session, [metric_payload(host="r-5", cpu=10.0, ts=T0 + timedelta(minutes=1))])
+
+    def broken(db, batch):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(rollup_service, "update_rollups", broken)
+    session = Session(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    with pytest.raises(RuntimeError):
+        rebuild_rollups(session, T0, T0 + timedelta(hours=1))
+    session.close()
+    # the delete went down with the failed rebuild
+    assert db_session.query(MetricRollup1m).filter_by(host="r-5").count() == 1
+    assert db_session.query(MetricRollup1h).filter_by(host="r-5").count() == 1
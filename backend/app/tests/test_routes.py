@@ -1,5 +1,7 @@
-from datetime import datetime
-from app.schemas.metric import MetricCreate
+from datetime import datetime, timedelta
+from pydantic import TypeAdapter
+from app.schemas.metric import MetricCreate, MetricResponse
+from app.services.metric_services import get_recent_metrics
 
 def test_post_metric_and_get_metrics(client):
     payload = {
@@ -25,4 +27,44 @@ def test_alerts_endpoint_returns_list(client):
     resp = client.get("/alerts/active")
     assert resp.status_code == 200
     data = resp.json()
-    assert isinstance(data, list)
\ No newline at end of file
+    assert isinstance(data, list)
+
+def test_metrics_keyset_pagination(client):
+    now = datetime.utcnow().replace(microsecond=0)
+    # two rows share a timestamp so the id tie-break is exercised
+    rows = [
+        {"host": f"page-{i % 2}", "cpu_usage": float(i), "memory_usage": 1.0, "latency": 1.0,
+         "timestamp": (now - timedelta(seconds=min(i, 5))).isoformat()}
+        for i in range(7)
+    ]
+    assert client.post("/metrics/batch", json=rows).json()["inserted"] == 7
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"before": cursor} if cursor else {})}
+        resp = client.get("/metrics/", params=params)
+        assert resp.status_code == 200
+        seen += [m["cpu_usage"] for m in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert sorted(seen) == [float(i) for i in range(7)] and len(seen) == 7
+
+    page = client.get("/api/metrics", params={"host": "page-1", "limit": 2})
+    rest = client.get("/api/metrics", params={"host": "page-1", "limit": 2, "before": page.headers["X-Next-Cursor"]})
+    assert [m["cpu_usage"] for m in page.json() + rest.json()] == [1.0, 3.0, 5.0]
+    assert client.get("/metrics/", params={"before": "yesterday"}).status_code == 422
+
+def test_metric_lists_serialize_like_the_response_model(client, db_session):
+    rows = [{"host": f"ser-{i % 2}", "cpu_usage": i + 0.5, "memory_usage": 2.0, "latency": 3.25,
+             "timestamp": datetime(2026, 1, 1, 0, 0, i, 1000 * i).isoformat()} for i in range(5)]
+    client.post("/metrics/batch", json=rows)
+
+    adapter = TypeAdapter(list[MetricResponse])
+    expected = adapter.dump_json(adapter.validate_python(get_recent_metrics(db_session, 5), from_attributes=True))
+    assert client.get("/metrics/", params={"limit": 5}).content == expected
+
+    columns = client.get("/api/metrics", params={"limit": 5, "shape": "columns"}).json()
+    records = client.get("/api/metrics", params={"limit": 5}).json()
+    assert columns == {field: [r[field] for r in records] for field in records[0]}
+    assert client.get("/api/metrics", params={"shape": "wide"}).status_code == 422
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.services.metric_batch import to_epoch
+from app.services.metric_services import create_metrics_batch
+from app.services.series_service import get_series, parse_aggs, series_statement
+from app.tests.factories import metric_payload
+
+T0 = datetime(2025, 11, 1, 12, 0, 0)
+
+def _seed(db_session):
+    items = []
+    for minute in range(3):
+        for second, cpu in ((0, 10.0), (20, 20.0), (40, 60.0)):
+            ts = T0 + timedelta(minutes=minute, seconds=second)
+            items.append(metric_payload(host="s-a", cpu=cpu + minute, ts=ts))
+            items.append(metric_payload(host="s-b", cpu=50.0, ts=ts))
+    create_metrics_batch(db_session, items)
+
+def test_series_buckets_per_host(db_session):
+    _seed(db_session)
+    out = get_series(db_session, T0, T0 + timedelta(minutes=3), "1m", ["avg", "max", "p50"], ["cpu_usage"], source="raw")
+    assert out["source"] == "metrics"
+    assert [s["host"] for s in out["series"]] == ["s-a", "s-b"]
+    a = out["series"][0]
+    start = int(to_epoch(T0))
+    assert a["ts"] == [start, start + 60, start + 120]
+    assert a["count"] == [3, 3, 3]
+    assert a["cpu_usage_avg"] == [30.0, 31.0, 32.0]
+    assert a["cpu_usage_max"] == [60.0, 61.0, 62.0]
+    assert a["cpu_usage_p50"] == [20.0, 21.0, 22.0]
+
+def test_series_host_filter_and_wider_bucket(db_session):
+    _seed(db_session)
+    out = get_series(db_session, T0, T0 + timedelta(hours=1), "5m", ["avg"], ["cpu_usage", "latency"], hosts=["s-b"], source="raw")
+    [b] = out["series"]
+    assert b["count"] == [9]
+    assert b["cpu_usage_avg"] == [50.0]
+    assert "memory_usage_avg" not in b
+
+def test_parse_aggs_validates():
+    assert parse_aggs("avg, max,p95,avg") == ["avg", "max", "p95"]
+    with pytest.raises(ValueError):
+        parse_aggs("median")
+    with pytest.raises(ValueError):
+        parse_aggs("p100")
+
+def test_postgres_statement_buckets_in_sql():
+    stmt = series_statement(T0, T0 + timedelta(hours=1), 300, ["avg", "p95"], ["cpu_usage"], ["h"])
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "floor(EXTRACT(epoch FROM metrics.timestamp)" in sql
+    assert "percentile_cont" in sql and "WITHIN GROUP" in sql
@@ -0,0 +1,39 @@
+import numpy as np
+from app.services.simulation import FleetSimulator, host_names, to_rows
+from app.schemas.metric import MetricCreate
+
+T0 = 1_767_225_600.0  # 2026-01-01T00:00:00Z
+
+def _run(sim, steps, every=300.0, index=None):
+    return [sim.sample(T0 + i * every, index) for i in range(steps)]
+
+def test_samples_are_bounded_and_deterministic_per_seed():
+    hosts = host_names(500)
+    a, b = FleetSimulator(hosts, seed=7), FleetSimulator(hosts, seed=7)
+    for x, y in zip(_run(a, 20), _run(b, 20)):
+        for field in ("cpu_usage", "memory_usage", "latency"):
+            np.testing.assert_array_equal(x[field], y[field])
+        assert 0 <= x["cpu_usage"].min() and x["cpu_usage"].max() <= 100
+        assert 0 <= x["memory_usage"].min() and x["memory_usage"].max() <= 100
+        assert (x["latency"] > 0).all()
+
+def test_patterns_are_correlated_and_follow_the_day():
+    sim = FleetSimulator(host_names(2000), seed=1)
+    day = _run(sim, 288)  # one day at 5 min
+    cpu = np.stack([s["cpu_usage"] for s in day])
+    lat = np.stack([s["latency"] for s in day])
+    # latency rises with cpu on the same host
+    within = [np.corrcoef(cpu[:, h], lat[:, h])[0, 1] for h in range(0, 2000, 50)]
+    assert np.median(within) > 0.5
+    # each host swings over the day, not just sample to sample
+    hourly = cpu.reshape(24, 12, -1).mean(axis=1)
+    assert np.median(hourly.max(axis=0) - hourly.min(axis=0)) > 10
+
+def test_shards_share_host_parameters_and_rows_validate():
+    hosts = host_names(10)
+    whole, shard = FleetSimulator(hosts, seed=3), FleetSimulator(hosts, seed=3)
+    np.testing.assert_array_equal(whole.base_cpu[1::2], shard.base_cpu[1::2])
+    rows = to_rows(shard.sample(T0, np.arange(1, 10, 2)), T0)
+    items = [MetricCreate.model_validate(r) for r in rows]
+    assert [i.host for i in items] == list(hosts[1::2])
+    assert items[0].timestamp.isoformat() == "2026-01-01T00:00:00"
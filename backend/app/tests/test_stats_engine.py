@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from app.services.metric_batch import MetricBatch
+from app.services.metric_services import create_metrics_batch
+from app.services import stats_engine as stats_module
+from app.services.stats_engine import RunningStats, StatsEngine, stats_engine
+from app.tests.factories import metric_payload
+
+def test_running_stats_merge_matches_numpy():
+    rng = np.random.default_rng(7)
+    values = rng.normal(50, 10, 1000)
+    t = np.arange(1000, dtype=np.float64)
+    a, b = RunningStats(), RunningStats()
+    a.add_many(values[:300], t[:300])
+    b.add_many(values[300:], t[300:])
+    merged = a.merge(b)
+    assert merged.n == 1000
+    assert merged.mean == pytest.approx(values.mean())
+    assert np.sqrt(merged.m2 / 999) == pytest.approx(values.std(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+def test_slope_and_trend_follow_data():
+    stats = RunningStats()
+    t = np.arange(0, 600, 60, dtype=np.float64)
+    stats.add_many(10.0 + 2.0 * t / 60.0, t)  # +2 per minute
+    summary = stats.summary(window_minutes=10)
+    assert summary["slope_per_min"] == pytest.approx(2.0)
+    assert summary["trend"] == "rising"
+
+def test_engine_windows_per_host_and_fleet():
+    engine = StatsEngine(window_minutes=30)
+    now = datetime.utcnow()
+    engine.observe(MetricBatch.from_items(
+        [metric_payload(host="st-a", cpu=c, ts=now - timedelta(seconds=i)) for i, c in enumerate((10.0, 20.0, 30.0))]
+        + [metric_payload(host="st-b", cpu=70.0, ts=now)]
+        # older than any window we ask for below
+        + [metric_payload(host="st-a", cpu=99.0, ts=now - timedelta(minutes=20))]
+    ))
+    result = engine.trends(window_minutes=5)
+    a = result["hosts"]["st-a"]["cpu_usage"]
+    assert (a["count"], a["mean"], a["min"], a["max"]) == (3, 20.0, 10.0, 30.0)
+    assert a["stddev"] == pytest.approx(10.0)
+    assert result["fleet"]["cpu_usage"]["count"] == 4
+    assert result["fleet"]["cpu_usage"]["mean"] == pytest.approx(32.5)
+
+    wide = engine.trends(window_minutes=30, hosts=["st-a"])
+    assert list(wide["hosts"]) == ["st-a"]
+    assert wide["hosts"]["st-a"]["cpu_usage"]["count"] == 4
+
+def test_hosts_silent_for_the_whole_window_are_evicted(monkeypatch):
+    engine = StatsEngine(window_minutes=10)
+    now = datetime.utcnow()
+    engine.observe(MetricBatch.from_items([
+        metric_payload(host="st-quiet", ts=now - timedelta(minutes=8)),
+        metric_payload(host="st-busy", ts=now),
+    ]))
+    assert len(engine) == 2
+
+    later = stats_module.time.time() + 5 * 60
+    monkeypatch.setattr(stats_module.time, "time", lambda: later)
+    engine.observe(MetricBatch.from_items([metric_payload(host="st-busy", ts=now + timedelta(minutes=5))]))
+    assert len(engine) == 1
+    assert list(engine.trends(window_minutes=10)["hosts"]) == ["st-busy"]
+
+def test_ingest_feeds_stats_after_commit(db_session):
+    create_metrics_batch(db_session, [metric_payload(host="st-c", cpu=42.0)])
+    result = stats_engine.trends(window_minutes=5, hosts=["st-c"])
+    assert result["hosts"]["st-c"]["cpu_usage"]["mean"] == 42.0
@@ -0,0 +1,94 @@
+import time
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.models.metric import Metric
+from app.services import write_behind as write_behind_module
+from app.services.write_behind import WriteBehindQueue, write_behind
+from app.tests.factories import metric_payload
+
+def _count(db, host):
+    return db.scalar(select(func.count()).select_from(Metric).where(Metric.host == host))
+
+def _queue(db_session, **kwargs):
+    # flushes commit through their own sessions on the test connection (rolled back afterwards)
+    options = dict(capacity=100, flush_rows=10, flush_seconds=0.05)
+    options.update(kwargs)
+    return WriteBehindQueue(session_factory=sessionmaker(bind=db_session.get_bind()), **options)
+
+def test_batch_is_acknowledged_then_flushed(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_WRITE_BEHIND", True)
+    monkeypatch.setattr(write_behind, "session_factory", sessionmaker(bind=db_session.get_bind()))
+    rows = [metric_payload(host="wb-api", cpu=float(i)) for i in range(3)]
+    body = [r.model_dump(mode="json") for r in rows] + [{"host": "wb-api"}]
+
+    resp = client.post("/metrics/batch", json=body)
+    assert resp.status_code == 202
+    assert resp.json()["queued"] == 3
+    assert [e["index"] for e in resp.json()["errors"]] == [3]
+    assert _count(db_session, "wb-api") == 0
+
+    single = rows[0].model_dump(mode="json")
+    assert client.post("/metrics/", json=single).status_code == 202
+    assert len(write_behind) == 4
+    assert write_behind.flush() == 4
+    assert _count(db_session, "wb-api") == 4
+    assert len(write_behind) == 0
+
+def test_full_queue_answers_429(client, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_WRITE_BEHIND", True)
+    monkeypatch.setattr(write_behind, "capacity", 2)
+    item = metric_payload(host="wb-full")
+    body = [item.model_dump(mode="json")] * 2
+
+    assert client.post("/metrics/batch", json=body).status_code == 202
+    resp = client.post("/metrics/batch", json=body[:1])
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert len(write_behind) == 2
+    assert write_behind.rejected == 1
+    write_behind.reset()
+
+def test_flusher_batches_by_size_and_time(db_session):
+    queue = _queue(db_session, flush_rows=10, flush_seconds=0.05)
+    queue.start()
+    try:
+        assert queue.offer([metric_payload(host="wb-time")] * 3)
+        deadline = time.monotonic() + 5
+        while len(queue) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _count(db_session, "wb-time") == 3
+
+        # 25 rows go out as 10 + 10 + 5, each in its own transaction
+        assert queue.offer([metric_payload(host="wb-size")] * 25)
+    finally:
+        queue.stop()
+    assert _count(db_session, "wb-size") == 25
+    assert queue.flushes == 4
+    assert not queue.offer([metric_payload(host="wb-size")])
+
+def test_failed_flushes_drop_rows_and_free_capacity(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.write_behind.time.sleep", lambda s: None)
+    queue = _queue(db_session, capacity=5)
+    queue.offer([{"host": "wb-bad"}] * 5)  # unvalidated rows blow up inside create_metrics_batch
+    assert queue.flush() == 0
+    assert queue.dropped == 5
+    assert len(queue) == 0
+    assert queue.offer([metric_payload(host="wb-bad")] * 5)
+
+def test_bad_rows_are_split_out_of_a_failing_flush(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.write_behind.time.sleep", lambda s: None)
+    queue = _queue(db_session)
+    queue.offer([metric_payload(host="wb-mixed")] * 6 + [{"host": "wb-mixed"}] + [metric_payload(host="wb-mixed")] * 3)
+    assert queue.flush() == 9
+    assert (queue.dropped, _count(db_session, "wb-mixed")) == (1, 9)
+
+def test_failure_after_the_commit_is_not_retried(db_session, monkeypatch):
+    def broken_publish(batch, alerts_changed=False):
+        raise RuntimeError("subscriber blew up")
+
+    monkeypatch.setattr(write_behind_module, "publish_metric_batch", broken_publish)
+    queue = _queue(db_session)
+    queue.offer([metric_payload(host="wb-once")] * 4)
+    assert queue.flush() == 4
+    assert (queue.flushes, queue.dropped, _count(db_session, "wb-once")) == (1, 0, 4)
@@ -0,0 +1,37 @@
+"""Alert evaluation throughput: rule engine, anomaly detector and the full check_for_alerts path."""
+import pytest
+from app.services.alert_engine import alert_engine
+from app.services.alert_service import check_for_alerts_batch
+from app.services.anomaly_detector import AnomalyDetector
+from app.services.metric_batch import MetricBatch
+from conftest import clear_tables, fleet_items
+
+ROWS = 10_000
+
+
+@pytest.fixture(scope="module")
+def batch():
+    return MetricBatch.from_items(fleet_items(1_000, ROWS, seed=2))
+
+
+def bench_rule_engine_evaluate(benchmark, batch):
+    benchmark.extra_info["rows_per_call"] = ROWS
+    benchmark(alert_engine.evaluate, batch)
+
+
+def bench_anomaly_detector_evaluate(benchmark, batch):
+    detector = AnomalyDetector(capacity=20_000, alpha=0.05, threshold=4.0, warmup=5, checkpoint_seconds=60.0)
+    benchmark.extra_info["rows_per_call"] = ROWS
+    benchmark(detector.evaluate, batch)
+
+
+def bench_check_for_alerts_batch(benchmark, engine, db, batch):
+    clear_tables(engine)
+
+    def check():
+        check_for_alerts_batch(db, batch)
+        db.commit()
+
+    benchmark.extra_info["rows_per_call"] = ROWS
+    benchmark.pedantic(check, rounds=10, warmup_rounds=1)
+    clear_tables(engine)
@@ -0,0 +1,36 @@
+"""Single vs batch ingest through the full pipeline (alerts, anomaly state, rollups)."""
+import pytest
+from app.services.metric_services import create_metric, create_metrics_batch, write_metric_rows
+from conftest import clear_tables, fleet_items
+
+
+@pytest.fixture(autouse=True)
+def empty_tables(engine):
+    clear_tables(engine)
+    yield
+    clear_tables(engine)
+
+
+def bench_create_metric_single(benchmark, db):
+    items = iter(fleet_items(100, 5_000))
+    benchmark.extra_info["rows_per_call"] = 1
+    benchmark(lambda: create_metric(db, next(items)))
+
+
+@pytest.mark.parametrize("rows", [100, 1_000, 10_000])
+def bench_create_metrics_batch(benchmark, db, rows):
+    chunks = iter([fleet_items(rows // 10 or 1, rows, seed=i) for i in range(12)])
+    benchmark.extra_info["rows_per_call"] = rows
+    benchmark.pedantic(lambda: create_metrics_batch(db, next(chunks)), rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("rows", [1_000, 10_000])
+def bench_write_rows_only(benchmark, db, rows):
+    payloads = [i.model_dump() for i in fleet_items(rows // 10, rows)]
+
+    def write():
+        write_metric_rows(db, payloads)
+        db.commit()
+
+    benchmark.extra_info["rows_per_call"] = rows
+    benchmark.pedantic(write, rounds=10, warmup_rounds=1)
@@ -0,0 +1,27 @@
+"""Dashboard-style concurrent polling: many clients refreshing metrics and alerts at once."""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+REQUESTS_PER_CLIENT = 10
+
+
+def _poll(client, host):
+    for _ in range(REQUESTS_PER_CLIENT):
+        client.get("/api/metrics", params={"host": host, "limit": 200})
+        client.get("/alerts/active")
+
+
+@pytest.mark.parametrize("clients", [8, 32])
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def bench_concurrent_polling(benchmark, seeded, client, monkeypatch, clients, cached):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", cached)
+    monkeypatch.setattr(settings, "HOT_CACHE_ENABLED", cached)
+    hosts = sorted({m["host"] for m in client.get("/api/metrics", params={"limit": 2_000}).json()})[:clients]
+
+    def burst():
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            list(pool.map(lambda h: _poll(client, h), hosts))
+
+    benchmark.extra_info.update(table_rows=seeded, requests_per_round=2 * REQUESTS_PER_CLIENT * len(hosts))
+    benchmark.pedantic(burst, rounds=5, warmup_rounds=1)
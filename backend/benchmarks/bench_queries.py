@@ -0,0 +1,45 @@
+"""/api/metrics latency by limit and table size, on the DB path and from the caches."""
+import pytest
+from sqlalchemy import select
+from app.models.metric import Metric
+
+LIMITS = [100, 1_000, 10_000]
+
+
+@pytest.mark.parametrize("limit", LIMITS)
+def bench_api_metrics_db(benchmark, seeded, client, uncached, limit):
+    benchmark.extra_info["table_rows"] = seeded
+    resp = benchmark(client.get, "/api/metrics", params={"limit": limit})
+    assert resp.status_code == 200 and len(resp.json()) == limit
+
+
+@pytest.mark.parametrize("limit", [100, 1_000])
+def bench_api_metrics_host_db(benchmark, seeded, client, uncached, limit):
+    host = client.get("/api/metrics", params={"limit": 1}).json()[0]["host"]
+    benchmark.extra_info["table_rows"] = seeded
+    benchmark(client.get, "/api/metrics", params={"host": host, "limit": limit})
+
+
+def bench_api_metrics_deep_page(benchmark, seeded, client, uncached, db):
+    # keyset page from the middle of the table
+    ts, metric_id = db.execute(
+        select(Metric.timestamp, Metric.id).order_by(Metric.timestamp.desc(), Metric.id.desc()).offset(seeded // 2).limit(1)
+    ).one()
+    benchmark.extra_info["table_rows"] = seeded
+    resp = benchmark(client.get, "/api/metrics", params={"limit": 100, "before": f"{ts.isoformat()},{metric_id}"})
+    assert len(resp.json()) == 100
+
+
+@pytest.mark.parametrize("limit", LIMITS)
+def bench_api_metrics_response_cache(benchmark, seeded, client, limit):
+    client.get("/api/metrics", params={"limit": limit})
+    benchmark.extra_info["table_rows"] = seeded
+    benchmark(client.get, "/api/metrics", params={"limit": limit})
+
+
+def bench_series_raw_1h(benchmark, seeded, client):
+    params = {"from": "2026-01-01T00:00:00", "to": "2026-01-02T00:00:00", "bucket": "1h", "source": "raw",
+              "agg": "avg,max,p95"}
+    benchmark.extra_info["table_rows"] = seeded
+    resp = benchmark(client.get, "/api/metrics/series", params=params)
+    assert resp.status_code == 200
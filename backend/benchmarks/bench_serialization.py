@@ -0,0 +1,28 @@
+"""Cost of turning 10k metric rows into JSON: pydantic model validation vs plain columns."""
+from datetime import datetime, timedelta
+import pytest
+from pydantic import TypeAdapter
+from app.schemas.metric import MetricResponse
+from app.services.hot_cache import CachedMetric
+from app.services.serialization import metric_columns_json, metric_rows_json
+
+ROWS = 10_000
+
+
+@pytest.fixture(scope="module")
+def rows():
+    t0 = datetime(2026, 1, 1)
+    return [CachedMetric(i, f"host-{i % 500}", 12.5, 40.0, 3.25, t0 + timedelta(seconds=i)) for i in range(ROWS)]
+
+
+def bench_pydantic_validate_and_dump(benchmark, rows):
+    adapter = TypeAdapter(list[MetricResponse])
+    benchmark(lambda: adapter.dump_json(adapter.validate_python(rows, from_attributes=True)))
+
+
+def bench_rows_json(benchmark, rows):
+    benchmark(metric_rows_json, rows)
+
+
+def bench_columns_json(benchmark, rows):
+    benchmark(metric_columns_json, rows)
@@ -0,0 +1,135 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# no background DB work against the configured DB
+os.environ.setdefault("PARTITION_MAINTENANCE_MINUTES", "0")
+os.environ.setdefault("HYDRA_WARM_CACHE", "false")
+
+from app.main import app  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, get_db  # noqa: E402
+from app.models.alert import Alert  # noqa: E402
+from app.models.metric import Metric  # noqa: E402
+from app.schemas.metric import MetricCreate  # noqa: E402
+from app.services.metric_services import write_metric_rows  # noqa: E402
+from app.services.simulation import FleetSimulator, host_names  # noqa: E402
+
+# BENCH_DATABASE_URL=postgresql+psycopg2://... runs the suite against Postgres;
+# tables are created and dropped, so point it at a scratch database
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+T0 = datetime(2026, 1, 1)
+
+
+def pytest_benchmark_update_machine_info(config, machine_info):
+    machine_info["database"] = (BENCH_DATABASE_URL or "sqlite").split(":")[0]
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory):
+    url = BENCH_DATABASE_URL or f"sqlite:///{tmp_path_factory.mktemp('bench') / 'hydra.db'}"
+    options = {"connect_args": {"check_same_thread": False}} if url.startswith("sqlite") else {"pool_size": 20}
+    engine = create_engine(url, **options)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def sessions(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def db(sessions):
+    session = sessions()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_in_memory_state():
+    from app.services.alert_engine import alert_engine
+    from app.services.alert_state import open_alerts
+    from app.services.anomaly_detector import anomaly_detector
+    from app.services.hot_cache import hot_cache
+    from app.services.response_cache import response_cache
+    from app.services.stats_engine import stats_engine
+    yield
+    for state in (alert_engine, open_alerts, anomaly_detector, hot_cache, response_cache, stats_engine):
+        state.reset()
+
+
+def clear_tables(engine):
+    with engine.begin() as conn:
+        conn.execute(delete(Alert))
+        conn.execute(delete(Metric))
+
+
+def fleet_items(hosts: int, rows: int, seed: int = 0, prefix: str = "bench") -> list:
+    """``rows`` MetricCreate items from a simulated fleet, one sample per host per 10 s."""
+    simulator = FleetSimulator(host_names(hosts, prefix), seed=seed)
+    items, step = [], 0
+    while len(items) < rows:
+        ts = T0 + timedelta(seconds=10 * step)
+        columns = simulator.sample(ts.timestamp())
+        items += [
+            MetricCreate.model_construct(host=h, cpu_usage=c, memory_usage=m, latency=l, timestamp=ts)
+            for h, c, m, l in zip(columns["host"], columns["cpu_usage"].tolist(),
+                                  columns["memory_usage"].tolist(), columns["latency"].tolist())
+        ]
+        step += 1
+    return items[:rows]
+
+
+@pytest.fixture(scope="module", params=[10_000, 100_000], ids=lambda n: f"{n // 1000}k_rows")
+def seeded(request, engine, sessions):
+    """metrics table holding exactly ``param`` rows over 500 hosts."""
+    clear_tables(engine)
+    items = fleet_items(500, request.param, seed=1)
+    db = sessions()
+    try:
+        for start in range(0, len(items), 20_000):
+            write_metric_rows(db, [i.model_dump() for i in items[start:start + 20_000]])
+        db.commit()
+    finally:
+        db.close()
+    yield request.param
+    clear_tables(engine)
+
+
+@pytest.fixture()
+def client(sessions):
+    def override_get_db():
+        session = sessions()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture()
+def uncached(monkeypatch):
+    """Measure the DB path: no response cache, no hot window."""
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "HOT_CACHE_ENABLED", False)
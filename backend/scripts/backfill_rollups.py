@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Rebuild metrics_1m / metrics_1h from the raw metrics table.
+
+    python scripts/backfill_rollups.py                      # whole table
+    python scripts/backfill_rollups.py --from 2025-10-31 --to 2025-11-01 --chunk-hours 6
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func
+
+from app.core.database import SessionLocal
+from app.models.metric import Metric
+from app.services.rollup_service import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="start", type=datetime.fromisoformat, help="range start (default: oldest metric)")
+    parser.add_argument("--to", dest="end", type=datetime.fromisoformat, help="range end, exclusive (default: newest metric)")
+    parser.add_argument("--chunk-hours", type=float, default=1.0, help="raw rows are read per chunk; the rebuild commits once")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        oldest, newest = db.query(func.min(Metric.timestamp), func.max(Metric.timestamp)).one()
+        if oldest is None:
+            print("No metrics to backfill.")
+            return
+        start = args.start or oldest
+        end = args.end or newest + timedelta(seconds=1)
+        print(f"Backfilling rollups for [{start.isoformat()}, {end.isoformat()})")
+        began = time.perf_counter()
+        total = rebuild_rollups(db, start, end, chunk=timedelta(hours=args.chunk_hours))
+        took = time.perf_counter() - began
+        print(f"Rolled up {total} metrics in {took:.1f}s ({total / max(took, 1e-9):,.0f} rows/s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
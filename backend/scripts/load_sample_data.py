@@ -1,63 +1,77 @@
-import os, sys
-import pandas as pd
-from sqlalchemy.orm import Session
+#!/usr/bin/env python3
+"""Load metrics/alerts CSV files in chunks (sample data by default).
+
+    python scripts/load_sample_data.py                       # samples/hydra_*_sample.csv
+    python scripts/load_sample_data.py --metrics dump.csv --chunk-rows 200000
+    python scripts/load_sample_data.py --alerts alerts.csv --restart
+
+Each chunk is committed with a checkpoint, so running the same command again
+after an interruption continues where it stopped. Loaded metrics skip alerting
+and rollups; run scripts/backfill_rollups.py for the loaded range afterwards.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
 from app.core.database import SessionLocal
-from app.models.metric import Metric
-from app.models.alert import Alert
+from app.services.csv_loader import DEFAULT_CHUNK_ROWS, LoadReport, load_csv
+
 
 def get_sample_path(filename: str) -> str:
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_dir, "samples", filename)
 
-def load_metrics(csv_path: str, db: Session):
-    df = pd.read_csv(csv_path, parse_dates=['timestamp'])
-    metrics = [
-        Metric(
-            host=row['host'],
-            cpu_usage=float(row['cpu_usage']),
-            memory_usage=float(row['memory_usage']),
-            latency=float(row['latency']),
-            timestamp=row['timestamp'].to_pydatetime()
-        )
-        for _, row in df.iterrows()
-    ]
-    db.bulk_save_objects(metrics)
-    db.commit()
-    print(f"Loaded {len(metrics)} metrics")
-
-def load_alerts(csv_path: str, db: Session):
-    df = pd.read_csv(csv_path, parse_dates=['timestamp'])
-    alerts = [
-        Alert(
-            host=row['host'],
-            type=row['type'],
-            value=float(row['value']),
-            timestamp=row['timestamp'].to_pydatetime(),
-            status=row['status']
-        )
-        for _, row in df.iterrows()
-    ]
-    db.bulk_save_objects(alerts)
-    db.commit()
-    print(f"Loaded {len(alerts)} alerts")
+
+def print_progress(report: LoadReport, done: int, size: int):
+    percent = 100.0 * done / size if size else 100.0
+    print(
+        f"\r{report.table}: {report.resumed_rows + report.rows:,} rows ({percent:5.1f}%), "
+        f"{report.rows_per_second:,.0f} rows/s",
+        end="", flush=True,
+    )
+
 
 def main():
-    csv_metrics = get_sample_path("hydra_metrics_sample.csv")
-    csv_alerts = get_sample_path("hydra_alerts_sample.csv")
-    reset = "--reset" in sys.argv
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metrics", help="metrics CSV (host,cpu_usage,memory_usage,latency,timestamp)")
+    parser.add_argument("--alerts", help="alerts CSV (host,type,value,timestamp,status[,last_seen,resolved_at,breach_count])")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows read, written and committed at a time")
+    parser.add_argument("--restart", action="store_true", help="ignore checkpoints and load the files from the top")
+    parser.add_argument("--reset", action="store_true", help="truncate alerts and metrics first (PostgreSQL)")
+    args = parser.parse_args()
+
+    files = [("metrics", args.metrics), ("alerts", args.alerts)]
+    if not args.metrics and not args.alerts:
+        files = [("metrics", get_sample_path("hydra_metrics_sample.csv")),
+                 ("alerts", get_sample_path("hydra_alerts_sample.csv"))]
 
     db = SessionLocal()
     try:
-        if reset:
+        if args.reset:
             print("Resetting tables: truncating alerts and metrics")
-            db.execute("TRUNCATE TABLE alerts RESTART IDENTITY CASCADE;")
-            db.execute("TRUNCATE TABLE metrics RESTART IDENTITY CASCADE;")
+            db.execute(text("TRUNCATE TABLE alerts RESTART IDENTITY CASCADE"))
+            db.execute(text("TRUNCATE TABLE metrics RESTART IDENTITY CASCADE"))
+            db.execute(text("TRUNCATE TABLE load_checkpoints"))
             db.commit()
 
-        load_metrics(csv_metrics, db)
-        load_alerts(csv_alerts, db)
+        for table, path in files:
+            if not path:
+                continue
+            report = load_csv(db, path, table, args.chunk_rows, restart=args.restart, progress=print_progress)
+            if report.chunks:
+                print()
+            resumed = f", resumed after {report.resumed_rows:,}" if report.resumed_rows else ""
+            print(
+                f"Loaded {report.rows:,} {table} in {report.seconds:.1f}s "
+                f"({report.rows_per_second:,.0f} rows/s, {report.skipped:,} skipped{resumed})"
+            )
     finally:
         db.close()
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
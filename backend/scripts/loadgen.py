@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Drive ingest with a simulated fleet at a target rate and report throughput and latency.
+
+    python scripts/loadgen.py --hosts 10000 --rate 20000 --duration 60
+    python scripts/loadgen.py --hosts 100000 --rate 100000 --workers 8 --concurrency 16 --batch 2000
+    python scripts/loadgen.py --mode db --hosts 10000 --rate 50000   # create_metrics_batch, no HTTP
+    python scripts/loadgen.py --mode db --raw ...                      # bare INSERT/COPY, no alerts/rollups
+
+Hosts are split across worker processes; each runs an asyncio loop where one
+producer paces batches open-loop at its share of --rate and --concurrency
+senders post them. When senders fall behind, the producer blocks, so the
+achieved rate is what the target can really absorb. Every host reports once
+per hosts/rate seconds, timestamped with a simulated clock (--speedup runs
+it faster than wall time, e.g. to cover days of diurnal patterns).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.services.serialization import dumps
+from app.services.simulation import FleetSimulator, host_names, to_rows
+
+
+def _db_writer(raw: bool):
+    # imported lazily: api mode must not need DB settings
+    from app.core.database import SessionLocal
+    from app.schemas.metric import MetricCreate
+    from app.services.metric_services import create_metrics_batch, write_metric_rows
+
+    def write(rows):
+        db = SessionLocal()
+        try:
+            rows = [{**r, "timestamp": datetime.fromisoformat(r["timestamp"])} for r in rows]
+            if raw:
+                write_metric_rows(db, rows)
+                db.commit()
+            else:
+                create_metrics_batch(db, [MetricCreate.model_construct(**r) for r in rows])
+        finally:
+            db.close()
+    return write
+
+
+async def run_worker(args, worker: int) -> dict:
+    fleet = host_names(args.hosts, args.prefix)
+    shard = np.arange(worker, args.hosts, args.workers)
+    simulator = FleetSimulator(fleet, seed=args.seed)
+    rate = args.rate / args.workers
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+    latencies, errors, sent = [], 0, 0
+
+    if args.mode == "api":
+        import httpx
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout,
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+    else:
+        client, write = None, _db_writer(args.raw)
+
+    async def sender():
+        nonlocal errors, sent
+        while True:
+            rows = await queue.get()
+            if rows is None:
+                return
+            began = time.perf_counter()
+            try:
+                if client is not None:
+                    resp = await client.post("/metrics/batch", content=dumps(rows),
+                                             headers={"Content-Type": "application/json"})
+                    ok = resp.status_code < 300
+                else:
+                    await asyncio.to_thread(write, rows)
+                    ok = True
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - began)
+            if ok:
+                sent += len(rows)
+            else:
+                errors += 1
+
+    senders = [asyncio.create_task(sender()) for _ in range(args.concurrency)]
+    wall_start = time.perf_counter()
+    sim_start = args.start if args.start is not None else time.time()
+    produced, position = 0, 0
+    while True:
+        elapsed = time.perf_counter() - wall_start
+        if elapsed >= args.duration:
+            break
+        # open-loop pacing: batch n goes out at n * batch / rate
+        due = produced / rate
+        if due > elapsed:
+            await asyncio.sleep(due - elapsed)
+        index = shard[np.arange(position, position + args.batch) % len(shard)]
+        position = (position + args.batch) % len(shard)
+        ts = sim_start + (time.perf_counter() - wall_start) * args.speedup
+        await queue.put(to_rows(simulator.sample(ts, index), ts))
+        produced += len(index)
+    for _ in senders:
+        await queue.put(None)
+    await asyncio.gather(*senders)
+    took = time.perf_counter() - wall_start
+    if client is not None:
+        await client.aclose()
+    return {"rows": sent, "requests": len(latencies), "errors": errors, "seconds": took, "latencies": latencies}
+
+
+def _worker_main(args, worker: int) -> dict:
+    return asyncio.run(run_worker(args, worker))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("api", "db"), default="api", help="POST /metrics/batch or write through the service layer")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base url (api mode)")
+    parser.add_argument("--raw", action="store_true", help="db mode: only write rows, skip alerts/rollups")
+    parser.add_argument("--hosts", type=int, default=10_000)
+    parser.add_argument("--prefix", default="sim-host", help="host name prefix")
+    parser.add_argument("--rate", type=float, default=10_000.0, help="target rows per second, all workers together")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--batch", type=int, default=1_000, help="rows per request / write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="in-flight requests per worker")
+    parser.add_argument("--timeout", type=float, default=30.0, help="request timeout (seconds)")
+    parser.add_argument("--speedup", type=float, default=1.0, help="simulated seconds per wall second")
+    parser.add_argument("--start", type=float, help="simulated start (epoch seconds), default now")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    args.workers = max(1, min(args.workers, args.hosts))
+
+    print(f"{args.mode}: {args.hosts:,} hosts, target {args.rate:,.0f} rows/s for {args.duration:.0f}s "
+          f"({args.workers} workers x {args.concurrency} in flight, batches of {args.batch})")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(_worker_main, [args] * args.workers, range(args.workers)))
+
+    rows = sum(r["rows"] for r in results)
+    requests = sum(r["requests"] for r in results)
+    errors = sum(r["errors"] for r in results)
+    seconds = max(r["seconds"] for r in results)
+    latencies = np.concatenate([np.asarray(r["latencies"]) for r in results]) * 1000.0
+    print(f"Sent {rows:,} rows in {requests:,} requests over {seconds:.1f}s: "
+          f"{rows / seconds:,.0f} rows/s ({100.0 * rows / seconds / args.rate:.0f}% of target), {errors:,} errors")
+    if len(latencies):
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        print(f"Latency per batch (ms): p50 {p50:.1f}  p90 {p90:.1f}  p99 {p99:.1f}  max {latencies.max():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Create upcoming daily metrics partitions and apply retention once (for cron).
+
+    python scripts/maintain_partitions.py
+    RETENTION_RAW_DAYS=30 RETENTION_1M_DAYS=90 python scripts/maintain_partitions.py
+
+The API runs the same task every PARTITION_MAINTENANCE_MINUTES; set that to 0
+when this script is scheduled instead.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.partitions import run_maintenance
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    db = SessionLocal()
+    try:
+        began = time.perf_counter()
+        report = run_maintenance(db)
+        took = time.perf_counter() - began
+        if not report["partitioned"]:
+            print("metrics is not partitioned; raw retention uses DELETE")
+        print(f"Created partitions: {', '.join(report['created']) or 'none'}")
+        action = "Detached" if settings.RETENTION_DETACH_ONLY else "Dropped"
+        print(f"{action} partitions: {', '.join(report['expired']) or 'none'}")
+        if report["deleted_raw"]:
+            print(f"Deleted raw metrics: {report['deleted_raw']}")
+        for table, rows in report["deleted_rollups"].items():
+            print(f"Deleted {table} rows: {rows}")
+        print(f"Done in {took:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
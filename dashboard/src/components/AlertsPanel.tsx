@@ -1,17 +1,27 @@
 import { Card, CardHeader, CardTitle, CardContent } from "@/components/ui/card";
-import type { Alert } from "@/types";
+import type { Alert, HostSummary } from "@/types";
 
 interface AlertsPanelProps {
   alerts?: Alert[];
+  hosts?: HostSummary[]; // from useFleetSummary: hosts with open alerts or no recent data are listed first
 }
 
-export function AlertsPanel({ alerts = [] }: AlertsPanelProps) {
+export function AlertsPanel({ alerts = [], hosts = [] }: AlertsPanelProps) {
+  const attention = hosts.filter((h) => h.active_alerts > 0 || h.stale);
   return (
     <Card>
       <CardHeader>
         <CardTitle>Alerts</CardTitle>
       </CardHeader>
       <CardContent className="space-y-3">
+        {attention.map((h) => (
+          <div key={h.host} className="flex items-center justify-between rounded-md border p-2 text-sm">
+            <span className="font-medium">{h.host}</span>
+            <span className="text-xs text-muted-foreground">
+              {h.stale ? `stale since ${h.last_seen}` : `${h.active_alerts} open alert(s)`}
+            </span>
+          </div>
+        ))}
         {alerts.length === 0 ? (
           <p className="text-muted-foreground text-sm">No alerts detected</p>
         ) : (
@@ -12,7 +12,7 @@ import {
   CardDescription,
 } from "@/components/ui/card";
 
-import type { Metric, Alert as AlertType } from "@/types";
+import type { Metric, Alert as AlertType, FleetSummary } from "@/types";
 
 // Utilidad para calcular variación porcentual
 function percentChange(current: number, previous: number) {
@@ -23,18 +23,25 @@ function percentChange(current: number, previous: number) {
 type Props = {
   metrics?: Metric[];
   alerts?: AlertType[];
+  summary?: FleetSummary; // /api/hosts/summary: every host, not just the ones in `metrics`
 };
 
-export function SectionCards({ metrics = [], alerts = [] }: Props) {
+export function SectionCards({ metrics = [], alerts = [], summary }: Props) {
   // Hosts únicos
   const hosts = React.useMemo(() => {
+    if (summary) return summary.hosts.map((h) => h.host);
     const set = new Set<string>();
     for (const m of metrics) if (m.host) set.add(m.host);
     return Array.from(set);
-  }, [metrics]);
+  }, [metrics, summary]);
+  const staleHosts = summary?.stale_hosts ?? 0;
 
   // Promedio de CPU más reciente por host
   const avgCpu = React.useMemo(() => {
+    if (summary) {
+      const live = summary.hosts.filter((h) => !h.stale);
+      return live.length ? live.reduce((s, h) => s + h.cpu_usage, 0) / live.length : 0;
+    }
     if (!metrics.length) return 0;
     const byHost = new Map<string, Metric[]>();
     for (const m of metrics) {
@@ -53,7 +60,7 @@ export function SectionCards({ metrics = [], alerts = [] }: Props) {
     return latestVals.length
       ? latestVals.reduce((s, v) => s + v, 0) / latestVals.length
       : 0;
-  }, [metrics]);
+  }, [metrics, summary]);
 
   // Alertas abiertas / totales
   const openAlerts = React.useMemo(
@@ -87,7 +94,9 @@ export function SectionCards({ metrics = [], alerts = [] }: Props) {
     {
       title: "Active Hosts",
       value: hosts.length,
-      desc: `${hosts.length} host(s) connected.`,
+      desc: staleHosts
+        ? `${hosts.length - staleHosts} reporting, ${staleHosts} stale.`
+        : `${hosts.length} host(s) connected.`,
       trendPct: 0,
       up: true,
       detail: "Connected systems monitored in real time",
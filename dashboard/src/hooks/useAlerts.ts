@@ -1,12 +1,27 @@
+import { useEffect, useState } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { getAlerts, resolveAlert } from "@/services/api";
+import { subscribeLive } from "@/services/live";
 import type { Alert } from "@/types";
 
 export const useAlerts = () => {
+  const queryClient = useQueryClient();
+  const [live, setLive] = useState(false);
+
+  // refetch when the server says alerts changed; slow polling stays as a safety net
+  // (a host-filtered socket does not hear about other hosts)
+  useEffect(() => {
+    return subscribeLive((frame) => {
+      if (frame.type === "alerts" || frame.type === "resync") {
+        queryClient.invalidateQueries({ queryKey: ["alerts"] });
+      }
+    }, setLive);
+  }, [queryClient]);
+
   return useQuery<Alert[], Error>({
     queryKey: ["alerts"],
     queryFn: getAlerts,
-    refetchInterval: 7000,
+    refetchInterval: live ? 30000 : 7000,
     staleTime: 2000,
   });
 };
@@ -0,0 +1,54 @@
+import { useEffect, useState } from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { getFleetSummary } from "@/services/api";
+import { subscribeLive } from "@/services/live";
+import type { FleetSummary, HostSummary, Metric } from "@/types";
+
+function applyMetrics(summary: FleetSummary, metrics: Metric[]): FleetSummary {
+  const byHost = new Map<string, HostSummary>(summary.hosts.map((h) => [h.host, h]));
+  for (const m of metrics) {
+    const current = byHost.get(m.host);
+    if (current && current.last_seen >= m.timestamp) continue;
+    byHost.set(m.host, {
+      host: m.host,
+      cpu_usage: m.cpu_usage,
+      memory_usage: m.memory_usage,
+      latency: m.latency,
+      last_seen: m.timestamp,
+      active_alerts: current?.active_alerts ?? 0,
+      stale: false,
+    });
+  }
+  const hosts = Array.from(byHost.values()).sort((a, b) => a.host.localeCompare(b.host));
+  return {
+    ...summary,
+    hosts,
+    total_hosts: hosts.length,
+    stale_hosts: hosts.filter((h) => h.stale).length,
+  };
+}
+
+export const useFleetSummary = () => {
+  const queryClient = useQueryClient();
+  const [live, setLive] = useState(false);
+
+  // pushed metrics patch the cached summary in place; alert changes refetch it
+  useEffect(() => {
+    return subscribeLive((frame) => {
+      if (frame.type === "alerts" || frame.type === "resync") {
+        queryClient.invalidateQueries({ queryKey: ["fleet-summary"] });
+        return;
+      }
+      if (frame.type !== "metrics" || !frame.data.length) return;
+      queryClient.setQueryData<FleetSummary>(["fleet-summary"], (prev) => prev && applyMetrics(prev, frame.data));
+    }, setLive);
+  }, [queryClient]);
+
+  return useQuery<FleetSummary, Error>({
+    queryKey: ["fleet-summary"],
+    queryFn: getFleetSummary,
+    refetchInterval: live ? 30000 : 5000,
+    staleTime: 2000,
+    placeholderData: (prev) => prev,
+  });
+};
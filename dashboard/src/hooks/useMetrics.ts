@@ -1,16 +1,40 @@
-import { useQuery } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { getMetrics } from "@/services/api";
+import { setLiveHosts, subscribeLive } from "@/services/live";
 import type { Metric } from "@/types";
 
+const LIMIT = 200;
+
 export const useMetrics = (host?: string) => {
+  const queryClient = useQueryClient();
+  const [live, setLive] = useState(false);
+
+  // pushed deltas are prepended to the cached list; polling only while the socket is down
+  useEffect(() => {
+    setLiveHosts(host ? [host] : []);
+    return subscribeLive((frame) => {
+      if (frame.type === "resync") {
+        queryClient.invalidateQueries({ queryKey: ["metrics"] });
+        return;
+      }
+      if (frame.type !== "metrics") return;
+      const rows = (host ? frame.data.filter((m) => m.host === host) : frame.data)
+        .slice()
+        .sort((a, b) => b.timestamp.localeCompare(a.timestamp));
+      if (!rows.length) return;
+      queryClient.setQueryData<Metric[]>(["metrics", host], (prev = []) => [...rows, ...prev].slice(0, LIMIT));
+    }, setLive);
+  }, [host, queryClient]);
+
   return useQuery<Metric[], Error>({
     queryKey: ["metrics", host],
     queryFn: async () => {
-      const data = await getMetrics(host);
+      const data = await getMetrics(host, LIMIT);
       return Array.isArray(data) ? data : [];
     },
-    refetchInterval: 5000,
+    refetchInterval: live ? false : 5000,
     staleTime: 2000,
     placeholderData: (prev) => prev,
   });
-};
\ No newline at end of file
+};
@@ -8,9 +8,11 @@ import { SectionCards } from "@/components/section-cards";
 import { SiteHeader } from "@/components/site-header";
 import { SidebarInset, SidebarProvider } from "@/components/ui/sidebar";
 import { MetricChart } from "@/components/MetricChart";
+import { AlertsPanel } from "@/components/AlertsPanel";
 
 import { useMetrics } from "@/hooks/useMetrics";
 import { useAlerts } from "@/hooks/useAlerts";
+import { useFleetSummary } from "@/hooks/useFleetSummary";
 import type { Metric, Alert as AlertType } from "@/types";
 
 export default function Page(): React.JSX.Element {
@@ -19,6 +21,7 @@ export default function Page(): React.JSX.Element {
   const hostForBackend = selectedHost === "all" ? "" : selectedHost;
   const { data: metrics = [], isLoading: metricsLoading } = useMetrics(hostForBackend);
   const { data: alerts = [], isLoading: alertsLoading } = useAlerts();
+  const { data: summary } = useFleetSummary();
 
   // list of host to send to Chart
   const hosts = React.useMemo(() => {
@@ -56,15 +59,22 @@ export default function Page(): React.JSX.Element {
           ) : (
             <>
               {/* KPIs */}
-              <SectionCards metrics={metrics} alerts={alerts} />
+              <SectionCards metrics={metrics} alerts={alerts} summary={summary} />
 
 
-              {/* to select type of metric */}
-              <MetricChart
-                data={metrics}
-                host={selectedHost}
-                onHostChange={(h) => setSelectedHost(h ?? "all")}
-              />
+              <div className="grid gap-6 lg:grid-cols-3">
+                {/* to select type of metric */}
+                <div className="lg:col-span-2">
+                  <MetricChart
+                    data={metrics}
+                    host={selectedHost}
+                    onHostChange={(h) => setSelectedHost(h ?? "all")}
+                  />
+                </div>
+
+                {/* hosts needing attention (fleet summary) and open alerts */}
+                <AlertsPanel alerts={alerts} hosts={summary?.hosts} />
+              </div>
 
               {/* alerts table */}
               <DataTable data={tableData} />
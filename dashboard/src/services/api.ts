@@ -1,6 +1,6 @@
 // src/services/api.ts
 import axios from "axios";
-import type { Metric, Alert, Trends } from "@/types";
+import type { Metric, Alert, FleetSummary, Trends } from "@/types";
 
 const API = axios.create({
   baseURL: import.meta.env.VITE_API_BASE || "http://localhost:8000",
@@ -14,6 +14,10 @@ export const getMetrics = (host?: string, limit = 200) =>
 export const postMetric = (payload: Partial<Metric>) =>
   API.post("/metrics", payload);
 
+// latest status of every host (one row per host, no history)
+export const getFleetSummary = () =>
+  API.get<FleetSummary>("/api/hosts/summary").then(r => r.data);
+
 // alerts
 // backend actual tiene GET /alerts/active
 export const getAlerts = () => API.get<Alert[]>("/alerts/active").then(r => r.data);
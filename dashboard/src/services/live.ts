@@ -0,0 +1,82 @@
+// src/services/live.ts
+// one shared WebSocket to /ws/metrics; hooks register listeners and the socket
+// lives while at least one listener is registered
+import type { Metric } from "@/types";
+
+export type LiveFrame =
+  | { type: "metrics"; data: Metric[] }
+  | { type: "alerts"; hosts: string[] }
+  | { type: "resync" }
+  | { type: "subscribed"; hosts: string[] };
+
+type Listener = (frame: LiveFrame) => void;
+type StatusListener = (open: boolean) => void;
+
+const API_BASE: string = import.meta.env.VITE_API_BASE || "http://localhost:8000";
+const WS_URL = API_BASE.replace(/^http/, "ws") + "/ws/metrics";
+
+const listeners = new Set<Listener>();
+const statusListeners = new Set<StatusListener>();
+let socket: WebSocket | null = null;
+let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+let attempts = 0;
+let hosts: string[] = [];
+
+function emit(frame: LiveFrame) {
+  listeners.forEach((l) => l(frame));
+}
+
+function connect() {
+  reconnectTimer = undefined;
+  const ws = new WebSocket(WS_URL);
+  socket = ws;
+  ws.onopen = () => {
+    if (hosts.length) ws.send(JSON.stringify({ hosts }));
+    statusListeners.forEach((l) => l(true));
+    // frames were missed while disconnected
+    if (attempts > 0) emit({ type: "resync" });
+    attempts = 0;
+  };
+  ws.onmessage = (ev) => {
+    try {
+      emit(JSON.parse(ev.data) as LiveFrame);
+    } catch {
+      // ignore malformed frames
+    }
+  };
+  ws.onclose = () => {
+    if (socket !== ws) return;
+    socket = null;
+    statusListeners.forEach((l) => l(false));
+    if (listeners.size) {
+      reconnectTimer = setTimeout(connect, Math.min(30000, 1000 * 2 ** attempts++));
+    }
+  };
+}
+
+// follow only these hosts (empty = all)
+export function setLiveHosts(next: string[]) {
+  hosts = next;
+  if (socket?.readyState === WebSocket.OPEN) socket.send(JSON.stringify({ hosts }));
+}
+
+export function subscribeLive(listener: Listener, onStatus?: StatusListener) {
+  listeners.add(listener);
+  if (onStatus) {
+    statusListeners.add(onStatus);
+    onStatus(socket?.readyState === WebSocket.OPEN);
+  }
+  if (!socket && reconnectTimer === undefined) connect();
+
+  return () => {
+    listeners.delete(listener);
+    if (onStatus) statusListeners.delete(onStatus);
+    if (!listeners.size) {
+      clearTimeout(reconnectTimer);
+      reconnectTimer = undefined;
+      const ws = socket;
+      socket = null;
+      ws?.close();
+    }
+  };
+}
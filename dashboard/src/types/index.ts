@@ -17,6 +17,26 @@ export type Alert = {
   status: string;
 };
 
+// GET /api/hosts/summary: newest values of every host
+export type HostSummary = {
+  host: string;
+  cpu_usage: number;
+  memory_usage: number;
+  latency: number;
+  last_seen: string;
+  active_alerts: number;
+  stale: boolean;
+};
+
+export type FleetSummary = {
+  generated_at: string;
+  stale_after_seconds: number;
+  total_hosts: number;
+  stale_hosts: number;
+  active_alerts: number;
+  hosts: HostSummary[];
+};
+
 // opcional:
 export type Trends = {
   // define según lo que el backend devuelva